@@ -0,0 +1,103 @@
+"""
+Agendador por prazos absolutos (time.monotonic) para o loop de mensagens.
+
+Em vez de encadear time.sleep(cadencia) depois do tempo gasto digitando, cada
+envio tem um prazo calculado a partir do início do loop. Assim o período real
+não acumula o tempo de digitação nem os atrasos de cada despertar.
+"""
+import math
+import time
+
+
+class Estatisticas:
+    """Média, desvio e máximo acumulados (Welford), sem guardar as amostras."""
+
+    __slots__ = ("n", "media", "_m2", "maximo")
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.maximo = 0.0
+
+    def adicionar(self, valor):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (valor - self.media)
+        if valor > self.maximo:
+            self.maximo = valor
+
+    @property
+    def desvio(self):
+        return math.sqrt(self._m2 / self.n) if self.n > 1 else 0.0
+
+    def como_dict(self):
+        return {"n": self.n, "media": self.media, "desvio": self.desvio, "maximo": self.maximo}
+
+
+class AgendadorDeadline:
+    """
+    Agenda mensagens e ciclos em prazos absolutos.
+    cadencia: segundos entre o início de mensagens consecutivas.
+    intervalo: espera extra depois da última mensagem de cada ciclo.
+    relogio/dormir: injetáveis para simulação com relógio falso. Se dormir()
+                    retornar verdadeiro (ex.: threading.Event.wait), a espera
+                    foi interrompida e o agendador indica o cancelamento.
+    """
+
+    def __init__(self, cadencia, intervalo, relogio=time.monotonic, dormir=time.sleep):
+        self.cadencia = cadencia
+        self.intervalo = intervalo
+        self.relogio = relogio
+        self.dormir = dormir
+        self.inicio = None
+        self.prazo = None  # Próximo prazo (reancorado quando o envio atrasa além dele)
+        self.ideal = None  # Prazo ideal, nunca reancorado (base da deriva)
+        self.ciclos = 0
+        self.atrasados = 0  # Envios que começaram depois do prazo
+        self.despertares = 0  # Esperas feitas (cada uma termina num despertar da thread)
+        self.jitter = Estatisticas()  # Atraso do despertar em relação ao prazo
+        self.deriva = Estatisticas()  # Distância entre o início real e o ideal de cada ciclo
+
+    def iniciar(self):
+        """Fixa o instante zero da grade de prazos."""
+        self.inicio = self.prazo = self.ideal = self.relogio()
+        self.ciclos = 0
+
+    def proxima_mensagem(self):
+        """Espera até o prazo da próxima mensagem. Retorna False se foi cancelado."""
+        return self._avancar(self.cadencia)
+
+    def proximo_ciclo(self):
+        """Espera o intervalo do loop e registra a deriva do novo ciclo. Retorna False se foi cancelado."""
+        if not self._avancar(self.intervalo):
+            return False
+        self.ciclos += 1
+        self.deriva.adicionar(abs(self.relogio() - self.ideal))
+        return True
+
+    def _avancar(self, passo):
+        self.prazo += passo
+        self.ideal += passo
+        agora = self.relogio()
+        restante = self.prazo - agora
+        if restante > 0:
+            self.despertares += 1
+            if self.dormir(restante):
+                return False
+            self.jitter.adicionar(self.relogio() - self.prazo)
+        else:
+            # A digitação passou do prazo: começa já, sem tentar "compensar" em rajada
+            self.atrasados += 1
+            self.prazo = agora
+        return True
+
+    def estatisticas(self):
+        """Resumo de jitter e deriva medidos (em segundos)."""
+        return {
+            "ciclos": self.ciclos,
+            "atrasados": self.atrasados,
+            "jitter": self.jitter.como_dict(),
+            "deriva": self.deriva.como_dict(),
+        }
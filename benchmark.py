@@ -0,0 +1,857 @@
+"""
+Benchmarks da macro.
+
+Rodam sem display (backend de gravação, relógio falso, teclado falso); com
+display, medem também a lista do Tk e a inicialização da janela com cada tema.
+
+Uso:
+    python benchmark.py                       # todos os benchmarks
+    python benchmark.py lista hotkeys         # só alguns
+    python benchmark.py --json atual.json     # salva os resultados (para comparar commits)
+    python benchmark.py --comparar antes.json # mostra a variação em relação a outro resultado
+    python benchmark.py --real                # inclui pyautogui/lote (digita na janela em foco!)
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from types import SimpleNamespace
+
+from agendador import AgendadorDeadline
+from diario import DiarioExecucao, ler_retomada
+from eventos import ESTADO, MENSAGEM, BombaTk, CanalEventos
+from importacao import exportar, ler_arquivo, lotes_unicos
+from lista import IndiceBusca, ListaVirtual, ModeloMensagens
+from calibracao import CADENCIAS, Calibracao
+from gravador import Gravador, LinhaDoTempo, reproduzir
+from modelos import ContextoEnvio
+from motor import ConfigExecucao, MotorMacro
+from perfilamento import Perfilador
+from hotkeys import RegistroHotkeys
+from perfis import ArmazemPerfis
+from recursos import MonitorRecursos
+from sequenciador import Sequenciador
+from envio import (BACKENDS, ESPERA_COLAR, MODO_COLAR, MODO_DIGITAR, BackendGravacao, BackendLimitado,
+                   LimitadorTaxa, compilar_plano, executar_plano)
+from tests.falsos import BackendGravacaoLento, RaizFalsa, RelogioFalso, TecladoFalso, mensagens_exemplo
+from trabalhador import POLITICAS, TrabalhadorEnvio
+
+
+def bench_agendador(ciclos=5000, mensagens=5, cadencia=0.5, intervalo=20.0):
+    """
+    Simula milhares de ciclos do loop num relógio falso, com digitação de duração
+    variável e despertares atrasados, e mede a deriva acumulada e por ciclo.
+    """
+    relogio = RelogioFalso(atraso_despertar=0.002)
+    sorteio = random.Random(1)
+    agendador = AgendadorDeadline(cadencia, intervalo, relogio=relogio, dormir=relogio.dormir)
+    agendador.iniciar()
+    for _ in range(ciclos):
+        for _ in range(mensagens):
+            relogio.gastar(sorteio.uniform(0.05, 0.4))  # Digitação
+            agendador.proxima_mensagem()
+        agendador.proximo_ciclo()
+    periodo = mensagens * cadencia + intervalo
+    return dict(agendador.estatisticas(), deriva_acumulada=relogio() - ciclos * periodo)
+
+
+def bench_callback(pressoes=10000):
+    """
+    Mede quanto um callback de hotkey leva para enfileirar um envio, com um
+    envio longo em andamento (o pior caso para o hook do teclado).
+    """
+    resultados = {}
+    for politica in POLITICAS:
+        trabalhador = TrabalhadorEnvio(politica=politica)
+        trabalhador.enviar(lambda: time.sleep(0.2), chave="envio")  # Envio em andamento
+        for _ in range(pressoes):
+            trabalhador.enviar(lambda: None, chave="envio")
+        trabalhador.encerrar()
+        resultados[politica] = trabalhador.estatisticas()
+    return resultados
+
+
+class BackendCustoSimulado(BackendGravacao):
+    """
+    Gravação num relógio falso em que cada tecla custa 'custo_tecla' segundos e
+    colar custa um atalho mais a espera para o destino ler a área de transferência.
+    """
+
+    espera_colar = 0  # A espera é simulada no relógio
+
+    def __init__(self, relogio, custo_tecla=0.001):
+        super().__init__(relogio=relogio)
+        self.custo_tecla = custo_tecla
+
+    def escrever(self, texto):
+        super().escrever(texto)
+        self.relogio.gastar(len(texto) * self.custo_tecla)
+
+    def pressionar(self, tecla):
+        super().pressionar(tecla)
+        self.relogio.gastar(self.custo_tecla)
+
+    def atalho_colar(self):
+        super().atalho_colar()
+        self.relogio.gastar(self.custo_tecla + ESPERA_COLAR)
+
+
+def bench_colagem(tamanhos=(10, 50, 200, 1000), custo_tecla=0.001):
+    """
+    Compara o tempo simulado de envio por mensagem digitando e colando, para
+    mensagens curtas e longas. Confere que a colagem entrega o texto exato (com
+    acentos) e devolve a área de transferência como estava.
+    """
+    resultados = {}
+    for tamanho in tamanhos:
+        mensagens = mensagens_exemplo(quantidade=10, tamanho=tamanho)
+        for modo in (MODO_DIGITAR, MODO_COLAR):
+            relogio = RelogioFalso()
+            backend = BackendCustoSimulado(relogio, custo_tecla)
+            backend.area_transferencia.escrever("conteúdo do usuário")
+            executar_plano(compilar_plano(mensagens, modo=modo), backend, 0, dormir=lambda s: None)
+            assert backend.texto_enviado() == "".join(m + "\n" for m in mensagens)
+            assert backend.area_transferencia.ler() == "conteúdo do usuário"
+            resultados.setdefault(modo, {})[tamanho] = relogio() / len(mensagens)
+    return resultados
+
+
+def bench_limitador(taxas=(20, 100, 1000), rajada=10):
+    """
+    Envia um plano longo pelo limitador de taxa num relógio falso e mede a taxa
+    média alcançada e quantas vezes o envio esperou por fichas.
+    """
+    plano = compilar_plano(mensagens_exemplo(quantidade=20, tamanho=200))
+    resultados = {}
+    for taxa in taxas:
+        relogio = RelogioFalso()
+        gravacao = BackendGravacao(relogio=relogio)
+        limitador = LimitadorTaxa(taxa, rajada, relogio=relogio, dormir=relogio.dormir)
+        executar_plano(plano, BackendLimitado(gravacao, limitador), 0, dormir=lambda s: None)
+        enviadas = sum(len(valor) if tipo == "escrever" else 1 for _, tipo, valor in gravacao.eventos)
+        media = (enviadas - rajada) / relogio()  # A primeira rajada sai de graça
+        resultados[taxa] = {"teclas_por_segundo": media, "esperas": limitador.esperas}
+    return resultados
+
+
+class AlvoComPerdas(BackendGravacao):
+    """Destino simulado que perde a primeira tecla de um texto que chega menos de 'limite' s depois do anterior."""
+
+    def __init__(self, relogio, limite):
+        super().__init__(relogio=relogio)
+        self.limite = limite
+        self.ultimo = None
+
+    def escrever(self, texto):
+        agora = self.relogio()
+        if self.ultimo is not None and agora - self.ultimo < self.limite:
+            texto = texto[1:]
+        self.ultimo = agora
+        super().escrever(texto)
+
+
+def bench_calibracao(limite=0.008):
+    """
+    Calibra contra um destino simulado que perde teclas abaixo de 'limite' s
+    entre mensagens e confere que a cadência segura sugerida é a menor acima dele.
+    """
+    calibracao = Calibracao(mensagens_exemplo(quantidade=10, tamanho=60) + ["{contador}: {aleatorio:a|b}"])
+    inicio = time.perf_counter()
+    while (cadencia := calibracao.proxima()) is not None:
+        relogio = RelogioFalso()
+        alvo = AlvoComPerdas(relogio, limite)
+        executar_plano(compilar_plano(calibracao.textos), alvo, cadencia, dormir=relogio.dormir)
+        calibracao.registrar(cadencia, alvo.texto_enviado())
+    duracao = time.perf_counter() - inicio
+    esperada = min(c for c in CADENCIAS if c >= limite)
+    assert calibracao.cadencia_segura == esperada, calibracao.resultado()
+    falha = calibracao.etapas[-1]
+    assert not falha["intacto"] and falha["perdidas"] == len(calibracao.textos) - 1, falha
+    return {"etapas": len(calibracao.etapas), "cadencia_segura": calibracao.cadencia_segura, "duracao": duracao}
+
+
+def bench_parada(ciclos=50):
+    """
+    Para o envio no meio de uma mensagem longa e mede o tempo até a última tecla
+    (parada -> silêncio).
+    """
+    plano = compilar_plano(mensagens_exemplo(quantidade=5, tamanho=2000))
+    trabalhador = TrabalhadorEnvio()
+    latencias = []
+    for _ in range(ciclos):
+        backend = BackendGravacaoLento()
+        cancelar = threading.Event()
+        trabalhador.enviar(lambda: executar_plano(plano, backend, 0.5, cancelar=cancelar))
+        time.sleep(0.02)
+        parada = time.perf_counter()
+        cancelar.set()
+        trabalhador.aguardar_ocioso(timeout=1.0)
+        ultima_tecla = backend.eventos[-1][0] if backend.eventos else parada
+        latencias.append(max(0.0, ultima_tecla - parada))
+    trabalhador.encerrar()
+    return {"media": sum(latencias) / len(latencias), "maximo": max(latencias)}
+
+
+# Executado num processo novo: importa a interface, cria a janela com o tema
+# (se janela=True), desenha o primeiro quadro e avisa se o PIL foi importado
+CODIGO_INICIALIZACAO = """
+import sys
+import tkinter as tk
+from macrorh.app import MacroApp
+from macrorh.temas import TEMAS
+if {janela}:
+    root = tk.Tk()
+    app = MacroApp(root, TEMAS["{tema}"]())
+    root.update()
+print("primeiro-quadro", "PIL" in sys.modules, flush=True)
+"""
+
+
+def tem_display():
+    return sys.platform == "win32" or bool(os.environ.get("DISPLAY"))
+
+
+def bench_inicializacao(tema="imagem", repeticoes=5, janela=True):
+    """
+    Mede o tempo do lançamento do processo até o primeiro quadro do Tk (em
+    segundos). Sem janela, mede só até a interface estar importada. O tema
+    simples não pode importar o PIL.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        processo = subprocess.Popen(
+            [sys.executable, "-c", CODIGO_INICIALIZACAO.format(tema=tema, janela=janela)],
+            stdout=subprocess.PIPE, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        for linha in processo.stdout:
+            if linha.startswith("primeiro-quadro"):
+                tempos.append(time.perf_counter() - inicio)
+                if tema == "simples":
+                    assert linha.split()[1] == "False", "o tema simples importou o PIL"
+                break
+        processo.wait()
+    if not tempos:
+        raise RuntimeError(f"tema {tema} não chegou ao primeiro quadro")
+    return {"media": sum(tempos) / len(tempos), "minimo": min(tempos)}
+
+
+def bench_lista(tamanhos=(100, 1000, 10000, 50000), operacoes=200, tema=None):
+    """
+    Mede o custo médio de adicionar, ativar/desativar, rolar, redesenhar
+    (update_rows) e remover com a lista já contendo N mensagens. Com 'tema',
+    usa a ListaVirtual real do Tk com o MacroRow desse tema; sem, mede só o modelo.
+    """
+    root = None
+    if tema is not None:
+        import tkinter as tk
+        from functools import partial
+        from tkinter import ttk
+        from macrorh.app import MacroRow
+        from macrorh.temas import TEMAS
+        criar_linha = partial(MacroRow, tema=TEMAS[tema]())
+        root = tk.Tk()
+        root.withdraw()
+    resultados = {}
+    for tamanho in tamanhos:
+        modelo = ModeloMensagens()
+        for i in range(tamanho):
+            modelo.adicionar(f"Mensagem {i}")
+        if root is not None:
+            lista = ListaVirtual(ttk.Frame(root), modelo, criar_linha, ttk.Scrollbar(root))
+            adicionar, remover = lista.adicionar, lambda: lista.remover(len(modelo) - 1)
+            rolar = lambda i: lista.rolar("moveto", i / operacoes)
+            redesenhar = lambda i: lista.redesenhar()
+        else:
+            adicionar, remover = modelo.adicionar, lambda: modelo.remover(len(modelo) - 1)
+            rolar = redesenhar = lambda i: None
+        tempos = {}
+        for nome, operacao in (
+            ("adicionar", lambda i: adicionar()),
+            ("alternar", lambda i: modelo.alternar(i)),
+            ("rolar", rolar),
+            ("redesenhar", redesenhar),
+            ("remover", lambda i: remover()),
+        ):
+            inicio = time.perf_counter()
+            for i in range(operacoes):
+                operacao(i)
+            if root is not None:
+                root.update_idletasks()
+            tempos[nome] = (time.perf_counter() - inicio) / operacoes
+        resultados[tamanho] = tempos
+    if root is not None:
+        root.destroy()
+    return resultados
+
+
+def bench_perfis(perfis=30, mensagens=10000):
+    """Mede o tempo para abrir um perfil com muitos perfis grandes salvos."""
+    with tempfile.TemporaryDirectory() as pasta:
+        armazem = ArmazemPerfis(pasta)
+        textos = mensagens_exemplo(mensagens, 80)
+        for i in range(perfis):
+            armazem.salvar(f"perfil {i}", {"config": {}, "textos": textos, "ativos": bytearray([1]) * mensagens})
+        inicio = time.perf_counter()
+        for i in range(perfis):
+            ArmazemPerfis(pasta).carregar(f"perfil {i}")
+        return (time.perf_counter() - inicio) / perfis
+
+
+def bench_gravador(eventos=100000, reproduzidos=200):
+    """
+    Grava uma sequência longa pelo hook (teclado falso) e mede a memória por
+    evento e o tamanho do arquivo salvo; reproduz um trecho no relógio real, no
+    tempo original e com o dobro da velocidade, e mede o erro de tempo (os
+    percentis são limites de balde do histograma).
+    """
+    sorteio = random.Random(1)
+    teclado = TecladoFalso()
+    gravador = Gravador(teclado, ignorar=("f9",))
+    gravador.iniciar()
+    teclas = ["shift", "a", "ç", "enter", "space", "ctrl", "f9", "backspace"]
+    tempo = 1000.0
+    for _ in range(eventos // 2):
+        tecla = sorteio.choice(teclas)
+        tempo += sorteio.uniform(0, 0.005)
+        teclado.evento("down", tecla, tempo, 30)
+        tempo += sorteio.uniform(0, 0.005)
+        teclado.evento("up", tecla, tempo, 30)
+    linha = gravador.parar()
+    resultados = {"bytes_por_evento": linha.bytes_usados / len(linha)}
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "sequencia.mrh")
+        linha.salvar(caminho)
+        resultados["bytes_arquivo_por_evento"] = os.path.getsize(caminho) / len(linha)
+
+    trecho = LinhaDoTempo()
+    for i in range(reproduzidos):
+        trecho.adicionar(*linha.evento(i))
+    for velocidade in (1.0, 2.0):
+        teclado.injetadas.clear()
+        _, erros = reproduzir(trecho, teclado, velocidade)
+        resultados[f"erro_x{velocidade:g}"] = erros.resumo()
+    return resultados
+
+
+def bench_sequenciador(quantidades=(1, 5, 20), ciclos=5, cadencia=0.01):
+    """
+    Roda N sequências em loop ao mesmo tempo e confere que o número de threads
+    não cresce com N, que os despertares ficam em torno de um por mensagem e
+    que as mensagens de sequências diferentes nunca se intercalam.
+    """
+    resultados = {}
+    for quantidade in quantidades:
+        threads_antes = threading.active_count()
+        sequenciador = Sequenciador()
+        for i in range(quantidade):
+            config = ConfigExecucao(mensagens=(f"sequência {i} mensagem 1", f"sequência {i} mensagem 2"),
+                                    cadencia=cadencia, intervalo=cadencia, loop=True, ciclos=ciclos,
+                                    backend="gravacao")
+            sequenciador.definir(f"s{i}", config)
+        for nome in sequenciador.nomes():
+            sequenciador.iniciar(nome)
+        threads = threading.active_count() - threads_antes
+        assert sequenciador.aguardar(timeout=30)
+        enviado = sequenciador._backends["gravacao"].texto_enviado()
+        sequenciador.encerrar()
+        assert threads == 1, f"{threads} threads para {quantidade} sequências"
+        # Cada linha enviada é uma mensagem inteira: nada se intercalou
+        esperadas = {f"sequência {i} mensagem {m}" for i in range(quantidade) for m in (1, 2)}
+        assert set(enviado.splitlines()) == esperadas
+        estatisticas = sequenciador.estatisticas()
+        mensagens = sum(seq["mensagens"] for seq in estatisticas["sequencias"].values())
+        assert mensagens == quantidade * ciclos * 2
+        resultados[quantidade] = {
+            "threads": threads,
+            "despertares_por_mensagem": estatisticas["despertares"] / mensagens,
+            "jitter_maximo": max(seq["jitter"]["maximo"] for seq in estatisticas["sequencias"].values()),
+        }
+    return resultados
+
+
+def bench_importacao(quantidade=100000, repetidas=10000, buscas=200):
+    """
+    Exporta e importa (em fluxo, sem repetidas) um conjunto grande de mensagens
+    em cada formato; mede a busca incremental e a marcação em massa.
+    """
+    sorteio = random.Random(1)
+    unicas = quantidade - repetidas
+    textos = [f"Mensagem nº {i % unicas} — peça sua música na Rádio Habblet" for i in range(quantidade)]
+    ativos = bytearray(sorteio.getrandbits(1) for _ in range(quantidade))
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        for formato in (".txt", ".csv", ".jsonl"):
+            caminho = os.path.join(pasta, "mensagens" + formato)
+            inicio = time.perf_counter()
+            exportar(textos, ativos, caminho)
+            exportacao = time.perf_counter() - inicio
+            modelo = ModeloMensagens()
+            inicio = time.perf_counter()
+            for lote in lotes_unicos(ler_arquivo(caminho), set()):
+                modelo.estender(lote)
+            resultados[formato[1:]] = {"exportar": exportacao, "importar": time.perf_counter() - inicio}
+            assert modelo.textos == textos[:unicas], formato
+
+    indice = IndiceBusca(modelo)
+    inicio = time.perf_counter()
+    indice.buscar("x")  # Monta o índice
+    resultados["indexar"] = time.perf_counter() - inicio
+    # Busca incremental: cada tecla digitada é uma busca nova
+    consulta = f"nº {unicas - 1} —"
+    inicio = time.perf_counter()
+    for _ in range(buscas // len(consulta)):
+        for fim in range(1, len(consulta) + 1):
+            encontrada = indice.buscar(consulta[:fim], 0)
+    resultados["busca"] = (time.perf_counter() - inicio) / (buscas // len(consulta) * len(consulta))
+    assert encontrada == unicas - 1
+
+    inicio = time.perf_counter()
+    encontradas = indice.todas("nº 1")
+    modelo.definir_ativos(encontradas, False)
+    modelo.definir_ativos(None, True)
+    resultados["marcar_em_massa"] = time.perf_counter() - inicio
+    assert all(modelo.ativos)
+    return resultados
+
+
+def bench_hotkeys(ciclos=1000):
+    """
+    Ativa e para o motor muitas vezes com um teclado falso e confere que as
+    hotkeys não vazam e que cada ciclo só mexe nas hotkeys de envio e parada.
+    """
+    teclado = TecladoFalso()
+    motor = MotorMacro(teclado=teclado)
+    gancho = motor.hotkeys.gancho
+    gancho.despachar = lambda callback: callback()  # Na hora, sem a thread das hotkeys
+    config = ConfigExecucao(mensagens=("oi",), tecla_envio="f8", tecla_parada="esc", backend="gravacao")
+    motor.hotkeys.definir("iniciar", "f12", lambda: motor.iniciar(config))
+    inicio = time.perf_counter()
+    for _ in range(ciclos):
+        teclado.pressionar("f12")
+        assert motor.running
+        teclado.pressionar("esc")
+    duracao = time.perf_counter() - inicio
+    motor.encerrar()
+    assert not teclado.hooks and motor.hotkeys.quantidade == 0, "hotkeys vazaram"
+    return {"operacoes_por_ciclo": (gancho.operacoes - 2) / ciclos, "ciclo": duracao / ciclos}
+
+
+def bench_gancho(quantidades=(0, 3, 50), eventos=20000):
+    """
+    Custo que o hook das hotkeys soma a cada tecla do sistema, sem hotkeys,
+    com poucas e com muitas: teclas sem hotkey (digitação comum) e teclas que
+    são gatilho de alguma hotkey mas sem a combinação exata.
+    """
+    teclado = TecladoFalso()
+    registro = RegistroHotkeys(teclado)
+    combinacoes = [f"f{i}" for i in range(1, 13)] + [f"{modificador}+{letra}" for modificador in ("ctrl", "alt")
+                                                      for letra in "abcdefghijklmnopqrstuvwxyz"]
+    livres = [SimpleNamespace(event_type=tipo, name=letra, scan_code=1000 + i, time=0.0)
+              for i, letra in enumerate("0123456789.,;") for tipo in ("down", "up")]
+    resultados = {}
+    for quantidade in quantidades:
+        for i, combinacao in enumerate(combinacoes[:quantidade]):
+            registro.definir(f"h{i}", combinacao, lambda: None)
+        if not teclado.hooks:
+            resultados[quantidade] = {"tecla_livre": 0.0, "tecla_ligada": 0.0}
+            continue
+        ligadas = [SimpleNamespace(event_type="down", name=gatilho, scan_code=teclado.key_to_scan_codes(gatilho)[0],
+                                   time=0.0) for gatilho in ("f1", "a", "b")[:quantidade]]
+        resultados[quantidade] = {}
+        for caso, lista in (("tecla_livre", livres), ("tecla_ligada", ligadas)):
+            sequencia = [lista[i % len(lista)] for i in range(eventos)]
+            hook = registro.gancho._evento
+            melhor = float("inf")
+            for _ in range(5):
+                inicio = time.perf_counter()
+                for evento in sequencia:
+                    hook(evento)
+                melhor = min(melhor, (time.perf_counter() - inicio) / eventos)
+            resultados[quantidade][caso] = melhor
+        registro.limpar()
+    return resultados
+
+
+def bench_backends(nomes, repeticoes=5):
+    """Mede teclas/s de cada backend executando o mesmo plano sem cadência."""
+    plano = compilar_plano(mensagens_exemplo())
+    resultados = {}
+    for nome in nomes:
+        backend = BACKENDS[nome]()
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            executar_plano(plano, backend, 0, dormir=lambda s: None)
+        duracao = time.perf_counter() - inicio
+        resultados[nome] = plano.total_teclas * repeticoes / duracao
+    return resultados
+
+
+def bench_plano(tamanhos=(100, 1000, 10000), repeticoes=5):
+    """Mede a compilação do plano de teclas (custo por mensagem) para N mensagens."""
+    resultados = {}
+    for tamanho in tamanhos:
+        mensagens = mensagens_exemplo(tamanho)
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            compilar_plano(mensagens)
+        resultados[tamanho] = (time.perf_counter() - inicio) / (repeticoes * tamanho)
+    return resultados
+
+
+def bench_modelos(envios=20000):
+    """
+    Custo de preencher os campos dinâmicos a cada envio, comparado ao de uma
+    mensagem fixa.
+    """
+    resultados = {}
+    casos = {
+        "fixa": "Rádio Habblet no ar! Peça sua música.",
+        "campos": "[{hora}] Rádio Habblet no ar! Pedido nº {contador}, ciclo {ciclo}. {aleatorio:Peça já|Participe|Chama}!",
+    }
+    for nome, texto in casos.items():
+        plano = compilar_plano([texto] * 10)
+        contexto = ContextoEnvio(semente=1)
+        inicio = time.perf_counter()
+        for _ in range(envios // len(plano)):
+            for passos in (plano.renderizar(contexto) if plano.dinamico else plano.mensagens):
+                pass
+        resultados[nome] = (time.perf_counter() - inicio) / envios
+    return resultados
+
+
+def bench_motor(ciclos=200):
+    """Executa o motor sem interface (backend de gravação) num loop curto e mede mensagens/s."""
+    motor = MotorMacro()
+    config = ConfigExecucao(mensagens=tuple(mensagens_exemplo(5, 50)), cadencia=0.00001, loop=True,
+                            intervalo=0.0, ciclos=ciclos, backend="gravacao")
+    motor.iniciar(config)
+    inicio = time.perf_counter()
+    motor.acionar()
+    motor.aguardar()
+    duracao = time.perf_counter() - inicio
+    motor.encerrar()
+    resumo = motor.metricas.resumo()
+    return {
+        "mensagens_por_segundo": resumo["mensagens"] / duracao,
+        "teclas_por_segundo": resumo["teclas_por_segundo"],
+        "erro_ciclo_p99": resumo["erro_ciclo"]["p99"],
+    }
+
+
+def bench_perfilamento(ciclos=200, repeticoes=3):
+    """
+    Mensagens/s do motor sem perfilador, com o perfilador desligado e ligado
+    (o desligado deve ficar igual ao sem).
+    """
+    config = ConfigExecucao(mensagens=tuple(mensagens_exemplo(5, 50)), cadencia=0.00001, loop=True,
+                            intervalo=0.0, ciclos=ciclos, backend="gravacao")
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        for caso in ("nenhum", "desligado", "ligado"):
+            melhor = 0.0
+            for _ in range(repeticoes):
+                motor = MotorMacro()
+                perfilador = Perfilador(pasta) if caso != "nenhum" else None
+                if perfilador is not None:
+                    motor.definir_perfilador(perfilador)
+                    if caso == "ligado":
+                        perfilador.iniciar()
+                motor.iniciar(config)
+                inicio = time.perf_counter()
+                motor.acionar()
+                motor.aguardar()
+                duracao = time.perf_counter() - inicio
+                motor.encerrar()
+                melhor = max(melhor, motor.metricas.resumo()["mensagens"] / duracao)
+                if caso == "ligado":
+                    perfilador.encerrar()
+            resultados[caso] = {"mensagens_por_segundo": melhor}
+    return resultados
+
+
+def bench_eventos(ciclos=500):
+    """
+    Motor publicando progresso a cada mensagem enquanto uma BombaTk (com raiz
+    falsa) esvazia o canal: no máximo uma redesenhada por quadro, o quadro mais
+    lento e o custo da publicação nas mensagens/s. Confere também que os
+    pedidos feitos por outra thread rodam na thread da "interface".
+    """
+    config = ConfigExecucao(mensagens=tuple(mensagens_exemplo(5, 50)), cadencia=0.00001, loop=True,
+                            intervalo=0.0, ciclos=ciclos, backend="gravacao")
+    resultados = {}
+    for caso in ("sem_canal", "com_canal"):
+        motor = MotorMacro()
+        raiz, progresso, threads = RaizFalsa(), {}, []
+        if caso == "com_canal":
+            motor.eventos = CanalEventos()
+            bomba = BombaTk(raiz, motor.eventos, progresso.update)
+            pedido = threading.Thread(target=motor.eventos.pedir, args=(lambda: threads.append(threading.get_ident()),))
+            pedido.start()
+            pedido.join()
+        motor.iniciar(config)
+        inicio = time.perf_counter()
+        motor.acionar()
+        quadros, quadro_maximo = 0, 0.0
+        while caso == "com_canal" and not motor.aguardar(timeout=0):
+            duracao = raiz.girar(0.05)
+            if duracao is not None:
+                quadros += 1
+                quadro_maximo = max(quadro_maximo, duracao)
+        motor.aguardar()
+        duracao = time.perf_counter() - inicio
+        motor.encerrar()
+        resultados[caso] = {"mensagens_por_segundo": motor.metricas.resumo()["mensagens"] / duracao}
+        if caso == "com_canal":
+            while raiz.girar(0.05) is not None:  # Últimos quadros: pegam o que sobrou
+                quadros += 1
+            bomba.encerrar()
+            assert bomba.redesenhos <= quadros, f"{bomba.redesenhos} redesenhadas em {quadros} quadros"
+            assert progresso[MENSAGEM] == (5, 5) and progresso[ESTADO] is False, progresso
+            assert threads == [threading.get_ident()], "o pedido não rodou na thread da interface"
+            resultados[caso].update({
+                "publicados": motor.eventos.publicados,
+                "quadros": quadros,
+                "redesenhos": bomba.redesenhos,
+                "quadro_maximo": quadro_maximo,
+            })
+    return resultados
+
+
+def bench_resistencia(ciclos=300, aquecimento=20, ocioso=1.0):
+    """
+    Centenas de ciclos iniciar/enviar/parar num motor com hotkeys (teclado
+    falso, parada pela hotkey), diário e canal de eventos esvaziado por uma
+    BombaTk (raiz falsa): quanto threads e memória residente crescem com os
+    ciclos. Depois, com a macro parada e com o loop esperando o intervalo,
+    quantas vezes as threads acordam e se a bomba acordou o Tk.
+    """
+    teclado = TecladoFalso()
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        motor = MotorMacro(teclado=teclado)
+        motor.diario = DiarioExecucao(os.path.join(pasta, "diario.jsonl"), intervalo=0.01)
+        motor.eventos = CanalEventos()
+        raiz = RaizFalsa()
+        bomba = BombaTk(raiz, motor.eventos, lambda eventos: None)
+        monitor = MonitorRecursos(lambda: motor.despertares() + bomba.despertares)
+        config = ConfigExecucao(mensagens=tuple(mensagens_exemplo(3, 20)), tecla_envio="f8", tecla_parada="esc",
+                                cadencia=0.0001, loop=True, intervalo=0.0, ciclos=2, backend="gravacao")
+
+        def girar_ate(condicao, timeout=5.0):
+            prazo = time.monotonic() + timeout
+            while not condicao():
+                if time.monotonic() > prazo:
+                    raise TimeoutError("o pedido do motor não chegou à interface")
+                raiz.girar(0.05)
+
+        def ciclo(config):
+            motor.iniciar(config, ao_parar=lambda: motor.eventos.pedir(motor.parar))
+            motor.acionar()
+            motor.aguardar(timeout=5)
+            teclado.pressionar("esc")  # Hotkey -> thread das hotkeys -> canal -> bomba -> parar()
+            girar_ate(lambda: not motor.running)
+            motor.backend.eventos.clear()  # A gravação guarda cada tecla; o que importa é o motor
+
+        for _ in range(aquecimento):
+            ciclo(config)
+        antes = monitor.amostrar()
+        inicio = time.perf_counter()
+        for _ in range(ciclos):
+            ciclo(config)
+        resultados["ciclo"] = (time.perf_counter() - inicio) / ciclos
+        depois = monitor.amostrar()
+        resultados["cpu_por_ciclo"] = (depois.cpu - antes.cpu) / ciclos
+        resultados["threads"] = depois.threads
+        resultados["threads_crescimento"] = depois.threads - antes.threads
+        if antes.rss is not None:
+            resultados["rss_crescimento_mb"] = (depois.rss - antes.rss) / 2 ** 20
+
+        # Parada e ociosa; depois o loop esperando o intervalo entre ciclos
+        longo = ConfigExecucao(mensagens=config.mensagens, tecla_envio="f8", tecla_parada="esc",
+                               cadencia=0.0001, loop=True, intervalo=ocioso * 10, backend="gravacao")
+        for caso in ("parada", "intervalo"):
+            if caso == "intervalo":
+                motor.iniciar(longo)
+                motor.acionar()
+                girar_ate(lambda: motor.agendador is not None and motor.agendador.ciclos == 0
+                          and motor.metricas.mensagens == len(longo.mensagens))
+            time.sleep(0.1)  # Diário e bomba terminam o que já estava pendente
+            while raiz.girar(0) is not None:
+                pass
+            monitor.relatorio()
+            time.sleep(ocioso)
+            relatorio = monitor.relatorio()
+            resultados[f"despertares_por_minuto_{caso}"] = relatorio["despertares_por_minuto"]
+            resultados[f"cpu_percentual_{caso}"] = relatorio["cpu_percentual"]
+            resultados[f"tk_acordado_{caso}"] = int(raiz.evento.is_set())  # A bomba acordou o Tk sem eventos
+        motor.encerrar()
+        bomba.encerrar()
+    return resultados
+
+
+def bench_diario(anotacoes=20000, limite=4096):
+    """
+    Custo de anotar uma mensagem no diário, quantos fsyncs (lotes) isso gera e
+    o tamanho do arquivo com compactação. Simula uma queda no meio do loop
+    (diário fechado antes de parar), retoma num motor novo e confere que
+    nenhuma mensagem foi pulada e que o {contador} continua.
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "diario.jsonl")
+        diario = DiarioExecucao(caminho, intervalo=0.05, limite=limite)
+        config = asdict(ConfigExecucao(mensagens=tuple(mensagens_exemplo(5, 50)), loop=True))
+        diario.iniciar(config, 5)
+        inicio = time.perf_counter()
+        for i in range(anotacoes):
+            diario.mensagem(i // 5 + 1, i % 5 + 1, i + 1)
+            if i % 500 == 0:
+                time.sleep(0.01)  # Deixa a thread do diário gravar no meio
+        resultados["anotar"] = (time.perf_counter() - inicio - 0.01 * (anotacoes // 500 + 1)) / anotacoes
+        diario.fechar()
+        resultados["lotes"] = diario.lotes
+        resultados["compactacoes"] = diario.compactacoes
+        resultados["bytes"] = os.path.getsize(caminho)
+        assert resultados["bytes"] < 2 * limite, "o diário não foi compactado"
+        retomada = ler_retomada(caminho)
+        assert (retomada.ciclos, retomada.mensagem, retomada.contador) == (anotacoes // 5, 0, anotacoes), retomada
+
+        # Queda no meio do loop e retomada num motor novo
+        caminho = os.path.join(pasta, "queda.jsonl")
+        config = ConfigExecucao(mensagens=("[{contador}]", "[{contador}]", "[{contador}]"), cadencia=0.01,
+                                loop=True, intervalo=0.02, ciclos=6, backend="gravacao")
+        enviados = []
+        for etapa in ("queda", "retomada"):
+            motor = MotorMacro()
+            motor.diario = DiarioExecucao(caminho)
+            motor.iniciar(config, retomada=ler_retomada(caminho) if etapa == "retomada" else None)
+            motor.acionar()
+            if etapa == "queda":
+                time.sleep(0.15)
+                motor.diario.fechar()  # A "queda": nada mais chega ao disco
+                motor.parar()
+            motor.aguardar(timeout=5)
+            motor.encerrar()
+            enviados += [linha for linha in motor.backend.texto_enviado().splitlines() if linha.endswith("]")]
+        numeros = [int(linha[1:-1]) for linha in enviados]
+        # Nada pulado; no máximo a mensagem enviada entre a "queda" e a parada se repete
+        assert sorted(set(numeros)) == list(range(1, 19)) and len(numeros) <= 19, numeros
+        assert ler_retomada(caminho) is None, "execução concluída continua retomável"
+    return resultados
+
+
+def bench_temas_lista():
+    """bench_lista com as linhas (MacroRow) de cada tema, para comparar os dois."""
+    if not tem_display():
+        return {"modelo": bench_lista()}
+    return {tema: bench_lista(tema=tema) for tema in ("simples", "imagem")}
+
+
+def bench_temas_inicializacao():
+    """Sem display, mede só a importação (a mesma para os dois temas) e confere que o PIL não vem junto."""
+    if not tem_display():
+        return {"importacao": bench_inicializacao("simples", janela=False)}
+    return {tema: bench_inicializacao(tema) for tema in ("simples", "imagem")}
+
+
+# Nome -> função sem argumentos que devolve um dict (ou número) de resultados
+BENCHMARKS = {
+    "plano": bench_plano,
+    "modelos": bench_modelos,
+    "backends": lambda: bench_backends(["gravacao"]),
+    "colagem": bench_colagem,
+    "limitador": bench_limitador,
+    "calibracao": bench_calibracao,
+    "motor": bench_motor,
+    "perfilamento": bench_perfilamento,
+    "eventos": bench_eventos,
+    "diario": bench_diario,
+    "resistencia": bench_resistencia,
+    "callback": bench_callback,
+    "parada": bench_parada,
+    "hotkeys": bench_hotkeys,
+    "gancho": bench_gancho,
+    "gravador": bench_gravador,
+    "sequenciador": bench_sequenciador,
+    "agendador": bench_agendador,
+    "lista": bench_temas_lista,
+    "perfis": bench_perfis,
+    "importacao": bench_importacao,
+    "inicializacao": bench_temas_inicializacao,
+}
+
+
+def achatar(dados, prefixo=""):
+    """Transforma resultados aninhados em {"a.b.c": número}."""
+    if isinstance(dados, dict):
+        planos = {}
+        for chave, valor in dados.items():
+            planos.update(achatar(valor, f"{prefixo}.{chave}" if prefixo else str(chave)))
+        return planos
+    if isinstance(dados, (int, float)) and not isinstance(dados, bool):
+        return {prefixo: dados}
+    return {}
+
+
+def versao_git():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks da macro")
+    parser.add_argument("nomes", nargs="*", choices=[[]] + sorted(BENCHMARKS), metavar="nome",
+                        help=f"benchmarks a executar (padrão: todos): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--real", action="store_true",
+                        help="inclui backends que digitam na janela em foco")
+    parser.add_argument("--json", metavar="ARQUIVO", help="salva os resultados em JSON")
+    parser.add_argument("--comparar", metavar="ARQUIVO", help="compara com um JSON salvo antes")
+    args = parser.parse_args()
+
+    if args.real:
+        print("Digitando de verdade em 3 segundos: coloque o foco num editor de texto.")
+        time.sleep(3)
+        BENCHMARKS["backends"] = lambda: bench_backends(["gravacao", "pyautogui", "lote"])
+
+    resultados = {}
+    for nome in args.nomes or BENCHMARKS:
+        resultados[nome] = BENCHMARKS[nome]()
+    planos = achatar(resultados)
+
+    anteriores = {}
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anteriores = json.load(arquivo)["resultados"]
+    for chave, valor in planos.items():
+        linha = f"{chave:<55} {valor:>16.6g}"
+        if anteriores.get(chave):
+            linha += f"  ({(valor - anteriores[chave]) / anteriores[chave] * 100:+.1f}%)"
+        print(linha)
+    if not tem_display():
+        print("(sem display: lista só do modelo e inicialização só até importar a interface)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "commit": versao_git(),
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "resultados": planos,
+            }, arquivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Calibração da cadência: descobre a maior velocidade que não perde teclas.
+
+A macro digita as mensagens num campo de texto da própria janela (pelo mesmo
+caminho de envio de sempre: motor, backend, limite de taxa), com cadências
+cada vez menores. Depois de cada etapa o texto recebido é comparado com o
+enviado (teclas perdidas, a mais e fora de ordem). A calibração para na
+primeira etapa com problema e sugere a cadência mais rápida que chegou intacta.
+"""
+import time
+import tkinter as tk
+from collections import Counter
+from dataclasses import replace
+from difflib import SequenceMatcher
+from tkinter import ttk
+
+from modelos import ContextoEnvio, compilar_modelo
+
+CADENCIAS = (0.5, 0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.002, 0.001)  # Da mais lenta à mais rápida
+ESPERA_CHEGADA = 0.3  # Segundos depois do envio para as últimas teclas chegarem ao campo
+MAXIMO_MENSAGENS = 20  # Só as primeiras mensagens ativas são usadas em cada etapa
+
+
+def textos_fixos(mensagens):
+    """Mensagens com os campos dinâmicos já preenchidos, para saber exatamente o que deve chegar."""
+    contexto = ContextoEnvio(semente=0)
+    textos = []
+    for mensagem in mensagens:
+        if not mensagem:
+            continue
+        modelo = compilar_modelo(mensagem)
+        textos.append(modelo if modelo.__class__ is str else modelo.renderizar(contexto))
+    return textos
+
+
+def comparar(enviado, recebido):
+    """Compara o texto enviado com o recebido: teclas perdidas, a mais e fora de ordem."""
+    faltando = sum((Counter(enviado) - Counter(recebido)).values())
+    sobrando = sum((Counter(recebido) - Counter(enviado)).values())
+    em_ordem = sum(bloco.size for bloco in SequenceMatcher(None, enviado, recebido, autojunk=False)
+                   .get_matching_blocks())
+    return {
+        "perdidas": faltando,
+        "extras": sobrando,
+        "fora_de_ordem": len(enviado) - faltando - em_ordem,
+        "intacto": enviado == recebido,
+    }
+
+
+class Calibracao:
+    """Sequência de etapas (uma por cadência) e o resultado de cada uma, sem interface."""
+
+    def __init__(self, mensagens, cadencias=CADENCIAS):
+        self.textos = textos_fixos(mensagens)[:MAXIMO_MENSAGENS]
+        self.esperado = "".join(texto + "\n" for texto in self.textos)  # Cada mensagem termina com enter
+        self.cadencias = list(cadencias)
+        self.etapas = []
+
+    def proxima(self):
+        """Próxima cadência a testar, ou None se acabou (todas testadas ou a última falhou)."""
+        if not self.textos or len(self.etapas) == len(self.cadencias):
+            return None
+        if self.etapas and not self.etapas[-1]["intacto"]:
+            return None
+        return self.cadencias[len(self.etapas)]
+
+    def registrar(self, cadencia, recebido, duracao=None):
+        """Anota o que chegou ao campo de texto na etapa 'cadencia'."""
+        etapa = {"cadencia": cadencia, **comparar(self.esperado, recebido)}
+        if duracao:
+            etapa["teclas_por_segundo"] = len(self.esperado) / duracao
+        self.etapas.append(etapa)
+        return etapa
+
+    @property
+    def cadencia_segura(self):
+        """A cadência mais rápida que chegou intacta (com todas as mais lentas também intactas)."""
+        segura = None
+        for etapa in self.etapas:
+            if not etapa["intacto"]:
+                break
+            segura = etapa["cadencia"]
+        return segura
+
+    def resultado(self):
+        """Resumo guardado no perfil."""
+        return {
+            "data": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "cadencia_segura": self.cadencia_segura,
+            "etapas": self.etapas,
+        }
+
+
+class JanelaCalibracao:
+    """
+    Janela com o campo de texto de destino. Cada etapa é enviada pelo motor
+    (iniciar + acionar, sem hotkey de envio) e conferida depois que a thread de
+    envio fica ociosa; tudo é encadeado com after(), sem travar o Tk.
+    O motor precisa de um canal de eventos (motor.eventos) esvaziado pela interface.
+    ao_terminar: chamado com Calibracao.resultado() (não é chamado se cancelada).
+    """
+
+    def __init__(self, root, motor, config, ao_terminar, cadencias=CADENCIAS):
+        self.motor = motor
+        self.config = config
+        self.ao_terminar = ao_terminar
+        self.calibracao = Calibracao(config.mensagens, cadencias)
+        self.cancelada = False
+        self.inicio = None
+        self._pasta_metricas, motor.pasta_metricas = motor.pasta_metricas, None  # Sem exportar cada etapa
+
+        self.janela = tk.Toplevel(root)
+        self.janela.title("Calibração")
+        self.janela.protocol("WM_DELETE_WINDOW", self.cancelar)
+        ttk.Label(self.janela, text=f"Não use o teclado nem o mouse. {config.tecla_parada} cancela.").pack(pady=5)
+        self.texto = tk.Text(self.janela, width=70, height=12)
+        self.texto.pack(padx=10)
+        self.relatorio_var = tk.StringVar(value="Preparando...")
+        ttk.Label(self.janela, textvariable=self.relatorio_var, justify="left").pack(padx=10, pady=5, anchor="w")
+        self.janela.after(500, self._proxima_etapa)
+
+    def _proxima_etapa(self):
+        if self.cancelada:
+            return
+        cadencia = self.calibracao.proxima()
+        if cadencia is None:
+            self._terminar()
+            return
+        self.texto.delete("1.0", "end")
+        self.texto.focus_force()
+        config = replace(self.config, mensagens=tuple(self.calibracao.textos), cadencia=cadencia,
+                         loop=False, tecla_envio="")
+        self.motor.iniciar(config, ao_parar=lambda: self.motor.eventos.pedir(self.cancelar))  # Hotkey: fora do Tk
+        self.inicio = time.perf_counter()
+        self.motor.acionar()
+        self.janela.after(50, self._aguardar_envio, cadencia)
+
+    def _aguardar_envio(self, cadencia):
+        if self.cancelada:
+            return
+        if self.motor.trabalhador.ocupado:
+            self.janela.after(50, self._aguardar_envio, cadencia)
+            return
+        duracao = time.perf_counter() - self.inicio
+        self.janela.after(int(ESPERA_CHEGADA * 1000), self._conferir, cadencia, duracao)
+
+    def _conferir(self, cadencia, duracao):
+        if self.cancelada:
+            return
+        self.motor.parar()
+        etapa = self.calibracao.registrar(cadencia, self.texto.get("1.0", "end-1c"), duracao)
+        linhas = [f"{e['cadencia']:g}s: " + ("ok" if e["intacto"] else
+                  f"{e['perdidas']} perdidas, {e['extras']} a mais, {e['fora_de_ordem']} fora de ordem")
+                  for e in self.calibracao.etapas]
+        self.relatorio_var.set("\n".join(linhas))
+        print(f"Calibração {cadencia:g}s: {etapa}")
+        self._proxima_etapa()
+
+    def _terminar(self):
+        self.motor.pasta_metricas = self._pasta_metricas
+        resultado = self.calibracao.resultado()
+        segura = resultado["cadencia_segura"]
+        self.relatorio_var.set(self.relatorio_var.get() + "\n\n" + (
+            f"Cadência segura: {segura:g}s (aplicada)" if segura is not None
+            else "Nenhuma cadência chegou intacta."))
+        self.ao_terminar(resultado)
+
+    def cancelar(self):
+        if self.cancelada:
+            return
+        self.cancelada = True
+        self.motor.parar()
+        self.motor.pasta_metricas = self._pasta_metricas
+        self.janela.destroy()
@@ -0,0 +1,114 @@
+"""
+Carregamento sob demanda dos recursos pesados da interface.
+
+- ModuloAdiado: importa módulos como keyboard e pyautogui em segundo plano,
+  depois que a janela já apareceu;
+- carregar_fundo: redimensiona a imagem de fundo uma única vez e guarda o
+  resultado em cache no disco (PNG), que o Tk abre sem precisar do PIL.
+"""
+import importlib
+import os
+import sys
+import threading
+import tkinter as tk
+
+
+class ModuloAdiado:
+    """
+    Substituto de um módulo que só é importado quando usado.
+    preaquecer() inicia a importação numa thread; qualquer atributo acessado
+    antes disso (ex.: keyboard.add_hotkey) espera a importação terminar.
+    """
+
+    def __init__(self, nome):
+        self.nome = nome
+        self._modulo = None
+        self._thread = None
+        self._trava = threading.Lock()
+
+    @property
+    def pronto(self):
+        return self._modulo is not None
+
+    def preaquecer(self, ao_pronto=None):
+        """
+        Começa a importação numa thread em segundo plano.
+        ao_pronto: chamado nessa thread quando o módulo terminar de carregar
+        (não é chamado se a importação falhar).
+        """
+        if self._thread is None and self._modulo is None:
+            self._thread = threading.Thread(target=self._importar, args=(ao_pronto,),
+                                            name=f"importa-{self.nome}", daemon=True)
+            self._thread.start()
+
+    def _importar(self, ao_pronto):
+        try:
+            self.obter()
+        except Exception as e:
+            print(f"Erro ao importar '{self.nome}': {e}")
+            return
+        if ao_pronto is not None:
+            ao_pronto()
+
+    def obter(self):
+        """Retorna o módulo, importando-o agora se ainda não foi."""
+        if self._modulo is None:
+            with self._trava:
+                if self._modulo is None:
+                    self._modulo = importlib.import_module(self.nome)
+        return self._modulo
+
+    def __getattr__(self, atributo):
+        return getattr(self.obter(), atributo)
+
+
+def pasta_cache():
+    """Pasta de cache do usuário (LOCALAPPDATA no Windows, ~/.cache nos demais)."""
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "macrorh")
+
+
+def pasta_dados():
+    """
+    Pasta dos dados do usuário, que não podem ser apagados como o cache
+    (APPDATA no Windows, $XDG_DATA_HOME ou ~/.local/share nos demais).
+    """
+    if sys.platform == "win32" and os.environ.get("APPDATA"):
+        base = os.environ["APPDATA"]
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "macrorh")
+
+
+def carregar_fundo(caminho, largura, altura):
+    """
+    Retorna um tk.PhotoImage com a imagem 'caminho' redimensionada.
+    O resultado fica em cache (chave: tamanho e data da imagem original), então
+    o PIL só é importado quando a imagem muda; a imagem original é fechada
+    assim que o redimensionamento termina.
+    """
+    info = os.stat(caminho)
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    cache = os.path.join(pasta_cache(), f"{nome}-{largura}x{altura}-{info.st_size}-{info.st_mtime_ns}.png")
+    if os.path.exists(cache):
+        return tk.PhotoImage(file=cache)
+
+    from PIL import Image, ImageTk
+    with Image.open(caminho) as original:
+        redimensionada = original.resize((largura, altura), Image.Resampling.LANCZOS)
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        # Remove versões antigas do cache desta mesma imagem
+        prefixo = f"{nome}-{largura}x{altura}-"
+        for arquivo in os.listdir(os.path.dirname(cache)):
+            if arquivo.startswith(prefixo):
+                os.remove(os.path.join(os.path.dirname(cache), arquivo))
+        temporario = cache + ".tmp"
+        redimensionada.save(temporario, format="PNG")
+        os.replace(temporario, cache)
+    except OSError as e:
+        print(f"Aviso: não foi possível salvar o cache do fundo: {e}")
+        return ImageTk.PhotoImage(redimensionada)
+    finally:
+        redimensionada.close()
+    return tk.PhotoImage(file=cache)
@@ -0,0 +1,313 @@
+"""
+Diário da execução: o progresso do loop em disco, para retomar depois de uma queda.
+
+O loop anota cada mensagem enviada (ciclo, número, contador e hora) numa
+linha JSON, só acrescentando ao arquivo. A anotação não toca no disco: as
+linhas ficam numa lista e a thread do diário grava e faz fsync em lotes (no
+máximo a cada INTERVALO_FSYNC), então uma queda perde no máximo esse trecho e
+a retomada pode repetir alguma mensagem, nunca pular. Quando o arquivo cresce
+LIMITE_DIARIO desde a última compactação ele é compactado (reescrito só com o
+início e a última mensagem), e o tamanho fica constante em execuções de vários dias.
+
+As mensagens não entram no diário: são gravadas uma vez por execução num
+arquivo ao lado (caminho_mensagens), e o INICIO guarda só o resumo (hash)
+delas. Assim compactar e anotar mudanças de configuração custa o mesmo com 10
+ou 50 mil mensagens.
+
+Na próxima abertura, ler_retomada() diz de onde continuar: a mensagem
+seguinte, os ciclos já feitos e quanto falta para o prazo dela. Execuções
+paradas pelo usuário ou que terminaram os ciclos não são retomadas.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from carregamento import pasta_dados
+
+# Registros (uma lista JSON por linha)
+INICIO = "i"  # ["i", config sem as mensagens (com CAMPO_RESUMO), total de mensagens do plano]
+MENSAGEM = "m"  # ["m", ciclo, número da mensagem, contador, hora (time.time)]
+CONFIG = "c"  # ["c", {campo: valor}] (mudanças com a macro ativa)
+FIM = "f"  # ["f"] execução parada ou concluída: nada a retomar
+
+INTERVALO_FSYNC = 0.5  # Segundos que uma linha pode esperar na memória antes do fsync
+LIMITE_DIARIO = 64 * 1024  # Bytes acrescentados desde a última compactação antes de compactar de novo
+CAMPO_RESUMO = "mensagens_resumo"  # Hash das mensagens gravadas em caminho_mensagens()
+
+
+def caminho_diario():
+    """Arquivo padrão do diário (nos dados do usuário, como os perfis)."""
+    return os.path.join(pasta_dados(), "diario.jsonl")
+
+
+def caminho_mensagens(caminho):
+    """Arquivo com as mensagens da execução do diário 'caminho'."""
+    return os.path.splitext(caminho)[0] + "-mensagens.json"
+
+
+def _resumo(conteudo):
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def _gravar_atomico(caminho, conteudo):
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(conteudo)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+def _ler_mensagens(caminho, resumo):
+    """Mensagens do arquivo ao lado do diário, ou None se faltam ou não batem com o resumo."""
+    try:
+        with open(caminho_mensagens(caminho), encoding="utf-8") as arquivo:
+            conteudo = arquivo.read()
+    except OSError:
+        return None
+    if _resumo(conteudo) != resumo:
+        return None
+    try:
+        return json.loads(conteudo)
+    except ValueError:
+        return None
+
+
+def _linha(registro):
+    return json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+@dataclass(frozen=True)
+class Retomada:
+    """De onde continuar uma execução interrompida."""
+
+    config: dict  # Campos da ConfigExecucao (ver motor.config_de_dict)
+    ciclos: int  # Ciclos completos já enviados
+    mensagem: int  # Índice (a partir de 0) da próxima mensagem no ciclo
+    contador: int  # Valor do {contador} na última mensagem enviada
+    espera: float  # Segundos até o prazo da próxima mensagem (0 se já passou)
+    registro: list = None  # Última linha MENSAGEM, mantida no diário da execução retomada
+
+
+def ler_retomada(caminho=None, agora=None):
+    """Lê o diário e retorna uma Retomada, ou None se não há execução interrompida."""
+    caminho = caminho or caminho_diario()
+    config = total = ultima = None
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    break  # Última linha incompleta (queda no meio da gravação)
+                tipo = registro[0]
+                if tipo == MENSAGEM:
+                    ultima = registro
+                elif tipo == INICIO:
+                    config, total, ultima = registro[1], registro[2], None
+                elif tipo == CONFIG and config is not None:
+                    config.update(registro[1])
+                elif tipo == FIM:
+                    return None
+    except OSError:
+        return None
+    if config is None or not total:
+        return None
+    if CAMPO_RESUMO in config:
+        mensagens = _ler_mensagens(caminho, config.pop(CAMPO_RESUMO))
+        if mensagens is None:
+            return None  # Sem as mensagens certas não há o que retomar
+        config["mensagens"] = mensagens
+    agora = time.time() if agora is None else agora
+    if ultima is None:
+        return Retomada(config, 0, 0, 0, 0.0)
+    _, ciclo, numero, contador, hora = ultima
+    prazo = hora + config["cadencia"]
+    if numero >= total:
+        ciclos, proxima = ciclo, 0
+        prazo += config["intervalo"]
+        if not config["loop"] or (config["ciclos"] and ciclos >= config["ciclos"]):
+            return None
+    else:
+        ciclos, proxima = ciclo - 1, numero
+    return Retomada(config, ciclos, proxima, contador, max(0.0, prazo - agora), ultima)
+
+
+class DiarioExecucao:
+    """
+    Escreve o diário de uma execução de cada vez. iniciar(), mensagem(),
+    atualizar() e concluir() só mexem em memória (seguros para a thread de
+    envio); a gravação, o fsync e a compactação ficam na thread "macro-diario",
+    criada no primeiro iniciar().
+    """
+
+    def __init__(self, caminho=None, intervalo=INTERVALO_FSYNC, limite=LIMITE_DIARIO):
+        self.caminho = caminho or caminho_diario()
+        self.intervalo = intervalo
+        self.limite = limite
+        self.lotes = 0  # fsyncs feitos (cada um grava todas as linhas pendentes)
+        self.compactacoes = 0
+        self.limite_compactacao = limite  # Tamanho que dispara a próxima compactação
+        self.despertares = 0  # Vezes que a thread do diário acordou para gravar
+        self._config = None
+        self._total = 0
+        self._inicio = None  # Linha INICIO da execução atual (reescrita ao compactar)
+        self._ultima = None  # Última linha MENSAGEM
+        self._fim = None
+        self._pendentes = []
+        self._mensagens = None  # Mensagens da execução, ainda não gravadas em caminho_mensagens()
+        self._geracao = 0  # Conta os iniciar(), para a thread saber se o resumo calculado ainda vale
+        self._reescrever = False
+        self._fechando = False
+        self._condicao = threading.Condition()
+        self._thread = None
+        self._arquivo = None
+        self._tamanho = 0
+
+    def iniciar(self, config, total, ultima=None):
+        """
+        Começa o diário de uma execução (substitui o anterior).
+        config: dict com os campos da ConfigExecucao; total: mensagens no plano.
+        ultima: Retomada.registro, ao continuar uma execução interrompida.
+        As mensagens vão para caminho_mensagens() (uma vez); o diário guarda o
+        resumo delas. Serializar e resumir fica para a thread do diário: com
+        dezenas de milhares de mensagens, não atrasa a primeira tecla.
+        """
+        config = dict(config)
+        mensagens = config.pop("mensagens", ())
+        with self._condicao:
+            self._geracao += 1
+            self._config, self._total = config, total
+            self._mensagens = mensagens
+            # Ainda sem o resumo: a thread o acrescenta antes de gravar esta linha
+            self._inicio = _linha([INICIO, self._config, total])
+            self._ultima = _linha(ultima) if ultima else None
+            self._fim = None
+            self._pendentes = []
+            self._reescrever = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name="macro-diario", daemon=True)
+                self._thread.start()
+            self._condicao.notify()
+
+    def mensagem(self, ciclo, numero, contador):
+        """Anota a mensagem 'numero' (a partir de 1) do ciclo como enviada."""
+        linha = f'["m",{ciclo},{numero},{contador},{time.time():.3f}]\n'
+        with self._condicao:
+            if self._inicio is None or self._fim is not None:
+                return
+            self._ultima = linha
+            self._pendentes.append(linha)
+            if len(self._pendentes) == 1:
+                self._condicao.notify()
+
+    def atualizar(self, mudancas):
+        """Anota mudanças de configuração feitas com a macro ativa (cadência, intervalo, loop)."""
+        with self._condicao:
+            if self._inicio is None or self._fim is not None:
+                return
+            self._config.update(mudancas)
+            self._inicio = _linha([INICIO, self._config, self._total])
+            self._pendentes.append(_linha([CONFIG, mudancas]))
+            self._condicao.notify()
+
+    def concluir(self):
+        """Marca a execução como parada ou terminada: não será oferecida para retomar."""
+        with self._condicao:
+            if self._inicio is None or self._fim is not None:
+                return
+            self._fim = _linha([FIM])
+            self._pendentes.append(self._fim)
+            self._condicao.notify()
+
+    def descartar(self):
+        """Apaga o diário de uma execução interrompida que o usuário não quis retomar."""
+        with self._condicao:
+            if self._inicio is not None:
+                return  # Já há uma execução nova neste diário
+        try:
+            os.remove(self.caminho)
+        except FileNotFoundError:
+            pass
+        try:
+            os.remove(caminho_mensagens(self.caminho))
+        except FileNotFoundError:
+            pass
+
+    def fechar(self, timeout=5.0):
+        """Grava o que falta (sem concluir: a execução ativa continua retomável) e finaliza a thread."""
+        with self._condicao:
+            self._fechando = True
+            self._condicao.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _executar(self):
+        while True:
+            with self._condicao:
+                while not self._pendentes and not self._reescrever and not self._fechando:
+                    self._condicao.wait()
+                self.despertares += 1
+                mensagens, self._mensagens = self._mensagens, None
+                geracao = self._geracao
+            if mensagens is not None:
+                mensagens = json.dumps(list(mensagens), ensure_ascii=False)
+                resumo = _resumo(mensagens)
+            with self._condicao:
+                if geracao != self._geracao:
+                    continue  # Um iniciar() chegou no meio: as mensagens dele são resumidas na próxima volta
+                if mensagens is not None:
+                    self._config[CAMPO_RESUMO] = resumo
+                    self._inicio = _linha([INICIO, self._config, self._total])
+                # Junta as linhas que chegarem durante o intervalo num único fsync
+                if not self._reescrever:
+                    self._condicao.wait_for(lambda: self._fechando, self.intervalo)
+                linhas, self._pendentes = self._pendentes, []
+                reescrever, self._reescrever = self._reescrever, False
+                conteudo = self._inicio + (self._ultima or "") + (self._fim or "")
+                fechando = self._fechando and not self._pendentes
+            try:
+                if mensagens is not None:
+                    _gravar_atomico(caminho_mensagens(self.caminho), mensagens)  # Antes do INICIO que as cita
+                if reescrever or self._arquivo is None:
+                    self._compactar(conteudo, reescrever)
+                elif linhas:
+                    self._arquivo.write("".join(linhas))
+                    self._tamanho = self._arquivo.tell()
+                    if self._tamanho > self.limite_compactacao:
+                        self._compactar(conteudo, False)  # Já inclui as linhas recém-escritas
+                    else:
+                        self._sincronizar(self._arquivo)
+            except OSError as e:
+                print(f"Erro ao gravar o diário da execução: {e}")
+            if fechando:
+                if self._arquivo is not None:
+                    self._arquivo.close()
+                    self._arquivo = None
+                return
+
+    def _sincronizar(self, arquivo):
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+        self.lotes += 1
+
+    def _compactar(self, conteudo, nova_execucao):
+        """Reescreve o diário só com o necessário para retomar (troca atômica)."""
+        if self._arquivo is not None:
+            self._arquivo.close()  # No Windows, os.replace falha com o arquivo aberto
+            self._arquivo = None
+        os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+            self._sincronizar(arquivo)
+        os.replace(temporario, self.caminho)
+        if not nova_execucao:
+            self.compactacoes += 1
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+        self._tamanho = self._arquivo.tell()
+        self.limite_compactacao = self._tamanho + self.limite
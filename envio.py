@@ -0,0 +1,419 @@
+"""
+Plano de teclas pré-compilado e backends de injeção.
+
+As mensagens ativas são compiladas uma única vez (em iniciar_macro) num plano
+de passos simples e reutilizável. O plano é executado por um backend plugável:
+- "pyautogui": comportamento original (pyautogui.write + pyautogui.press);
+- "lote": injeção direta pelo módulo keyboard, sem a pausa do pyautogui;
+- "gravacao": grava os passos em memória (testes e benchmarks).
+
+Cada mensagem pode ser digitada tecla a tecla ou colada pela área de
+transferência (um único atalho, qualquer que seja o tamanho, e sem perder
+caracteres fora do layout do teclado, como "ç" e "ã").
+"""
+import time
+
+from modelos import ContextoEnvio, compilar_modelo
+
+# Tipos de passo do plano
+ESCREVER = "escrever"
+PRESSIONAR = "pressionar"
+COLAR = "colar"
+
+# Modos de envio das mensagens
+MODO_DIGITAR = "digitar"
+MODO_COLAR = "colar"
+MODO_AUTO = "auto"  # Cola só as mensagens longas ou com caracteres fora do ASCII
+MODOS_ENVIO = (MODO_DIGITAR, MODO_COLAR, MODO_AUTO)
+RAJADA_PADRAO = 10  # Teclas que o limitador de taxa deixa passar de uma vez
+LIMITE_DIGITAR = 40  # No modo automático, mensagens maiores que isso são coladas
+ESPERA_COLAR = 0.05  # Tempo para o programa de destino ler a área de transferência
+
+
+class PlanoTeclas:
+    """
+    Plano compilado: uma tupla de passos (tipo, valor) para cada mensagem.
+    O valor é um texto pronto ou um modelos.Modelo (mensagem com campos dinâmicos).
+    """
+
+    __slots__ = ("mensagens", "total_teclas", "dinamicas")
+
+    def __init__(self, mensagens):
+        self.mensagens = mensagens
+        self.total_teclas = sum(contar_teclas(passos) for passos in mensagens)
+        # Para cada mensagem: True se algum passo tem campos a preencher no envio
+        self.dinamicas = tuple(any(valor.__class__ is not str for _, valor in passos) for passos in mensagens)
+
+    def __len__(self):
+        return len(self.mensagens)
+
+    def __bool__(self):
+        return bool(self.mensagens)
+
+    @property
+    def dinamico(self):
+        return any(self.dinamicas)
+
+    def mensagem(self, indice, contexto):
+        """Passos da mensagem 'indice' com os campos preenchidos (sem campos: como foi compilada)."""
+        contexto.contador += 1
+        passos = self.mensagens[indice]
+        if self.dinamicas[indice]:
+            passos = tuple((tipo, valor if valor.__class__ is str else valor.renderizar(contexto))
+                           for tipo, valor in passos)
+        return passos
+
+    def renderizar(self, contexto, inicio=0):
+        """Passos de cada mensagem (a partir de 'inicio') com os campos preenchidos, gerados um a um."""
+        for indice in range(inicio, len(self.mensagens)):
+            yield self.mensagem(indice, contexto)
+
+
+def contar_teclas(passos):
+    """Conta quantas teclas um conjunto de passos vai injetar."""
+    total = 0
+    for tipo, valor in passos:
+        total += len(valor) if tipo is ESCREVER else 1  # Colar conta como um atalho
+    return total
+
+
+def deve_colar(mensagem, modo):
+    """Decide se a mensagem é colada (True) ou digitada, conforme o modo de envio."""
+    if modo == MODO_AUTO:
+        return len(mensagem) > LIMITE_DIGITAR or not mensagem.isascii()
+    return modo == MODO_COLAR
+
+
+def compilar_plano(mensagens, apagar_tecla=False, modo=MODO_DIGITAR):
+    """
+    Compila as mensagens em um PlanoTeclas.
+    mensagens: textos das linhas ativas (mensagens vazias são ignoradas).
+    apagar_tecla: se True, cada mensagem começa com 'backspace' (usado quando a
+                  tecla de envio é um caractere comum, que acaba sendo digitado).
+    modo: MODO_DIGITAR, MODO_COLAR ou MODO_AUTO (decidido mensagem a mensagem).
+    """
+    if modo not in MODOS_ENVIO:
+        raise ValueError(f"Modo de envio desconhecido: {modo!r}")
+    compiladas = []
+    for msg in mensagens:
+        if not msg:
+            continue
+        passos = []
+        if apagar_tecla:
+            passos.append((PRESSIONAR, "backspace"))
+        passos.append((COLAR if deve_colar(msg, modo) else ESCREVER, compilar_modelo(msg)))
+        passos.append((PRESSIONAR, "enter"))
+        compiladas.append(tuple(passos))
+    return PlanoTeclas(tuple(compiladas))
+
+
+class AreaTransferencia:
+    """Área de transferência do sistema, pelo pyperclip (instalado junto com o pyautogui)."""
+
+    def __init__(self):
+        import pyperclip
+        self._copiar = pyperclip.copy
+        self._colar = pyperclip.paste
+
+    def ler(self):
+        return self._colar()
+
+    def escrever(self, texto):
+        self._copiar(texto)
+
+
+class AreaTransferenciaMemoria:
+    """Área de transferência em memória (backend de gravação, testes e benchmarks)."""
+
+    def __init__(self, texto=""):
+        self.texto = texto
+
+    def ler(self):
+        return self.texto
+
+    def escrever(self, texto):
+        self.texto = texto
+
+
+class BackendInjecao:
+    """Interface dos backends de injeção de teclas."""
+
+    nome = "base"
+    area_transferencia = None  # Criada no primeiro envio colado
+    espera_colar = ESPERA_COLAR
+
+    def escrever(self, texto):
+        raise NotImplementedError
+
+    def pressionar(self, tecla):
+        raise NotImplementedError
+
+    def atalho_colar(self):
+        """Pressiona o atalho de colar do sistema."""
+        self.pressionar("ctrl+v")
+
+    def escrever_tecla(self, caractere):
+        """Digita um único caractere (usado quando o envio pode ser cancelado)."""
+        self.escrever(caractere)
+
+    def colar(self, texto):
+        """
+        Cola 'texto' com um único atalho e devolve à área de transferência o
+        conteúdo que o usuário tinha antes.
+        """
+        if self.area_transferencia is None:
+            self.area_transferencia = AreaTransferencia()
+        area = self.area_transferencia
+        anterior = area.ler()
+        area.escrever(texto)
+        try:
+            self.atalho_colar()
+            # O destino lê a área de transferência quando processa o atalho, não na hora
+            if self.espera_colar:
+                time.sleep(self.espera_colar)
+        finally:
+            area.escrever(anterior)
+
+    def executar(self, passos, cancelar=None):
+        """
+        Injeta os passos de uma mensagem.
+        cancelar: threading.Event opcional; se for setado, o envio para entre
+                  uma tecla e outra. Retorna False se foi cancelado.
+        """
+        for tipo, valor in passos:
+            if cancelar is None:
+                if tipo is ESCREVER:
+                    self.escrever(valor)
+                elif tipo is COLAR:
+                    self.colar(valor)
+                else:
+                    self.pressionar(valor)
+            elif tipo is ESCREVER:
+                for caractere in valor:
+                    if cancelar.is_set():
+                        return False
+                    self.escrever_tecla(caractere)
+            else:
+                if cancelar.is_set():
+                    return False
+                if tipo is COLAR:
+                    self.colar(valor)
+                else:
+                    self.pressionar(valor)
+        return True
+
+
+class BackendPyAutoGUI(BackendInjecao):
+    """Backend original: uma chamada do pyautogui (com PAUSE) por passo."""
+
+    nome = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def escrever(self, texto):
+        self._pyautogui.write(texto)
+
+    def pressionar(self, tecla):
+        self._pyautogui.press(tecla)
+
+    def atalho_colar(self):
+        self._pyautogui.hotkey("ctrl", "v")
+
+    def escrever_tecla(self, caractere):
+        # Mesma chamada que o pyautogui.write faz para cada caractere
+        self._pyautogui.press(caractere, _pause=False)
+
+
+class BackendLote(BackendInjecao):
+    """Backend de baixa latência: injeta pelo módulo keyboard, sem pausas extras."""
+
+    nome = "lote"
+
+    def __init__(self):
+        import keyboard
+        self._write = keyboard.write
+        self._send = keyboard.send
+
+    def escrever(self, texto):
+        self._write(texto, delay=0)
+
+    def pressionar(self, tecla):
+        self._send(tecla)
+
+
+class BackendGravacao(BackendInjecao):
+    """Backend em memória: grava (instante, tipo, valor) em vez de injetar teclas."""
+
+    nome = "gravacao"
+    espera_colar = 0
+
+    def __init__(self, relogio=time.monotonic):
+        self.relogio = relogio
+        self.eventos = []
+        self.teclas = 0
+        self.area_transferencia = AreaTransferenciaMemoria()
+
+    def escrever(self, texto):
+        self.eventos.append((self.relogio(), ESCREVER, texto))
+        self.teclas += len(texto)
+
+    def pressionar(self, tecla):
+        self.eventos.append((self.relogio(), PRESSIONAR, tecla))
+        self.teclas += 1
+
+    def atalho_colar(self):
+        # Grava o que estava na área de transferência no momento do atalho
+        self.eventos.append((self.relogio(), COLAR, self.area_transferencia.ler()))
+        self.teclas += 1
+
+    def texto_enviado(self):
+        """
+        Reconstrói o texto que teria chegado ao destino (enter vira quebra de linha).
+        O 'backspace' só apaga a tecla de envio digitada, que não é gravada aqui.
+        """
+        partes = []
+        for _, tipo, valor in self.eventos:
+            if tipo is ESCREVER or tipo is COLAR:
+                partes.append(valor)
+            elif valor == "enter":
+                partes.append("\n")
+        return "".join(partes)
+
+
+class LimitadorTaxa:
+    """
+    Balde de fichas: deixa passar até 'rajada' teclas seguidas e, na média,
+    no máximo 'taxa' teclas por segundo. Evita que a fila de entrada do
+    programa de destino transborde (teclas perdidas ou fora de ordem).
+    """
+
+    __slots__ = ("taxa", "rajada", "fichas", "ultimo", "relogio", "dormir", "esperas")
+
+    def __init__(self, taxa, rajada=RAJADA_PADRAO, relogio=time.monotonic, dormir=time.sleep):
+        if taxa <= 0:
+            raise ValueError("A taxa precisa ser maior que zero")
+        self.taxa = taxa
+        self.rajada = max(1, int(rajada))
+        self.fichas = float(self.rajada)  # Começa cheio
+        self.ultimo = None
+        self.relogio = relogio
+        self.dormir = dormir
+        self.esperas = 0  # Vezes que o envio teve de esperar por fichas
+
+    def _repor(self):
+        agora = self.relogio()
+        if self.ultimo is not None:
+            self.fichas = min(self.rajada, self.fichas + (agora - self.ultimo) * self.taxa)
+        self.ultimo = agora
+
+    def consumir(self, quantidade=1, cancelar=None):
+        """
+        Espera até haver 'quantidade' fichas (no máximo 'rajada') e as gasta.
+        Retorna False se 'cancelar' (threading.Event) foi setado durante a espera.
+        """
+        self._repor()
+        falta = quantidade - self.fichas
+        if falta > 0:
+            self.esperas += 1
+            dormir = cancelar.wait if cancelar is not None else self.dormir
+            if dormir(falta / self.taxa):
+                return False
+            self._repor()
+        # Se acordou um pouco antes, o saldo fica negativo e a próxima espera compensa
+        self.fichas -= quantidade
+        return True
+
+
+class BackendLimitado(BackendInjecao):
+    """Envolve outro backend e segura o envio para respeitar um LimitadorTaxa."""
+
+    def __init__(self, backend, limitador):
+        self.backend = backend
+        self.limitador = limitador
+        self.nome = backend.nome
+
+    def escrever(self, texto):
+        self.executar(((ESCREVER, texto),))
+
+    def pressionar(self, tecla):
+        self.executar(((PRESSIONAR, tecla),))
+
+    def executar(self, passos, cancelar=None):
+        limitador, backend = self.limitador, self.backend
+        for tipo, valor in passos:
+            if tipo is ESCREVER:
+                # Textos vão em trechos de até uma rajada, cada um esperando suas fichas
+                for inicio in range(0, len(valor), limitador.rajada):
+                    trecho = valor[inicio:inicio + limitador.rajada]
+                    if not limitador.consumir(len(trecho), cancelar) or \
+                            not backend.executar(((ESCREVER, trecho),), cancelar):
+                        return False
+            elif not limitador.consumir(1, cancelar) or not backend.executar(((tipo, valor),), cancelar):
+                return False  # Colar conta como uma tecla (um atalho)
+        return True
+
+
+class BackendSerializado(BackendInjecao):
+    """
+    Envolve outro backend com uma trava: cada mensagem é injetada inteira antes
+    que outra thread (outra sequência) possa injetar a sua.
+    """
+
+    def __init__(self, backend, trava):
+        self.backend = backend
+        self.trava = trava
+        self.nome = backend.nome
+
+    def escrever(self, texto):
+        with self.trava:
+            self.backend.escrever(texto)
+
+    def pressionar(self, tecla):
+        with self.trava:
+            self.backend.pressionar(tecla)
+
+    def executar(self, passos, cancelar=None):
+        with self.trava:
+            return self.backend.executar(passos, cancelar)
+
+
+BACKENDS = {
+    BackendPyAutoGUI.nome: BackendPyAutoGUI,
+    BackendLote.nome: BackendLote,
+    BackendGravacao.nome: BackendGravacao,
+}
+
+BACKEND_PADRAO = BackendPyAutoGUI.nome
+
+
+def criar_backend(nome=BACKEND_PADRAO):
+    """Cria o backend pelo nome (ver BACKENDS)."""
+    try:
+        return BACKENDS[nome]()
+    except KeyError:
+        raise ValueError(f"Backend desconhecido: {nome!r}") from None
+
+
+def executar_plano(plano, backend, cadencia, dormir=time.sleep, cancelar=None, contexto=None, ao_enviar=None):
+    """
+    Executa o plano inteiro uma vez, esperando 'cadencia' segundos após cada mensagem.
+    Com 'cancelar' (threading.Event), as esperas acordam na hora e o envio para
+    entre teclas. Retorna False se foi cancelado.
+    contexto: ContextoEnvio da execução, para os campos dinâmicos (contador etc.).
+    ao_enviar: chamado com o número (a partir de 1) de cada mensagem enviada.
+    """
+    if cancelar is not None:
+        dormir = cancelar.wait
+    mensagens = plano.mensagens
+    if plano.dinamico:
+        mensagens = plano.renderizar(contexto or ContextoEnvio())
+    for numero, passos in enumerate(mensagens, 1):
+        if not backend.executar(passos, cancelar):
+            return False
+        if ao_enviar is not None:
+            ao_enviar(numero)
+        if dormir(cadencia):
+            return False
+    return True
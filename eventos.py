@@ -0,0 +1,137 @@
+"""
+Canal de eventos do motor (threads de envio e de hotkeys) para a interface Tk.
+
+O Tk só pode ser tocado pela thread dele. As outras threads publicam no
+CanalEventos, que nunca bloqueia nem chama o Tk: o progresso (mensagem atual,
+ciclo, prazo do próximo ciclo, estado) guarda só o último valor de cada tipo,
+e os pedidos (ex.: parar pela hotkey) entram numa fila. A BombaTk esvazia o
+canal com root.after: no máximo uma redesenhada por quadro, qualquer que seja
+a taxa de envio.
+
+Nada roda por tempo: o primeiro evento depois de um esvaziamento acorda o Tk
+(um evento virtual, gerado pela thread "macro-bomba" para que quem publica
+nunca espere pelo Tk), e a bomba esvazia o canal um quadro depois, juntando o
+que chegar nesse meio-tempo. Com a macro parada ou esperando o intervalo do
+loop, a thread do Tk só acorda quando há algo para mostrar.
+"""
+import threading
+from collections import deque
+
+ESTADO = "estado"  # True ao iniciar, False ao parar
+MENSAGEM = "mensagem"  # (número da mensagem, total) da última enviada
+CICLO = "ciclo"  # Número do ciclo do loop em andamento
+PROXIMO = "proximo"  # Prazo (time.monotonic) do próximo ciclo, ou None enquanto envia
+QUADRO_MS = 16  # Espera entre o aviso e o esvaziamento: no máximo ~60 redesenhadas/s
+EVENTO_TK = "<<CanalEventos>>"  # Evento virtual que acorda a thread do Tk
+
+
+class CanalEventos:
+    """
+    Seguro entre threads. publicar() coalesce por tipo; pedir() enfileira em ordem.
+    ao_chegar: chamado (na thread que publica) só no primeiro evento ou pedido
+    depois de cada drenar(); a BombaTk o usa para acordar o Tk.
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._ultimos = {}
+        self._pedidos = deque()
+        self._avisado = False
+        self.ao_chegar = None
+        self.publicados = 0
+
+    def publicar(self, tipo, valor):
+        """Anota o valor mais recente de 'tipo' (os anteriores ainda não lidos são descartados)."""
+        with self._trava:
+            self._ultimos[tipo] = valor
+            self.publicados += 1
+            avisar, self._avisado = not self._avisado, True
+        if avisar:
+            self._avisar()
+
+    def pedir(self, funcao, *args):
+        """Pede que funcao(*args) rode na thread do Tk (pedidos não são coalescidos)."""
+        with self._trava:
+            self._pedidos.append((funcao, args))
+            avisar, self._avisado = not self._avisado, True
+        if avisar:
+            self._avisar()
+
+    def _avisar(self):
+        ao_chegar = self.ao_chegar
+        if ao_chegar is not None:
+            ao_chegar()
+
+    def drenar(self):
+        """Retorna (último valor de cada tipo, lista de pedidos) e esvazia o canal."""
+        with self._trava:
+            ultimos, self._ultimos = self._ultimos, {}
+            pedidos = list(self._pedidos)
+            self._pedidos.clear()
+            self._avisado = False
+        return ultimos, pedidos
+
+    def rearmar(self):
+        """O aviso anterior não chegou: o próximo publicar()/pedir() avisa de novo."""
+        with self._trava:
+            self._avisado = False
+
+
+class BombaTk:
+    """
+    Esvazia o canal na thread do Tk: roda os pedidos em ordem e chama
+    ao_atualizar(eventos) uma vez, só se houve eventos desde o quadro anterior.
+    Só roda quando o canal avisa (EVENTO_TK), QUADRO_MS depois do aviso.
+    """
+
+    def __init__(self, root, canal, ao_atualizar):
+        self.root = root
+        self.canal = canal
+        self.ao_atualizar = ao_atualizar
+        self.redesenhos = 0
+        self.despertares = 0  # Esvaziamentos (vezes que o canal acordou a thread do Tk)
+        self._agendado = None
+        self._aviso = threading.Event()
+        self._encerrando = False
+        root.bind(EVENTO_TK, self._acordar)
+        canal.ao_chegar = self._aviso.set
+        threading.Thread(target=self._avisar, name="macro-bomba", daemon=True).start()
+        self._drenar()  # O que chegou antes da bomba existir
+
+    def _avisar(self):
+        # O tkinter entrega o evento à thread do Tk e espera por ela: só esta thread fica esperando
+        while True:
+            self._aviso.wait()
+            self._aviso.clear()
+            if self._encerrando:
+                return
+            try:
+                self.root.event_generate(EVENTO_TK, when="tail")
+            except Exception as e:  # RuntimeError/TclError: janela fechando ou fora do mainloop
+                print(f"Aviso: a interface não recebeu o evento do motor: {e}")
+                self.canal.rearmar()  # Senão o canal fica esperando um drenar() que nunca vem
+
+    def _acordar(self, evento=None):
+        if self._agendado is None:
+            self._agendado = self.root.after(QUADRO_MS, self._drenar)
+
+    def _drenar(self):
+        self._agendado = None
+        self.despertares += 1
+        eventos, pedidos = self.canal.drenar()
+        for funcao, args in pedidos:
+            try:
+                funcao(*args)
+            except Exception as e:
+                print(f"Erro ao atender pedido do motor: {e}")
+        if eventos:
+            self.redesenhos += 1
+            self.ao_atualizar(eventos)
+
+    def encerrar(self):
+        self.canal.ao_chegar = None
+        self._encerrando = True
+        self._aviso.set()
+        if self._agendado is not None:
+            self.root.after_cancel(self._agendado)
+            self._agendado = None
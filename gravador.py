@@ -0,0 +1,205 @@
+"""
+Gravação e reprodução de sequências de teclas com o tempo original.
+
+A gravação usa o hook do módulo keyboard e guarda cada evento (tecla apertada
+ou solta, com modificadores, teclas especiais e pausas) numa LinhaDoTempo:
+arrays compactos em vez de uma lista de objetos Python, cerca de 13 bytes por
+evento. A reprodução segue prazos absolutos (como o AgendadorDeadline), pode
+acelerar ou desacelerar o tempo original e mede o erro de cada evento.
+
+Uso pela linha de comando:
+    python gravador.py gravar sequencia.mrh --parar f9
+    python gravador.py reproduzir sequencia.mrh --velocidade 2
+"""
+import argparse
+import json
+import threading
+import time
+from array import array
+
+from metricas import Histograma
+
+APERTAR = 0
+SOLTAR = 1
+MARGEM_ESPERA = 0.002  # Últimos milissegundos antes de cada evento esperados ativamente
+VERSAO_ARQUIVO = 1
+
+
+class LinhaDoTempo:
+    """
+    Eventos de teclado em arrays paralelos:
+    tempos (s desde o primeiro evento), tipos (APERTAR/SOLTAR), códigos de
+    varredura e índices na tabela de nomes de tecla (cada nome é guardado uma vez).
+    """
+
+    __slots__ = ("tempos", "tipos", "codigos", "teclas", "nomes", "_indices")
+
+    def __init__(self):
+        self.tempos = array("d")
+        self.tipos = array("B")
+        self.codigos = array("H")
+        self.teclas = array("H")
+        self.nomes = []
+        self._indices = {}
+
+    def __len__(self):
+        return len(self.tempos)
+
+    def adicionar(self, tempo, tipo, nome, codigo=0):
+        indice = self._indices.get(nome)
+        if indice is None:
+            indice = self._indices[nome] = len(self.nomes)
+            self.nomes.append(nome)
+        self.tempos.append(tempo)
+        self.tipos.append(tipo)
+        self.codigos.append(codigo & 0xFFFF)
+        self.teclas.append(indice)
+
+    def evento(self, i):
+        """(tempo, tipo, nome, código) do evento i."""
+        return self.tempos[i], self.tipos[i], self.nomes[self.teclas[i]], self.codigos[i]
+
+    @property
+    def duracao(self):
+        return self.tempos[-1] if self.tempos else 0.0
+
+    @property
+    def bytes_usados(self):
+        """Memória ocupada pelos eventos (sem a tabela de nomes)."""
+        return sum(a.itemsize * len(a) for a in (self.tempos, self.tipos, self.codigos, self.teclas))
+
+    def salvar(self, caminho):
+        """Grava um cabeçalho JSON numa linha seguido dos arrays em binário."""
+        cabecalho = {"versao": VERSAO_ARQUIVO, "eventos": len(self), "nomes": self.nomes}
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(json.dumps(cabecalho, ensure_ascii=False).encode("utf-8") + b"\n")
+            for dados in (self.tempos, self.tipos, self.codigos, self.teclas):
+                dados.tofile(arquivo)
+
+    @classmethod
+    def carregar(cls, caminho):
+        linha = cls()
+        with open(caminho, "rb") as arquivo:
+            cabecalho = json.loads(arquivo.readline())
+            if cabecalho.get("versao") != VERSAO_ARQUIVO:
+                raise ValueError(f"Versão de gravação não suportada: {cabecalho.get('versao')!r}")
+            total = cabecalho["eventos"]
+            for dados in (linha.tempos, linha.tipos, linha.codigos, linha.teclas):
+                dados.fromfile(arquivo, total)
+        linha.nomes = cabecalho["nomes"]
+        linha._indices = {nome: i for i, nome in enumerate(linha.nomes)}
+        return linha
+
+
+class Gravador:
+    """
+    Grava os eventos do teclado numa LinhaDoTempo.
+    teclado: módulo keyboard (ou ModuloAdiado, ou um substituto em testes).
+    ignorar: teclas que não entram na gravação (ex.: a hotkey que para de gravar).
+    """
+
+    def __init__(self, teclado, ignorar=()):
+        self.teclado = teclado
+        self.ignorar = {tecla.lower() for tecla in ignorar}
+        self.linha = None
+        self._inicio = None
+        self._hook = None
+
+    @property
+    def gravando(self):
+        return self._hook is not None
+
+    def iniciar(self):
+        self.linha = LinhaDoTempo()
+        self._inicio = None
+        self._hook = self.teclado.hook(self._evento)
+
+    def _evento(self, evento):
+        # Roda na thread do hook: só acrescenta nos arrays
+        nome = (evento.name or "").lower()
+        if nome in self.ignorar:
+            return
+        if self._inicio is None:
+            self._inicio = evento.time
+        tipo = APERTAR if evento.event_type == "down" else SOLTAR
+        self.linha.adicionar(evento.time - self._inicio, tipo, nome, evento.scan_code or 0)
+
+    def parar(self):
+        """Para de gravar e retorna a LinhaDoTempo."""
+        if self._hook is not None:
+            self.teclado.unhook(self._hook)
+            self._hook = None
+        return self.linha
+
+
+def reproduzir(linha, teclado, velocidade=1.0, cancelar=None, relogio=time.perf_counter, dormir=None):
+    """
+    Reproduz a linha do tempo com teclado.press/teclado.release, no tempo
+    original dividido por 'velocidade'. Cada evento tem um prazo absoluto
+    (atrasos não se acumulam); a espera é feita com 'dormir' até MARGEM_ESPERA
+    antes do prazo e o resto é esperado ativamente.
+    cancelar: threading.Event opcional; interrompe a reprodução entre eventos.
+    Retorna (completa, Histograma do erro de tempo de cada evento em segundos).
+    """
+    if velocidade <= 0:
+        raise ValueError("A velocidade precisa ser maior que zero")
+    if dormir is None:
+        dormir = cancelar.wait if cancelar is not None else time.sleep
+    apertar, soltar = teclado.press, teclado.release
+    erros = Histograma()
+    tempos, tipos, teclas, codigos, nomes = linha.tempos, linha.tipos, linha.teclas, linha.codigos, linha.nomes
+    inicio = relogio()
+    for i in range(len(tempos)):
+        prazo = inicio + tempos[i] / velocidade
+        restante = prazo - relogio() - MARGEM_ESPERA
+        if restante > 0 and dormir(restante):
+            return False, erros
+        if cancelar is not None and cancelar.is_set():
+            return False, erros
+        while relogio() < prazo:
+            pass
+        tecla = nomes[teclas[i]] or codigos[i]
+        if tipos[i] == APERTAR:
+            apertar(tecla)
+        else:
+            soltar(tecla)
+        erros.adicionar(relogio() - prazo)
+    return True, erros
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grava e reproduz sequências de teclas")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    gravar = sub.add_parser("gravar", help="grava até a hotkey de parada")
+    gravar.add_argument("arquivo")
+    gravar.add_argument("--parar", default="f9", help="tecla que encerra a gravação (padrão: f9)")
+    repro = sub.add_parser("reproduzir", help="reproduz uma gravação")
+    repro.add_argument("arquivo")
+    repro.add_argument("--velocidade", type=float, default=1.0, help="2 = duas vezes mais rápido")
+    repro.add_argument("--espera", type=float, default=3.0, help="segundos antes de começar")
+    args = parser.parse_args(argv)
+
+    import keyboard
+    if args.comando == "gravar":
+        gravador = Gravador(keyboard, ignorar=(args.parar,))
+        print(f"Gravando... pressione {args.parar} para parar.")
+        gravador.iniciar()
+        keyboard.wait(args.parar)
+        linha = gravador.parar()
+        linha.salvar(args.arquivo)
+        print(f"{len(linha)} eventos ({linha.duracao:.2f}s, {linha.bytes_usados} bytes) salvos em {args.arquivo}")
+        return
+
+    linha = LinhaDoTempo.carregar(args.arquivo)
+    print(f"Reproduzindo {len(linha)} eventos em {args.espera:.0f}s (Esc cancela)...")
+    time.sleep(args.espera)
+    cancelar = threading.Event()
+    keyboard.add_hotkey("esc", cancelar.set)
+    completa, erros = reproduzir(linha, keyboard, args.velocidade, cancelar=cancelar)
+    resumo = erros.resumo()
+    print(f"{'Concluída' if completa else 'Cancelada'}: erro médio {resumo['media'] * 1000:.2f} ms, "
+          f"p99 {resumo['p99'] * 1000:.2f} ms, máximo {resumo['maximo'] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Registro de hotkeys por diferença.
+
+Em vez de keyboard.unhook_all() e registrar tudo de novo a cada início/parada,
+o registro guarda o handle de cada hotkey pelo nome ("iniciar", "enviar",
+"parar"...) e só mexe nas que mudaram. As hotkeys não passam pelo
+keyboard.add_hotkey: todas ficam num único hook leve (GanchoHotkeys), que só
+existe enquanto há alguma hotkey ligada.
+"""
+import queue
+import threading
+
+MODIFICADORES = ("ctrl", "shift", "alt", "windows")
+_APELIDOS = {
+    "control": "ctrl", "left ctrl": "ctrl", "right ctrl": "ctrl",
+    "left shift": "shift", "right shift": "shift",
+    "left alt": "alt", "right alt": "alt", "alt gr": "alt",
+    "win": "windows", "left windows": "windows", "right windows": "windows", "cmd": "windows", "command": "windows",
+    "escape": "esc", "return": "enter", "spacebar": "space",
+}
+
+
+def normalizar(nome):
+    nome = nome.strip().lower()
+    return _APELIDOS.get(nome, nome)
+
+
+def ler_combinacao(tecla):
+    """
+    "ctrl+shift+a" -> (frozenset({"ctrl", "shift"}), "a"). A última tecla é o
+    gatilho; as outras precisam ser modificadores. ValueError se inválida.
+    """
+    if "," in tecla:
+        raise ValueError(f"Sequências de teclas não são suportadas: {tecla!r}")
+    partes = [normalizar(parte) for parte in tecla.split("+")]
+    if not all(partes):
+        raise ValueError(f"Hotkey inválida: {tecla!r}")
+    *modificadores, gatilho = partes
+    if any(parte not in MODIFICADORES for parte in modificadores):
+        raise ValueError(f"Hotkey inválida (só a última tecla pode não ser modificador): {tecla!r}")
+    return frozenset(modificadores), gatilho
+
+
+class _Ligacao:
+    __slots__ = ("modificadores", "gatilho", "callback", "suprimir", "chaves")
+
+    def __init__(self, modificadores, gatilho, callback, suprimir):
+        self.modificadores = modificadores
+        self.gatilho = gatilho
+        self.callback = callback
+        self.suprimir = suprimir
+        self.chaves = ()  # (dicionário, chave) onde a ligação está indexada
+
+
+class GanchoHotkeys:
+    """
+    Um único hook do teclado para todas as hotkeys, no lugar de um
+    keyboard.add_hotkey(suppress=True) por hotkey.
+
+    Para cada tecla do sistema o hook faz uma consulta num dicionário pelo
+    código de varredura; teclas sem hotkey passam direto. Só a combinação exata
+    (gatilho + exatamente os modificadores pedidos) é suprimida, e o callback
+    roda na thread "macro-hotkeys", nunca na do hook. Sem hotkeys, o hook é
+    removido: a macro parada e sem ligações não custa nada às outras teclas.
+    teclado: módulo keyboard (ou ModuloAdiado, ou um substituto em testes).
+    """
+
+    def __init__(self, teclado):
+        self.teclado = teclado
+        self.operacoes = 0  # Ligações adicionadas/removidas (para conferir o registro por diferença)
+        self.despertares = 0  # Callbacks tirados da fila pela thread "macro-hotkeys"
+        self._por_codigo = {}  # código de varredura -> [_Ligacao]
+        self._por_nome = {}  # nome, para gatilhos sem código conhecido -> [_Ligacao]
+        self._suprimidas = set()  # Códigos cujo "down" foi suprimido (o "up" também é)
+        self._trava = threading.Lock()
+        self._hook = None
+        self._fila = queue.SimpleQueue()
+        self._thread = None
+        self.despachar = self._fila.put  # Entrega o callback à thread das hotkeys (trocável em testes)
+
+    @property
+    def ativo(self):
+        """Se o hook está instalado (há ao menos uma hotkey)."""
+        return self._hook is not None
+
+    def adicionar(self, tecla, callback, suppress=True):
+        """Liga a combinação 'tecla' ao callback. Retorna o handle para remover()."""
+        modificadores, gatilho = ler_combinacao(tecla)
+        ligacao = _Ligacao(modificadores, gatilho, callback, suppress)
+        try:
+            codigos = tuple(self.teclado.key_to_scan_codes(gatilho))
+        except (AttributeError, ValueError):
+            codigos = ()
+        with self._trava:
+            chaves = [(self._por_codigo, codigo) for codigo in codigos] or [(self._por_nome, gatilho)]
+            for indice, chave in chaves:
+                # Listas novas a cada mudança: o hook lê sem trava
+                indice[chave] = indice.get(chave, []) + [ligacao]
+            ligacao.chaves = chaves
+            self.operacoes += 1
+            if self._hook is None:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._executar, name="macro-hotkeys", daemon=True)
+                    self._thread.start()
+                self._hook = self.teclado.hook(self._evento, suppress=True)
+        return ligacao
+
+    def remover(self, ligacao):
+        with self._trava:
+            for indice, chave in ligacao.chaves:
+                restantes = [outra for outra in indice.get(chave, ()) if outra is not ligacao]
+                if restantes:
+                    indice[chave] = restantes
+                else:
+                    indice.pop(chave, None)
+            ligacao.chaves = ()
+            self.operacoes += 1
+            if not self._por_codigo and not self._por_nome and self._hook is not None:
+                self.teclado.unhook(self._hook)
+                self._hook = None
+                self._suprimidas.clear()
+
+    def _evento(self, evento):
+        # Roda no hook do sistema para cada tecla: o caminho comum é uma consulta no dicionário
+        ligacoes = self._por_codigo.get(evento.scan_code)
+        if ligacoes is None and self._por_nome:
+            ligacoes = self._por_nome.get(normalizar(evento.name or ""))
+        if ligacoes is None:
+            return True
+        codigo = evento.scan_code
+        if evento.event_type != "down":
+            if codigo in self._suprimidas:
+                self._suprimidas.discard(codigo)
+                return False
+            return True
+        pressionados = {modificador for modificador in MODIFICADORES if self.teclado.is_pressed(modificador)}
+        suprimir = False
+        for ligacao in ligacoes:
+            # O gatilho de cada ligação não conta como modificador (hotkey que é só um modificador, ex.: "shift")
+            if pressionados - {ligacao.gatilho} == ligacao.modificadores:
+                self.despachar(ligacao.callback)
+                suprimir = suprimir or ligacao.suprimir
+        if suprimir:
+            self._suprimidas.add(codigo)
+            return False
+        return True
+
+    def _executar(self):
+        while True:
+            callback = self._fila.get()
+            self.despertares += 1
+            try:
+                callback()
+            except Exception as e:
+                print(f"Erro na hotkey: {e}")
+
+
+class RegistroHotkeys:
+    """
+    Dono de todas as hotkeys da macro, ligadas no GanchoHotkeys.
+    teclado: módulo keyboard (ou ModuloAdiado, ou um substituto em testes).
+    """
+
+    def __init__(self, teclado):
+        self.teclado = teclado
+        self.gancho = GanchoHotkeys(teclado)
+        self._ligacoes = {}  # nome -> (tecla, callback, handle)
+        self._trava = threading.RLock()
+
+    def definir(self, nome, tecla, callback, suppress=True):
+        """
+        Liga 'tecla' a 'callback' sob o nome dado. Não faz nada se a ligação já é
+        essa; se o nome estava ligado a outra tecla/callback, troca só ele.
+        Retorna True se registrou algo. Erros de tecla inválida (ValueError) sobem.
+        """
+        with self._trava:
+            atual = self._ligacoes.get(nome)
+            if atual is not None and atual[0] == tecla and atual[1] == callback:
+                return False
+            if atual is not None:
+                self.remover(nome)
+            handle = self.gancho.adicionar(tecla, callback, suppress=suppress)
+            self._ligacoes[nome] = (tecla, callback, handle)
+            return True
+
+    def remover(self, nome):
+        """Remove a hotkey 'nome' (se existir). Retorna True se removeu."""
+        with self._trava:
+            atual = self._ligacoes.pop(nome, None)
+            if atual is None:
+                return False
+            self.gancho.remover(atual[2])
+            return True
+
+    def aplicar(self, ligacoes):
+        """
+        Aplica várias mudanças: {nome: (tecla, callback)} liga, {nome: None} desliga.
+        Nomes que não aparecem ficam como estão. Retorna quantas hotkeys mudaram.
+        """
+        mudancas = 0
+        with self._trava:
+            for nome, ligacao in ligacoes.items():
+                if ligacao is None or not ligacao[0]:
+                    mudancas += self.remover(nome)
+                else:
+                    mudancas += self.definir(nome, *ligacao)
+        return mudancas
+
+    def tecla(self, nome):
+        """Tecla ligada ao nome, ou None."""
+        atual = self._ligacoes.get(nome)
+        return atual[0] if atual else None
+
+    @property
+    def quantidade(self):
+        """Quantas hotkeys estão registradas agora (para detectar vazamentos)."""
+        return len(self._ligacoes)
+
+    def limpar(self):
+        """Remove todas as hotkeys deste registro."""
+        with self._trava:
+            for nome in list(self._ligacoes):
+                self.remover(nome)
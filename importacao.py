@@ -0,0 +1,113 @@
+"""
+Importação e exportação de mensagens em texto, CSV e JSONL.
+
+Formatos (escolhidos pela extensão; qualquer outra é lida como texto):
+    .txt    uma mensagem por linha (todas ativas)
+    .csv    colunas "texto" e "ativo" (sem cabeçalho: a 1ª coluna é o texto)
+    .jsonl  uma mensagem por linha: "texto" ou {"texto": ..., "ativo": true}
+A leitura é em fluxo: o arquivo nunca é carregado inteiro, e as mensagens
+chegam ao modelo em lotes, já sem repetidas.
+"""
+import csv
+import json
+import os
+
+TAMANHO_LOTE = 5000  # Mensagens por lote importado (a janela é redesenhada entre os lotes)
+TIPOS_ARQUIVO = [("Mensagens", "*.txt *.csv *.jsonl"), ("Texto", "*.txt"), ("CSV", "*.csv"),
+                 ("JSON Lines", "*.jsonl"), ("Todos", "*.*")]
+_VERDADEIROS = {"1", "true", "sim", "s", "x", "yes"}
+
+
+def _formato(caminho):
+    return os.path.splitext(caminho)[1].lower()
+
+
+def _ler_texto(arquivo):
+    for linha in arquivo:
+        texto = linha.rstrip("\r\n")
+        if texto.strip():
+            yield texto, True
+
+
+def _ler_csv(arquivo):
+    coluna_texto, coluna_ativo = 0, None
+    for numero, linha in enumerate(csv.reader(arquivo)):
+        if not linha:
+            continue
+        if numero == 0:
+            nomes = [nome.strip().lower() for nome in linha]
+            if "texto" in nomes or "mensagem" in nomes:
+                coluna_texto = nomes.index("texto" if "texto" in nomes else "mensagem")
+                coluna_ativo = nomes.index("ativo") if "ativo" in nomes else None
+                continue
+        if coluna_texto >= len(linha) or not linha[coluna_texto].strip():
+            continue
+        ativo = True
+        if coluna_ativo is not None and coluna_ativo < len(linha):
+            ativo = linha[coluna_ativo].strip().lower() in _VERDADEIROS
+        yield linha[coluna_texto], ativo
+
+
+def _ler_jsonl(arquivo):
+    for numero, linha in enumerate(arquivo, 1):
+        if not linha.strip():
+            continue
+        try:
+            item = json.loads(linha)
+        except ValueError:
+            raise ValueError(f"linha {numero} não é JSON válido") from None
+        if isinstance(item, str):
+            texto, ativo = item, True
+        elif isinstance(item, dict):
+            texto, ativo = item.get("texto", ""), bool(item.get("ativo", True))
+        else:
+            raise ValueError(f"linha {numero} não é texto nem objeto")
+        if not isinstance(texto, str):
+            raise ValueError(f"linha {numero}: \"texto\" não é texto")
+        if texto.strip():
+            yield texto, ativo
+
+
+_LEITORES = {".csv": _ler_csv, ".jsonl": _ler_jsonl}
+
+
+def ler_arquivo(caminho):
+    """Gera (texto, ativo) de cada mensagem do arquivo, lendo aos poucos."""
+    leitor = _LEITORES.get(_formato(caminho), _ler_texto)
+    with open(caminho, encoding="utf-8-sig", newline="") as arquivo:
+        yield from leitor(arquivo)
+
+
+def lotes_unicos(pares, existentes, tamanho=TAMANHO_LOTE):
+    """
+    Agrupa os pares (texto, ativo) em listas de até 'tamanho', pulando textos
+    que já estão em 'existentes' (set, atualizado conforme os lotes saem).
+    """
+    lote = []
+    for texto, ativo in pares:
+        if texto in existentes:
+            continue
+        existentes.add(texto)
+        lote.append((texto, ativo))
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def exportar(textos, ativos, caminho):
+    """Grava as mensagens no formato da extensão do arquivo (mensagens vazias ficam de fora)."""
+    formato = _formato(caminho)
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8", newline="") as arquivo:
+        if formato == ".csv":
+            escritor = csv.writer(arquivo)
+            escritor.writerow(["texto", "ativo"])
+            escritor.writerows((texto, int(ativo)) for texto, ativo in zip(textos, ativos) if texto)
+        elif formato == ".jsonl":
+            arquivo.writelines(json.dumps({"texto": texto, "ativo": bool(ativo)}, ensure_ascii=False) + "\n"
+                               for texto, ativo in zip(textos, ativos) if texto)
+        else:
+            arquivo.writelines(texto + "\n" for texto in textos if texto)
+    os.replace(temporario, caminho)
@@ -0,0 +1,232 @@
+"""
+Lista de mensagens virtualizada.
+
+As mensagens ficam num modelo compacto (ModeloMensagens) e a tela reutiliza um
+conjunto pequeno e fixo de linhas (MacroRow), que são revinculadas às mensagens
+visíveis ao rolar. Assim adicionar, remover e ativar mensagens custa o mesmo
+com 10 ou 50.000 mensagens.
+"""
+from bisect import bisect_right
+
+# Mudanças avisadas ao observador do modelo (também é o formato do log dos perfis)
+TEXTO = "t"      # ("t", indice, texto)
+ATIVO = "a"      # ("a", indice, 0/1)
+ADICIONAR = "+"  # ("+", texto, 0/1)
+REMOVER = "-"    # ("-", indice)
+ESTENDER = "*"   # ("*", [textos], "0101"): várias mensagens adicionadas de uma vez
+ATIVOS = "A"     # ("A", "0101"): estado de todos os checkboxes (mudança em massa)
+
+_DIGITOS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+class ModeloMensagens:
+    """
+    Textos e estados do checkbox 'Ativar' de todas as mensagens, sem widgets.
+    observador: função opcional chamada com cada mudança (ver TEXTO, ATIVO...).
+    """
+
+    __slots__ = ("textos", "ativos", "observador", "versao")
+
+    def __init__(self):
+        self.textos = []
+        self.ativos = bytearray()
+        self.observador = None
+        self.versao = 0  # Muda quando os textos mudam (o IndiceBusca usa para saber quando refazer)
+
+    def __len__(self):
+        return len(self.textos)
+
+    def adicionar(self, texto="", ativo=True):
+        self.textos.append(texto)
+        self.ativos.append(1 if ativo else 0)
+        self.versao += 1
+        if self.observador:
+            self.observador((ADICIONAR, texto, self.ativos[-1]))
+
+    def remover(self, indice):
+        if indice < 0:
+            indice += len(self.textos)
+        del self.textos[indice]
+        del self.ativos[indice]
+        self.versao += 1
+        if self.observador:
+            self.observador((REMOVER, indice))
+
+    def definir_texto(self, indice, texto):
+        self.textos[indice] = texto
+        self.versao += 1
+        if self.observador:
+            self.observador((TEXTO, indice, texto))
+
+    def definir_ativo(self, indice, ativo):
+        self.ativos[indice] = 1 if ativo else 0
+        if self.observador:
+            self.observador((ATIVO, indice, self.ativos[indice]))
+
+    def alternar(self, indice):
+        self.ativos[indice] ^= 1
+        if self.observador:
+            self.observador((ATIVO, indice, self.ativos[indice]))
+
+    def estender(self, pares):
+        """Adiciona várias mensagens (texto, ativo) no fim, com um único aviso ao observador."""
+        textos = [texto for texto, _ in pares]
+        ativos = bytearray(1 if ativo else 0 for _, ativo in pares)
+        self.textos.extend(textos)
+        self.ativos.extend(ativos)
+        self.versao += 1
+        if self.observador:
+            self.observador((ESTENDER, textos, ativos.translate(_DIGITOS).decode("ascii")))
+
+    def definir_ativos(self, indices, ativo):
+        """Marca/desmarca 'Ativar' de várias mensagens numa só operação (indices=None: todas)."""
+        valor = 1 if ativo else 0
+        if indices is None:
+            self.ativos[:] = bytes((valor,)) * len(self.ativos)
+        else:
+            ativos = self.ativos
+            for indice in indices:
+                ativos[indice] = valor
+        if self.observador:
+            self.observador((ATIVOS, self.ativos.translate(_DIGITOS).decode("ascii")))
+
+    def substituir(self, textos, ativos):
+        """Troca todas as mensagens de uma vez (ex.: ao carregar um perfil), sem avisar o observador."""
+        self.textos = list(textos)
+        self.ativos = bytearray(ativos)
+        self.versao += 1
+
+    def ativas(self):
+        """Textos das mensagens com 'Ativar' marcado, na ordem."""
+        return [texto for texto, ativo in zip(self.textos, self.ativos) if ativo]
+
+
+class IndiceBusca:
+    """
+    Busca por trecho (sem diferenciar maiúsculas) em todas as mensagens.
+    Os textos ficam concatenados num único texto, então cada busca é um
+    str.find em C; o índice só é refeito quando o modelo muda.
+    """
+
+    __slots__ = ("modelo", "versao", "texto", "inicios")
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        self.versao = None
+        self.texto = ""
+        self.inicios = []  # Posição de cada mensagem dentro de self.texto
+
+    def _atualizar(self):
+        if self.versao == self.modelo.versao:
+            return
+        dobrados = [texto.casefold() for texto in self.modelo.textos]
+        inicios = []
+        posicao = 0
+        for texto in dobrados:
+            inicios.append(posicao)
+            posicao += len(texto) + 1
+        self.texto = "\0".join(dobrados)  # Separador que nunca aparece numa busca
+        self.inicios = inicios
+        self.versao = self.modelo.versao
+
+    def buscar(self, consulta, inicio=0):
+        """Índice da primeira mensagem a partir de 'inicio' que contém 'consulta' (volta ao começo); None se nenhuma."""
+        consulta = consulta.casefold()
+        if not consulta or "\0" in consulta:
+            return None
+        self._atualizar()
+        if not self.inicios:
+            return None
+        inicio = min(max(inicio, 0), len(self.inicios) - 1)
+        posicao = self.texto.find(consulta, self.inicios[inicio])
+        if posicao < 0:
+            posicao = self.texto.find(consulta)
+            if posicao < 0:
+                return None
+        return bisect_right(self.inicios, posicao) - 1
+
+    def todas(self, consulta):
+        """Índices de todas as mensagens que contêm 'consulta'."""
+        consulta = consulta.casefold()
+        if not consulta or "\0" in consulta:
+            return []
+        self._atualizar()
+        texto, inicios = self.texto, self.inicios
+        encontradas = []
+        posicao = texto.find(consulta)
+        while posicao >= 0:
+            indice = bisect_right(inicios, posicao) - 1
+            encontradas.append(indice)
+            if indice + 1 >= len(inicios):
+                break
+            posicao = texto.find(consulta, inicios[indice + 1])
+        return encontradas
+
+
+class ListaVirtual:
+    """
+    Mostra o ModeloMensagens usando 'visiveis' linhas reutilizáveis.
+    parent: Frame onde as linhas são empacotadas.
+    criar_linha: fábrica (parent, index, remove_callback, modelo) -> MacroRow.
+    scrollbar: Scrollbar vertical ligada a rolar().
+    """
+
+    def __init__(self, parent, modelo, criar_linha, scrollbar, visiveis=5):
+        self.modelo = modelo
+        self.scrollbar = scrollbar
+        self.primeira = 0  # Índice da mensagem mostrada na primeira linha
+        self.linhas = [
+            criar_linha(parent, k, self._excluir, modelo)
+            for k in range(visiveis)
+        ]
+        self.scrollbar.configure(command=self.rolar)
+
+    def _excluir(self, linha):
+        # O índice é lido no clique, então nunca fica desatualizado
+        self.remover(linha.index)
+
+    def adicionar(self, texto="", ativo=True):
+        """Adiciona uma mensagem no fim e rola até ela."""
+        self.modelo.adicionar(texto, ativo)
+        self.primeira = len(self.modelo) - len(self.linhas)
+        self.redesenhar()
+
+    def remover(self, indice):
+        """Remove a mensagem 'indice' (mantendo pelo menos 1)."""
+        if len(self.modelo) <= 1:
+            return
+        self.modelo.remover(indice)
+        self.redesenhar()
+
+    def rolar(self, acao, quantidade, unidade=None):
+        """Comando da Scrollbar: ('moveto', fração) ou ('scroll', n, 'units'|'pages')."""
+        if acao == "moveto":
+            self.primeira = int(float(quantidade) * len(self.modelo))
+        else:
+            passo = len(self.linhas) if unidade == "pages" else 1
+            self.primeira += int(quantidade) * passo
+        self.redesenhar()
+
+    def ir_para(self, indice):
+        """Rola para que a mensagem 'indice' fique visível."""
+        if not self.primeira <= indice < self.primeira + len(self.linhas):
+            self.primeira = indice
+            self.redesenhar()
+
+    def redesenhar(self):
+        """Revincula as linhas às mensagens visíveis (custo proporcional às linhas, não ao modelo)."""
+        total = len(self.modelo)
+        visiveis = len(self.linhas)
+        self.primeira = max(0, min(self.primeira, total - visiveis))
+        for k, linha in enumerate(self.linhas):
+            indice = self.primeira + k
+            if indice < total:
+                linha.bind_message(indice, self.modelo.textos[indice], self.modelo.ativos[indice])
+                linha.show_exclude_button(indice == total - 1 and total > 1)
+                linha.show(True)
+            else:
+                linha.show(False)
+        if total > visiveis:
+            self.scrollbar.set(self.primeira / total, (self.primeira + visiveis) / total)
+        else:
+            self.scrollbar.set(0, 1)
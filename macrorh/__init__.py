@@ -0,0 +1,8 @@
+"""
+Interface gráfica da macro.
+
+    python -m macrorh                  # tema com imagem de fundo
+    python -m macrorh --tema simples   # sem imagem (não importa o PIL)
+
+Rodar da pasta do projeto: a janela usa os módulos da raiz (motor, envio, lista...).
+"""
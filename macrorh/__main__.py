@@ -0,0 +1,3 @@
+from macrorh.app import main
+
+main()
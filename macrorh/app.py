@@ -0,0 +1,672 @@
+"""
+Janela da macro (MacroApp) e as linhas de mensagem (MacroRow), para qualquer tema.
+Abrir com: python -m macrorh [--tema simples|imagem]
+"""
+import argparse
+import csv
+import time
+import tkinter as tk
+from dataclasses import replace
+from functools import partial
+from tkinter import filedialog, messagebox, ttk
+
+from calibracao import JanelaCalibracao
+from carregamento import ModuloAdiado
+from diario import DiarioExecucao, ler_retomada
+from envio import BACKEND_PADRAO, MODO_AUTO, MODO_COLAR, MODO_DIGITAR
+from eventos import CICLO, MENSAGEM, PROXIMO, BombaTk, CanalEventos
+from importacao import TIPOS_ARQUIVO, exportar, ler_arquivo, lotes_unicos
+from lista import IndiceBusca, ListaVirtual, ModeloMensagens
+from macrorh.temas import TEMA_PADRAO, TEMAS
+from metricas import pasta_metricas
+from motor import (CAMPOS_ATUALIZAVEIS, ConfigExecucao, MotorMacro, config_de_dict, ler_cadencia, ler_intervalo,
+                   ler_taxa)
+from perfilamento import HOTKEY_PERFIL, Perfilador
+from perfis import CONFIG, PERFIL_PADRAO, ArmazemPerfis, AutoSalvar
+from recursos import MonitorRecursos, formatar
+from trabalhador import COALESCER
+
+# Importado em segundo plano depois que a janela aparece (ver MacroApp.__init__)
+keyboard = ModuloAdiado("keyboard")
+
+# Classe que representa uma "linha" (caixa de texto + checkbox + botão Excluir).
+# As linhas são reutilizadas pela ListaVirtual: cada uma mostra a mensagem do
+# índice ao qual está vinculada no momento.
+class MacroRow:
+    def __init__(self, parent, index, remove_callback, modelo, tema=None):
+        """
+        parent: Frame onde a linha será inserida.
+        index: Posição/índice da mensagem mostrada pela linha.
+        remove_callback: Função chamada com esta linha ao clicar em "Excluir".
+        modelo: ModeloMensagens que recebe as edições da linha.
+        tema: temas.Tema (fonte do rótulo e largura da caixa); padrão: TEMA_PADRAO.
+        """
+        tema = tema or TEMAS[TEMA_PADRAO]()
+        self.index = index
+        self.modelo = modelo
+        self.visivel = True
+        self.excluir_visivel = False
+        self._vinculando = False  # Ignora os traces enquanto a linha é revinculada
+
+        self.frame = ttk.Frame(parent)
+        self.frame.pack(fill='x', pady=5)
+
+        # Rótulo com "Mensagem X:"
+        self.label = ttk.Label(self.frame, text=f"Mensagem {index + 1}:", font=tema.fonte("linha"))
+        self.label.pack(side=tk.LEFT)
+
+        # Caixa de entrada para a mensagem
+        self.var_text = tk.StringVar()
+        self.entry = ttk.Entry(self.frame, width=tema.largura_mensagem, textvariable=self.var_text)
+        self.entry.pack(side=tk.LEFT, padx=5)
+
+        # Checkbox "Ativar"
+        self.var_checkbox = tk.BooleanVar(value=True)
+        self.checkbox = ttk.Checkbutton(self.frame, text="Ativar", variable=self.var_checkbox)
+        self.checkbox.pack(side=tk.LEFT, padx=5)
+
+        # Botão Excluir (inicialmente oculto; aparece somente na última linha)
+        self.button_excluir = ttk.Button(self.frame, text="Excluir", command=lambda: remove_callback(self))
+        self.button_excluir.pack_forget()
+
+        # Edições vão direto para o modelo
+        self.var_text.trace_add("write", self._on_text)
+        self.var_checkbox.trace_add("write", self._on_checkbox)
+
+    def _on_text(self, *args):
+        if not self._vinculando:
+            self.modelo.definir_texto(self.index, self.var_text.get())
+
+    def _on_checkbox(self, *args):
+        if not self._vinculando:
+            self.modelo.definir_ativo(self.index, self.var_checkbox.get())
+
+    def bind_message(self, index, texto, ativo):
+        """Passa a mostrar a mensagem 'index' do modelo."""
+        if index != self.index:
+            self.index = index
+            self.set_label(f"Mensagem {index + 1}:")
+        self._vinculando = True
+        try:
+            if self.var_text.get() != texto:
+                self.var_text.set(texto)
+            if self.var_checkbox.get() != bool(ativo):
+                self.var_checkbox.set(bool(ativo))
+        finally:
+            self._vinculando = False
+
+    def set_label(self, text):
+        """Atualiza o rótulo (ex.: 'Mensagem 1:')."""
+        self.label.config(text=text)
+
+    def show_exclude_button(self, show):
+        """Mostra ou esconde o botão de excluir."""
+        if show == self.excluir_visivel:
+            return
+        self.excluir_visivel = show
+        if show:
+            self.button_excluir.pack(side=tk.LEFT, padx=5)
+        else:
+            self.button_excluir.pack_forget()
+
+    def show(self, show):
+        """Mostra ou esconde a linha inteira (linhas sobrando quando há poucas mensagens)."""
+        if show == self.visivel:
+            return
+        self.visivel = show
+        if show:
+            self.frame.pack(fill='x', pady=5)
+        else:
+            self.frame.pack_forget()
+
+    def destroy(self):
+        """Remove o frame e todos os widgets da linha."""
+        self.frame.destroy()
+
+class MacroApp:
+    def __init__(self, root, tema=None):
+        """tema: temas.Tema com o visual da janela (padrão: TEMA_PADRAO)."""
+        self.root = root
+        self.tema = tema or TEMAS[TEMA_PADRAO]()
+        self.root.title("MACRO DIVULGADORES RÁDIO HABBLET")
+        self.root.geometry("750x500")
+        self.tema.preparar(self.root)  # Cor e fundo da janela (o fundo vem antes dos widgets)
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        """Cria os widgets; o tema diz onde cada um fica (tema.colocar) e com que fonte."""
+        tema, rotulo = self.tema, self.tema.fonte("rotulo")
+        tema.colocar(ttk.Label(self.root, text="Escolha um comando e digite a mensagem:",
+                               font=tema.fonte("titulo")), "titulo")
+
+        # Lista de teclas pré-definidas
+        self.atalhos_disponiveis = [
+            "F1", "F2", "F3", "F4", "F5", "F6", "F7", "F8", "F9", "F10", "F11", "F12",
+            "CTRL+A", "CTRL+C", "CTRL+V", "CTRL+Z", "CTRL+X",
+            "ALT+TAB", "SHIFT+TAB", "ENTER", "ESC", "SPACE"
+        ]
+
+        # Combobox para selecionar a tecla de envio
+        self.tecla_selecionada = tk.StringVar(value="Escolha a tecla")
+        self.tecla_label = tema.colocar(ttk.Label(self.root, text="Comando para enviar as mensagens:", font=rotulo),
+                                        "tecla_label")
+        self.tecla_combobox = ttk.Combobox(
+            self.root,
+            values=self.atalhos_disponiveis + ["Digite a tecla..."],
+            state="readonly",
+            width=20,
+            textvariable=self.tecla_selecionada
+        )
+        tema.colocar(self.tecla_combobox, "tecla")
+        self.tecla_combobox.bind("<<ComboboxSelected>>", self.on_tecla_selecionada)
+
+        # Entrada para a cadência entre mensagens (velocidade do flood)
+        self.cadencia_label = tema.colocar(
+            ttk.Label(self.root, text="Cadência entre mensagens (em segundos):", font=rotulo), "cadencia_label")
+        self.cadencia_var = tk.StringVar(value="0.5")  # Valor padrão para flood speed
+        self.cadencia_entry = tema.colocar(ttk.Entry(self.root, width=10, textvariable=self.cadencia_var), "cadencia")
+
+        # Checkbox para ativar o loop de envio
+        self.loop_var = tk.BooleanVar(value=False)
+        self.loop_checkbox = tema.colocar(
+            ttk.Checkbutton(self.root, text="Ativar Loop de Envio", variable=self.loop_var), "loop")
+
+        # Modo de envio: digitar tecla a tecla, colar pela área de transferência ou automático
+        self.modos_envio = {"Digitar": MODO_DIGITAR, "Colar": MODO_COLAR, "Automático": MODO_AUTO}
+        self.modo_label = tema.colocar(ttk.Label(self.root, text="Envio:", font=rotulo), "modo_label")
+        self.modo_var = tk.StringVar(value="Digitar")
+        self.modo_combobox = ttk.Combobox(self.root, values=list(self.modos_envio), state="readonly",
+                                          width=12, textvariable=self.modo_var)
+        tema.colocar(self.modo_combobox, "modo")
+
+        # Limite de teclas por segundo na injeção (evita perder teclas no programa de destino)
+        self.limite_label = tema.colocar(
+            ttk.Label(self.root, text=tema.texto("limite", "Teclas/s (0 = sem limite):"), font=rotulo),
+            "limite_label")
+        self.limite_var = tk.StringVar(value="0")
+        self.limite_entry = tema.colocar(ttk.Entry(self.root, width=6, textvariable=self.limite_var), "limite")
+
+        # Entrada para o intervalo entre execuções da macro (loop interval)
+        self.loop_interval_label = tema.colocar(
+            ttk.Label(self.root, text="Intervalo entre execuções da macro (em segundos):", font=rotulo),
+            "intervalo_label")
+        self.loop_interval_var = tk.StringVar(value="20")  # Valor padrão para loop interval
+        self.loop_interval_entry = tema.colocar(
+            ttk.Entry(self.root, width=10, textvariable=self.loop_interval_var), "intervalo")
+
+        # Nova opção: Combobox para hotkey de PARADA da macro
+        self.stop_hotkey_label = tema.colocar(
+            ttk.Label(self.root, text="Hotkey para Parar Macro:", font=rotulo), "parada_label")
+        self.stop_hotkey_var = tk.StringVar(value="ESC")
+        self.stop_hotkey_combobox = ttk.Combobox(
+            self.root,
+            values=["ESC", "F9", "F10", "CTRL+ESC", "CTRL+SHIFT+X"],
+            state="readonly",
+            width=20,
+            textvariable=self.stop_hotkey_var
+        )
+        tema.colocar(self.stop_hotkey_combobox, "parada")
+
+        # Nova opção: Combobox para hotkey de ATIVAÇÃO da macro
+        self.start_hotkey_label = tema.colocar(
+            ttk.Label(self.root, text="Hotkey para Ativar Macro:", font=rotulo), "iniciar_label")
+        self.start_hotkey_var = tk.StringVar(value="F12")  # Valor padrão
+        self.start_hotkey_combobox = ttk.Combobox(
+            self.root,
+            values=["F1", "F2", "F3", "F4", "F5", "F6", "F7", "F8", "F9", "F10", "F11", "F12"],
+            state="readonly",
+            width=20,
+            textvariable=self.start_hotkey_var
+        )
+        tema.colocar(self.start_hotkey_combobox, "iniciar")
+        self.start_hotkey_combobox.bind("<<ComboboxSelected>>", self.registrar_hotkey_automatico)
+
+        # Perfil: escolha um salvo ou digite um nome novo e pressione Enter para criar
+        self.perfil_label = tema.colocar(ttk.Label(self.root, text="Perfil:", font=rotulo), "perfil_label")
+        self.perfil_var = tk.StringVar()
+        self.perfil_combobox = tema.colocar(ttk.Combobox(self.root, width=20, textvariable=self.perfil_var), "perfil")
+        self.perfil_combobox.bind("<<ComboboxSelected>>", lambda e: self.abrir_perfil(self.perfil_var.get()))
+        self.perfil_combobox.bind("<Return>", lambda e: self.abrir_perfil(self.perfil_var.get()))
+
+        # Busca incremental nas mensagens (Enter vai para a próxima)
+        self.busca_label = tema.colocar(
+            ttk.Label(tema.pai(self.root, "busca_label"), text="Buscar:", font=rotulo), "busca_label")
+        self.busca_var = tk.StringVar()
+        self.busca_entry = tema.colocar(
+            ttk.Entry(tema.pai(self.root, "busca"), width=22, textvariable=self.busca_var), "busca")
+        self.busca_entry.bind("<Return>", lambda e: self.buscar(proxima=True))
+
+        # Canvas + Scrollbar para rolar as linhas (MacroRows)
+        self.canvas = tema.colocar(tk.Canvas(self.root, **tema.opcoes_lista), "lista")
+        self.scrollbar = tema.colocar(ttk.Scrollbar(self.root, orient="vertical"), "rolagem")  # Comandado pela ListaVirtual
+
+        # Frame interno para as mensagens
+        self.messages_frame = ttk.Frame(self.canvas)
+        self.canvas.create_window((0, 0), window=self.messages_frame, anchor="nw")
+        if tema.tamanho_mensagens:
+            largura, altura = tema.tamanho_mensagens
+            self.messages_frame.configure(width=largura, height=altura)
+
+        # Mensagens: modelo compacto + poucas linhas reutilizadas ao rolar
+        self.mensagens = ModeloMensagens()
+        self.lista = ListaVirtual(self.messages_frame, self.mensagens, partial(MacroRow, tema=tema), self.scrollbar)
+        self.indice_busca = IndiceBusca(self.mensagens)
+        self.ultima_encontrada = -1
+        self.busca_var.trace_add("write", lambda *args: self.buscar())
+
+        # Função para vincular o scroll do mouse à lista
+        def on_mouse_wheel(event):
+            self.lista.rolar("scroll", int(-1*(event.delta/120)), "units")
+
+        # Bind do evento de scroll do mouse para a lista
+        self.canvas.bind_all("<MouseWheel>", on_mouse_wheel)
+
+        for _ in range(5):
+            self.add_row()
+
+        # Botão para adicionar mais caixas
+        self.add_button = tema.colocar(ttk.Button(self.root, text="Adicionar Caixa", command=self.add_row), "adicionar")
+
+        # Botões de controle: Ativar Macro e Parar Macro
+        self.start_button = tema.colocar(ttk.Button(self.root, text="Ativar Macro", command=self.iniciar_macro), "ativar")
+        self.stop_button = tema.colocar(
+            ttk.Button(self.root, text="Parar Macro", command=self.parar_macro, state=tk.DISABLED), "parar")
+
+        # Importar/exportar arquivos de mensagens e marcar/desmarcar em massa
+        botoes = (
+            ("importar", "Importar", self.importar_mensagens),
+            ("exportar", "Exportar", self.exportar_mensagens),
+            ("marcar", "Marcar", lambda: self.marcar_todas(True)),
+            ("desmarcar", "Desmarcar", lambda: self.marcar_todas(False)),
+            ("calibrar", "Calibrar", self.calibrar),
+            ("recursos", "Recursos", self.mostrar_recursos),
+        )
+        for chave, texto, comando in botoes:
+            tema.colocar(ttk.Button(tema.pai(self.root, chave), text=texto, command=comando), chave)
+        self.perfilar_var = tk.BooleanVar(value=False)
+        self.perfilar_check = tema.colocar(
+            ttk.Checkbutton(tema.pai(self.root, "perfilar"), text="Perfilar", variable=self.perfilar_var,
+                            command=self.alternar_perfilamento), "perfilar")
+
+        # Leitura ao vivo das métricas da execução
+        self.metricas_var = tk.StringVar(value="")
+        self.metricas_label = tema.colocar(
+            ttk.Label(self.root, textvariable=self.metricas_var, font=tema.fonte("metricas")), "metricas")
+        self.progresso_var = tk.StringVar(value="")
+        self.progresso_label = tema.colocar(
+            ttk.Label(self.root, textvariable=self.progresso_var, font=tema.fonte("metricas")), "progresso")
+
+        self.running = False
+        self.backend_nome = BACKEND_PADRAO  # Backend de injeção (ver envio.BACKENDS)
+        self.politica_envio = COALESCER  # O que fazer com pressões repetidas durante um envio
+        self.motor = MotorMacro(teclado=keyboard, politica=self.politica_envio)  # Toda a lógica de envio
+        self.motor.pasta_metricas = pasta_metricas()  # Exporta JSON/CSV de cada execução ao parar
+        self.eventos = CanalEventos()  # Estado, progresso e pedidos das outras threads para o Tk
+        self.motor.eventos = self.eventos
+        self.motor.diario = DiarioExecucao()  # Progresso do loop em disco, para retomar depois de uma queda
+        self.progresso = {}  # Último valor de cada evento de progresso da execução atual
+        self.contagem = None  # after() do próximo passo da contagem regressiva (só enquanto ela aparece)
+        self.perfilador = Perfilador()  # Desligado até marcar "Perfilar" (ou HOTKEY_PERFIL)
+        self.motor.definir_perfilador(self.perfilador)
+        self.perfil_pendente = False  # Desligado com a macro ativa: grava ao parar
+
+        # Snapshot imutável dos valores da tela, refeito (na thread do Tk) a cada edição
+        self.config_atual = None
+        self.calibracao = None
+        for var in (self.tecla_selecionada, self.stop_hotkey_var, self.cadencia_var,
+                    self.loop_var, self.loop_interval_var, self.modo_var, self.limite_var):
+            var.trace_add("write", self.atualizar_config)
+        self.atualizar_config()
+
+        # Perfis: abre o último usado e salva as edições automaticamente (em segundo plano)
+        self.perfis = ArmazemPerfis()
+        self.autosalvar = AutoSalvar(self.perfis)
+        self.mensagens.observador = self.autosalvar.registrar
+        for var in (self.tecla_selecionada, self.stop_hotkey_var, self.start_hotkey_var,
+                    self.cadencia_var, self.loop_var, self.loop_interval_var, self.modo_var, self.limite_var):
+            var.trace_add("write", self.salvar_config)
+        self.abrir_perfil(self.perfis.ultimo or PERFIL_PADRAO)
+        self.root.protocol("WM_DELETE_WINDOW", self.fechar)
+
+        # Registra a hotkey de ativação assim que o módulo keyboard terminar de carregar
+        keyboard.preaquecer(ao_pronto=lambda: self.eventos.pedir(self.registrar_hotkeys_iniciais))
+
+        # Esvazia o canal de eventos do motor quando ele avisa: no máximo uma redesenhada por quadro
+        self.bomba = BombaTk(self.root, self.eventos, self.aplicar_eventos)
+        self.recursos = MonitorRecursos(self.despertares)
+
+    def registrar_hotkeys_iniciais(self):
+        """Pedido pela importação do keyboard ao terminar: registra a hotkey de ativação e a do perfilamento."""
+        self.registrar_hotkey_automatico()
+        self.motor.hotkeys.definir("perfil", HOTKEY_PERFIL, lambda: self.eventos.pedir(self.inverter_perfilamento))
+        self.oferecer_retomada()
+
+    def despertares(self):
+        """Despertares de todas as threads da macro (motor, bomba do Tk, salvamento automático)."""
+        return self.motor.despertares() + self.bomba.despertares + self.autosalvar.despertares
+
+    def mostrar_recursos(self):
+        """CPU, threads, memória e despertares por minuto desde o último relatório."""
+        texto = formatar(self.recursos.relatorio())
+        print(texto)
+        messagebox.showinfo("Recursos", texto)
+
+    def valores_tela(self):
+        """Configurações da tela guardadas no perfil."""
+        return {
+            "tecla": self.tecla_selecionada.get(),
+            "parada": self.stop_hotkey_var.get(),
+            "iniciar": self.start_hotkey_var.get(),
+            "cadencia": self.cadencia_var.get(),
+            "loop": self.loop_var.get(),
+            "intervalo": self.loop_interval_var.get(),
+            "modo": self.modo_var.get(),
+            "limite": self.limite_var.get(),
+        }
+
+    def salvar_config(self, *args):
+        """Anota a mudança de configuração para o salvamento automático (não grava aqui)."""
+        self.autosalvar.registrar((CONFIG, self.valores_tela()))
+
+    def abrir_perfil(self, nome):
+        """Troca para o perfil 'nome'; se ele não existir, cria um com o conteúdo atual da tela."""
+        nome = nome.strip()
+        if not nome:
+            return
+        self.autosalvar.perfil(None)  # Grava as pendências do perfil anterior
+        if self.perfis.existe(nome):
+            dados = self.perfis.carregar(nome)
+            config = {**self.valores_tela(), **dados["config"]}
+            self.tecla_selecionada.set(config["tecla"])
+            self.on_tecla_selecionada(None)
+            self.stop_hotkey_var.set(config["parada"])
+            self.start_hotkey_var.set(config["iniciar"])
+            self.cadencia_var.set(config["cadencia"])
+            self.loop_var.set(config["loop"])
+            self.loop_interval_var.set(config["intervalo"])
+            self.modo_var.set(config["modo"])
+            self.limite_var.set(config["limite"])
+            self.calibracao = config.get("calibracao")  # Resultado da última calibração (ver calibrar)
+            self.mensagens.substituir(dados["textos"], dados["ativos"])
+            if not len(self.mensagens):
+                self.mensagens.adicionar()
+            self.lista.primeira = 0
+            self.update_rows()
+            if keyboard.pronto:
+                self.registrar_hotkey_automatico()
+        else:
+            self.perfis.salvar(nome, {
+                "config": self.valores_tela(),
+                "textos": self.mensagens.textos,
+                "ativos": self.mensagens.ativos,
+            })
+        self.autosalvar.perfil(nome)
+        self.perfil_var.set(nome)
+        self.perfil_combobox.config(values=self.perfis.nomes())
+
+    def fechar(self):
+        """Grava o que falta do perfil, encerra o motor e fecha a janela."""
+        self.autosalvar.encerrar()
+        self.bomba.encerrar()
+        self.motor.encerrar()
+        if self.perfilador.ativo:
+            self.gravar_perfilamento()
+        self.root.destroy()
+
+    def on_tecla_selecionada(self, event):
+        """Libera edição se 'Digite a tecla...' for selecionado."""
+        if self.tecla_selecionada.get() == "Digite a tecla...":
+            self.tecla_combobox.config(state="normal")
+        else:
+            self.tecla_combobox.config(state="readonly")
+
+    def add_row(self):
+        """Adiciona uma nova mensagem (sem limite: só as linhas visíveis têm widgets)."""
+        self.lista.adicionar()
+
+    def update_rows(self):
+        """Atualiza as linhas visíveis; o botão 'Excluir' aparece só na última mensagem (se houver > 1)."""
+        self.lista.redesenhar()
+
+    def remove_row(self, index):
+        """Remove a mensagem de índice 'index' (mantendo pelo menos 1)."""
+        self.lista.remover(index)
+
+    def buscar(self, proxima=False):
+        """Rola até a mensagem que contém o texto da busca (Enter: a próxima depois da última encontrada)."""
+        inicio = self.ultima_encontrada + 1 if proxima else self.lista.primeira
+        indice = self.indice_busca.buscar(self.busca_var.get(), inicio)
+        if indice is not None:
+            self.ultima_encontrada = indice
+            self.lista.primeira = indice
+            self.update_rows()
+
+    def marcar_todas(self, ativo):
+        """Marca/desmarca 'Ativar' de todas as mensagens de uma vez (com busca: só das encontradas)."""
+        consulta = self.busca_var.get()
+        self.mensagens.definir_ativos(self.indice_busca.todas(consulta) if consulta else None, ativo)
+        self.update_rows()
+
+    def importar_mensagens(self):
+        """Importa mensagens de um arquivo .txt, .csv ou .jsonl (as repetidas são ignoradas)."""
+        caminho = filedialog.askopenfilename(title="Importar mensagens", filetypes=TIPOS_ARQUIVO)
+        if caminho:
+            self.importar_lote(lotes_unicos(ler_arquivo(caminho), set(self.mensagens.textos)), caminho, 0)
+
+    def importar_lote(self, lotes, caminho, total):
+        """Passa um lote do arquivo para o modelo e agenda o próximo, sem travar a janela."""
+        try:
+            lote = next(lotes, None)
+        except (OSError, ValueError, csv.Error) as e:
+            print(f"Erro ao importar '{caminho}': {e}")
+            lote = None
+        if lote is None:
+            print(f"{total} mensagens importadas de {caminho}")
+            return
+        self.mensagens.estender(lote)
+        self.update_rows()
+        self.root.after(1, self.importar_lote, lotes, caminho, total + len(lote))
+
+    def exportar_mensagens(self):
+        """Exporta as mensagens para .txt, .csv ou .jsonl (conforme a extensão escolhida)."""
+        caminho = filedialog.asksaveasfilename(title="Exportar mensagens", defaultextension=".txt",
+                                               filetypes=TIPOS_ARQUIVO)
+        if not caminho:
+            return
+        try:
+            exportar(self.mensagens.textos, self.mensagens.ativos, caminho)
+            print(f"Mensagens exportadas para {caminho}")
+        except OSError as e:
+            print(f"Erro ao exportar '{caminho}': {e}")
+
+    def calibrar(self):
+        """Abre a calibração: digita as mensagens ativas num campo de teste com cadências cada vez menores."""
+        if self.running:
+            print("Pare a macro antes de calibrar.")
+            return
+        config = replace(self.config_atual, mensagens=tuple(self.mensagens.ativas()))
+        if not any(config.mensagens):
+            print("Ative pelo menos uma mensagem para calibrar.")
+            return
+        JanelaCalibracao(self.root, self.motor, config, self.aplicar_calibracao)
+
+    def aplicar_calibracao(self, resultado):
+        """Aplica a cadência segura encontrada e guarda o resultado da calibração no perfil."""
+        self.calibracao = resultado
+        self.autosalvar.registrar((CONFIG, {"calibracao": resultado}))
+        if resultado["cadencia_segura"] is not None:
+            self.cadencia_var.set(f"{resultado['cadencia_segura']:g}")
+
+    def alternar_perfilamento(self):
+        """Liga/desliga o perfilamento; ao desligar, grava o perfil (depois de parar, se a macro está ativa)."""
+        if self.perfilar_var.get():
+            self.perfil_pendente = False
+            self.perfilador.iniciar()
+            print(f"Perfilamento ligado ({HOTKEY_PERFIL} desliga)")
+            if self.running and self.motor.loop_started:
+                print("O loop em andamento não é perfilado: o envio é perfilado a partir da próxima execução")
+        elif self.running:
+            self.perfil_pendente = True
+            print("O perfilamento será gravado quando a macro parar")
+        else:
+            self.gravar_perfilamento()
+
+    def inverter_perfilamento(self):
+        """Hotkey de perfilamento (roda na thread do Tk, pedida pelo canal de eventos)."""
+        self.perfilar_var.set(not self.perfilar_var.get())
+        self.alternar_perfilamento()
+
+    def gravar_perfilamento(self):
+        try:
+            caminho = self.perfilador.encerrar()
+        except OSError as e:
+            print(f"Erro ao gravar o perfilamento: {e}")
+            return
+        if caminho:
+            print(f"Perfilamento gravado: {caminho}")
+
+    def registrar_hotkey_automatico(self, event=None):
+        """Registra automaticamente a hotkey de ativação quando o usuário seleciona uma opção."""
+        hotkey = self.start_hotkey_var.get().strip()
+        if hotkey:
+            try:
+                # Só troca a hotkey se ela mudou (a anterior é removida pelo registro)
+                if self.motor.hotkeys.definir("iniciar", hotkey, self.pedir_inicio):
+                    print(f"Hotkey '{hotkey}' registrada com sucesso!")
+            except ValueError as e:
+                print(f"Erro ao registrar hotkey: {e}")
+
+    def atualizar_config(self, *args):
+        """
+        Refaz o snapshot (ConfigExecucao) com os valores atuais da tela.
+        Roda sempre na thread do Tk (traces das variáveis); com a macro ativa,
+        só os campos de CAMPOS_ATUALIZAVEIS que mudaram vão para o motor por
+        motor.atualizar(): numa execução retomada, os outros continuam os do diário.
+        """
+        anterior = self.config_atual
+        # Obtém a tecla para envio
+        tecla = self.tecla_selecionada.get().strip()
+        if tecla.lower() == "digite a tecla...":
+            tecla = self.tecla_combobox.get()
+
+        self.config_atual = ConfigExecucao(
+            mensagens=(),  # Preenchidas ao iniciar (ver iniciar_macro)
+            tecla_envio=tecla.strip().lower(),
+            tecla_parada=self.stop_hotkey_var.get().strip(),
+            cadencia=ler_cadencia(self.cadencia_var.get()),  # Velocidade do flood
+            loop=self.loop_var.get(),
+            intervalo=ler_intervalo(self.loop_interval_var.get()),
+            backend=self.backend_nome,
+            modo_envio=self.modos_envio.get(self.modo_var.get(), MODO_DIGITAR),
+            teclas_por_segundo=ler_taxa(self.limite_var.get()),
+        )
+        if self.running and anterior is not None:
+            mudancas = {campo: getattr(self.config_atual, campo) for campo in CAMPOS_ATUALIZAVEIS
+                        if getattr(self.config_atual, campo) != getattr(anterior, campo)}
+            if mudancas:
+                self.motor.atualizar(**mudancas)
+
+    def oferecer_retomada(self):
+        """Se a última execução foi interrompida (queda ou janela fechada com o loop ativo), oferece continuar."""
+        retomada = ler_retomada()
+        if retomada is None:
+            return
+        config = config_de_dict(retomada.config)
+        if messagebox.askyesno(
+                "Retomar execução",
+                f"A última execução parou no ciclo {retomada.ciclos + 1}, antes da mensagem "
+                f"{retomada.mensagem + 1}.\nRetomar de onde parou? ({config.tecla_envio.upper()} continua o envio)"):
+            self.iniciar_macro(retomada)
+        else:
+            self.motor.diario.descartar()
+
+    def iniciar_macro(self, retomada=None):
+        """
+        Inicia a macro e registra a hotkey de envio.
+        O loop de envio (se ativado) só começará quando o usuário pressionar a tecla definida pela primeira vez.
+        Além disso, registra a hotkey de parada definida.
+        Roda na thread do Tk; as hotkeys de ativação e de parada só pedem pelo
+        canal de eventos (pedir_inicio/pedir_parada), sem tocar nos widgets.
+        retomada: diario.Retomada; usa as mensagens e a configuração guardadas no diário.
+        """
+        if self.running:
+            return
+        self.running = True
+        self.start_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
+
+        if retomada is not None:
+            config = config_de_dict(retomada.config)
+        else:
+            config = replace(self.config_atual, mensagens=tuple(self.mensagens.ativas()))
+        self.progresso = {}
+        self.motor.iniciar(config, ao_parar=self.pedir_parada, retomada=retomada)
+        self.atualizar_metricas()
+
+    def pedir_inicio(self):
+        """Callback da hotkey de ativação (thread do teclado): só pede o início ao Tk."""
+        self.eventos.pedir(self.iniciar_macro)
+
+    def pedir_parada(self):
+        """Callback da hotkey de parada (thread do teclado): só pede a parada ao Tk."""
+        self.eventos.pedir(self.parar_macro)
+
+    def aplicar_eventos(self, eventos):
+        """Recebe da BombaTk o último valor de cada evento publicado desde o quadro anterior."""
+        self.progresso.update(eventos)
+        self.mostrar_progresso()
+        self.atualizar_metricas()
+
+    def mostrar_progresso(self):
+        """Mensagem atual, ciclo e contagem regressiva para o próximo ciclo."""
+        partes = []
+        if MENSAGEM in self.progresso:
+            partes.append("mensagem {}/{}".format(*self.progresso[MENSAGEM]))
+        if CICLO in self.progresso:
+            partes.append(f"ciclo {self.progresso[CICLO]}")
+        proximo = self.progresso.get(PROXIMO)
+        if proximo is not None:
+            restante = max(0.0, proximo - time.monotonic())
+            partes.append(f"próximo ciclo em {restante:.0f}s")
+            if self.contagem is None and restante > 0:
+                # A contagem anda sem eventos novos: acorda só quando o número mostrado muda
+                self.contagem = self.root.after(int((restante + 0.5) % 1 * 1000) + 1, self.avancar_contagem)
+        self.progresso_var.set(" | ".join(partes))
+
+    def avancar_contagem(self):
+        self.contagem = None
+        self.mostrar_progresso()
+
+    def atualizar_metricas(self):
+        """Mostra as métricas da execução atual (a cada evento do motor, não por tempo)."""
+        metricas = self.motor.metricas
+        if metricas is None:
+            return
+        latencia = metricas.latencia_hotkey.percentil(50)
+        self.metricas_var.set(
+            f"{metricas.mensagens} mensagens | {metricas.teclas_por_segundo:.0f} teclas/s | "
+            f"hotkey→tecla {latencia * 1000:.1f} ms | {metricas.ciclos} ciclos"
+        )
+
+    def parar_macro(self):
+        """Para a macro, desabilita os hotkeys e reseta as flags."""
+        if not self.running:
+            return
+        self.running = False
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+        self.motor.parar()  # Remove as hotkeys de envio e parada; a de ativação continua
+        if self.perfil_pendente:
+            self.perfil_pendente = False
+            self.gravar_perfilamento()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m macrorh", description="Macro de mensagens")
+    parser.add_argument("--tema", choices=sorted(TEMAS), default=TEMA_PADRAO,
+                        help=f"visual da janela (padrão: {TEMA_PADRAO}; simples não carrega a imagem de fundo)")
+    args = parser.parse_args(argv)
+    root = tk.Tk()
+    app = MacroApp(root, TEMAS[args.tema]())
+    root.mainloop()
@@ -0,0 +1,183 @@
+"""
+Temas da janela: o mesmo MacroApp com dois visuais.
+
+- simples: fundo preto, fontes padrão do Tk, widgets com pack e place;
+- imagem: background.png atrás dos widgets, todos com place, rótulos em Arial negrito.
+
+O tema só diz onde e como cada widget aparece (posição, fonte, frame em que é
+criado); a lógica fica toda no MacroApp. Os recursos do tema só são carregados
+em preparar(): o tema simples nunca abre o background.png nem importa o PIL.
+"""
+import os
+import tkinter as tk
+from tkinter import ttk
+
+from carregamento import carregar_fundo  # Só importa o PIL quando o cache do fundo não existe
+
+PASTA_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Tema:
+    """
+    Base dos temas.
+    posicoes: chave do widget -> (gerenciador, opções), gerenciador "place" ou "pack".
+    grupos: chave do widget -> nome do frame (empacotado na janela) que o recebe;
+    widgets fora de grupos são criados direto na janela.
+    """
+
+    nome = ""
+    cor_fundo = "white"
+    fontes = {}  # "titulo", "rotulo", "linha", "metricas"; ausente: fonte padrão do Tk
+    textos = {}  # Textos trocados pelo tema (chave do widget -> texto)
+    largura_mensagem = 25  # Caixa de texto de cada MacroRow
+    opcoes_lista = {}  # Opções do Canvas que rola as mensagens
+    tamanho_mensagens = None  # (largura, altura) do frame interno das mensagens
+    posicoes = {}
+    grupos = {}
+
+    def __init__(self):
+        self._frames = {}
+
+    def preparar(self, root):
+        """Configura a janela antes de criar os widgets."""
+        root.configure(bg=self.cor_fundo)
+
+    def fonte(self, tipo):
+        return self.fontes.get(tipo)
+
+    def texto(self, chave, padrao):
+        return self.textos.get(chave, padrao)
+
+    def pai(self, root, chave):
+        """Onde criar o widget 'chave': a janela ou o frame do grupo dele (criado no primeiro uso)."""
+        grupo = self.grupos.get(chave)
+        if grupo is None:
+            return root
+        if grupo not in self._frames:
+            self._frames[grupo] = ttk.Frame(root)
+            self._frames[grupo].pack(pady=5)
+        return self._frames[grupo]
+
+    def colocar(self, widget, chave):
+        """Posiciona o widget conforme o tema e o retorna."""
+        gerenciador, opcoes = self.posicoes[chave]
+        getattr(widget, gerenciador)(**opcoes)
+        return widget
+
+
+class TemaSimples(Tema):
+    nome = "simples"
+    cor_fundo = "black"
+    fontes = {"titulo": ("Arial", 12)}
+    textos = {"limite": "Teclas/s:"}
+    opcoes_lista = {"bg": "lightgray"}
+    posicoes = {
+        "titulo": ("pack", {"pady": 10}),
+        "tecla_label": ("place", {"x": 40, "y": 50}),
+        "tecla": ("place", {"x": 40, "y": 75}),
+        "cadencia_label": ("place", {"x": 250, "y": 50}),
+        "cadencia": ("place", {"x": 250, "y": 75}),
+        "loop": ("place", {"x": 40, "y": 105}),
+        # Coluna da esquerda, embaixo do loop: a lista ocupa x 300-615, y 100-300
+        "modo_label": ("place", {"x": 40, "y": 135}),
+        "modo": ("place", {"x": 90, "y": 135}),
+        "limite_label": ("place", {"x": 40, "y": 165}),
+        "limite": ("place", {"x": 110, "y": 165}),
+        "intervalo_label": ("place", {"x": 400, "y": 50}),
+        "intervalo": ("place", {"x": 400, "y": 75}),
+        "parada_label": ("pack", {"pady": 5}),
+        "parada": ("pack", {"pady": 5}),
+        "iniciar_label": ("pack", {"pady": 5}),
+        "iniciar": ("pack", {"pady": 5}),
+        "perfil_label": ("pack", {"pady": 5}),
+        "perfil": ("pack", {"pady": 5}),
+        "busca_label": ("pack", {"side": "left"}),
+        "busca": ("pack", {"side": "left", "padx": 5}),
+        "lista": ("place", {"x": 300, "y": 100, "width": 300, "height": 200}),
+        "rolagem": ("place", {"x": 600, "y": 100, "height": 200}),
+        "adicionar": ("pack", {"pady": 10}),
+        "ativar": ("pack", {"pady": 5}),
+        "parar": ("pack", {"pady": 5}),
+        "importar": ("pack", {"side": "left", "padx": 2}),
+        "exportar": ("pack", {"side": "left", "padx": 2}),
+        "marcar": ("pack", {"side": "left", "padx": 2}),
+        "desmarcar": ("pack", {"side": "left", "padx": 2}),
+        "calibrar": ("pack", {"side": "left", "padx": 2}),
+        "recursos": ("pack", {"side": "left", "padx": 2}),
+        "perfilar": ("pack", {"side": "left", "padx": 2}),
+        "metricas": ("pack", {"pady": 5}),
+        "progresso": ("pack", {}),
+    }
+    grupos = {
+        "busca_label": "busca", "busca": "busca",
+        "importar": "arquivo", "exportar": "arquivo", "marcar": "arquivo",
+        "desmarcar": "arquivo", "calibrar": "arquivo", "recursos": "arquivo", "perfilar": "arquivo",
+    }
+
+
+class TemaImagem(Tema):
+    nome = "imagem"
+    imagem = os.path.join(PASTA_PROJETO, "background.png")
+    largura, altura = 750, 500
+    fontes = {
+        "titulo": ("Arial", 12, "bold"),
+        "rotulo": ("Arial", 10, "bold"),
+        "linha": ("Arial", 10, "bold"),
+        "metricas": ("Arial", 9),
+    }
+    textos = {}
+    largura_mensagem = 55
+    opcoes_lista = {"bd": 0, "highlightthickness": 0}  # Remove bordas e destaque
+    tamanho_mensagens = (670, 300)  # Maior que o Canvas, para sobrar espaço ao rolar
+    posicoes = {
+        "titulo": ("place", {"x": 40, "y": 20}),
+        "tecla_label": ("place", {"x": 40, "y": 50}),
+        "tecla": ("place", {"x": 40, "y": 75}),
+        "cadencia_label": ("place", {"x": 250, "y": 50}),
+        "cadencia": ("place", {"x": 250, "y": 75}),
+        "loop": ("place", {"x": 40, "y": 105}),
+        "modo_label": ("place", {"x": 250, "y": 105}),
+        "modo": ("place", {"x": 300, "y": 105}),
+        "limite_label": ("place", {"x": 460, "y": 20}),
+        "limite": ("place", {"x": 650, "y": 20}),
+        "intervalo_label": ("place", {"x": 400, "y": 50}),
+        "intervalo": ("place", {"x": 400, "y": 75}),
+        "parada_label": ("place", {"x": 40, "y": 140}),
+        "parada": ("place", {"x": 40, "y": 165}),
+        "iniciar_label": ("place", {"x": 250, "y": 140}),
+        "iniciar": ("place", {"x": 250, "y": 165}),
+        "perfil_label": ("place", {"x": 460, "y": 140}),
+        "perfil": ("place", {"x": 460, "y": 165}),
+        "busca_label": ("place", {"x": 460, "y": 105}),
+        "busca": ("place", {"x": 520, "y": 105}),
+        "lista": ("place", {"x": 40, "y": 200, "width": 670, "height": 200}),
+        "rolagem": ("place", {"x": 710, "y": 200, "height": 200}),
+        "adicionar": ("place", {"x": 40, "y": 460}),
+        "ativar": ("place", {"x": 250, "y": 460}),
+        "parar": ("place", {"x": 400, "y": 460}),
+        "importar": ("place", {"x": 550, "y": 460}),
+        "exportar": ("place", {"x": 640, "y": 460}),
+        "marcar": ("place", {"x": 550, "y": 425}),
+        "desmarcar": ("place", {"x": 640, "y": 425}),
+        "calibrar": ("place", {"x": 460, "y": 425}),
+        "recursos": ("place", {"x": 640, "y": 163}),
+        "perfilar": ("place", {"x": 370, "y": 428}),
+        "metricas": ("place", {"x": 40, "y": 410}),
+        "progresso": ("place", {"x": 40, "y": 432}),
+    }
+
+    def preparar(self, root):
+        """Desenha a imagem de fundo (já redimensionada, do cache quando possível) num Canvas."""
+        super().preparar(root)
+        try:
+            self.foto = carregar_fundo(self.imagem, self.largura, self.altura)
+        except (OSError, ImportError, tk.TclError) as e:
+            print(f"Aviso: não foi possível carregar o fundo '{self.imagem}': {e}")
+            return
+        self.fundo = tk.Canvas(root, width=self.largura, height=self.altura)
+        self.fundo.pack(fill="both", expand=True)
+        self.fundo.create_image(0, 0, image=self.foto, anchor="nw")
+
+
+TEMAS = {TemaSimples.nome: TemaSimples, TemaImagem.nome: TemaImagem}
+TEMA_PADRAO = TemaImagem.nome
@@ -0,0 +1,190 @@
+"""
+Instrumentação por execução: contadores e histogramas de baixo custo.
+
+Mede, para cada execução da macro:
+- latência da hotkey até a primeira tecla;
+- tempo de digitação de cada mensagem e teclas/s;
+- duração agendada x real de cada ciclo do loop.
+No caminho quente há só duas leituras do relógio e um bisect por mensagem.
+"""
+import bisect
+import csv
+import json
+import os
+import time
+
+from agendador import Estatisticas
+from carregamento import pasta_cache
+from envio import BackendInjecao, contar_teclas
+
+# Limites dos baldes: 10 µs a 1000 s, 4 por década (escala logarítmica)
+LIMITES_PADRAO = tuple(10 ** (e / 4) for e in range(-20, 13))
+EXPORTACOES_MANTIDAS = 20  # Exportações (pares .json/.csv) guardadas na pasta; as mais antigas são apagadas
+
+
+class Histograma:
+    """Contagens por balde logarítmico + média/desvio/máximo, sem guardar as amostras."""
+
+    __slots__ = ("limites", "contagens", "estatisticas")
+
+    def __init__(self, limites=LIMITES_PADRAO):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)  # Último balde: acima do maior limite
+        self.estatisticas = Estatisticas()
+
+    def adicionar(self, valor):
+        self.contagens[bisect.bisect_left(self.limites, valor)] += 1
+        self.estatisticas.adicionar(valor)
+
+    def percentil(self, p):
+        """Limite superior do balde onde cai o percentil p (0-100)."""
+        total = self.estatisticas.n
+        if not total:
+            return 0.0
+        alvo = total * p / 100
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return self.limites[i] if i < len(self.limites) else self.estatisticas.maximo
+        return self.estatisticas.maximo
+
+    def resumo(self):
+        dados = self.estatisticas.como_dict()
+        dados.update(p50=self.percentil(50), p90=self.percentil(90), p99=self.percentil(99))
+        return dados
+
+
+class MetricasExecucao:
+    """Métricas de uma execução; alimentadas pelo motor e pelo BackendMedido."""
+
+    def __init__(self, relogio=time.perf_counter):
+        self.relogio = relogio
+        self.inicio = relogio()
+        self.fim = None
+        self.teclas = 0
+        self.mensagens = 0
+        self.ciclos = 0
+        self.latencia_hotkey = Histograma()  # Hotkey de envio -> primeira tecla
+        self.tempo_mensagem = Histograma()  # Digitação de cada mensagem
+        self.erro_ciclo = Histograma()  # |real - agendado| de cada ciclo
+        self.tempo_digitando = 0.0
+        self.loop = None  # AgendadorDeadline.estatisticas() do loop, quando ele termina
+        self._acionado_em = None
+
+    def marcar_acionamento(self, instante=None):
+        """
+        Chamado quando uma pressão da hotkey de envio começa um envio (não nas
+        pressões ignoradas, como as feitas com o loop já rodando).
+        instante: quando a tecla foi pressionada (padrão: agora).
+        """
+        self._acionado_em = self.relogio() if instante is None else instante
+
+    def mensagem(self, inicio, fim, teclas):
+        """Registra uma mensagem digitada entre 'inicio' e 'fim'."""
+        if self._acionado_em is not None:
+            self.latencia_hotkey.adicionar(inicio - self._acionado_em)
+            self._acionado_em = None
+        duracao = fim - inicio
+        self.tempo_mensagem.adicionar(duracao)
+        self.tempo_digitando += duracao
+        self.teclas += teclas
+        self.mensagens += 1
+
+    def ciclo(self, agendado, real):
+        """Registra a duração agendada e a real de um ciclo do loop."""
+        self.ciclos += 1
+        self.erro_ciclo.adicionar(abs(real - agendado))
+
+    def encerrar(self):
+        self.fim = self.relogio()
+
+    @property
+    def teclas_por_segundo(self):
+        """Velocidade de digitação (só o tempo digitando, sem as esperas)."""
+        return self.teclas / self.tempo_digitando if self.tempo_digitando else 0.0
+
+    def resumo(self):
+        dados = {
+            "duracao": (self.fim or self.relogio()) - self.inicio,
+            "mensagens": self.mensagens,
+            "teclas": self.teclas,
+            "teclas_por_segundo": self.teclas_por_segundo,
+            "ciclos": self.ciclos,
+            "latencia_hotkey": self.latencia_hotkey.resumo(),
+            "tempo_mensagem": self.tempo_mensagem.resumo(),
+            "erro_ciclo": self.erro_ciclo.resumo(),
+        }
+        if self.loop is not None:
+            dados["loop"] = self.loop
+        return dados
+
+    def exportar(self, pasta, manter=EXPORTACOES_MANTIDAS):
+        """
+        Grava o resumo em JSON e os histogramas em CSV e apaga as exportações
+        além das 'manter' mais recentes. Retorna os dois caminhos.
+        """
+        os.makedirs(pasta, exist_ok=True)
+        agora = time.time()
+        carimbo = time.strftime("%Y%m%d-%H%M%S", time.localtime(agora)) + f"-{int(agora * 1000) % 1000:03d}"
+        base = os.path.join(pasta, f"execucao-{carimbo}")
+        sufixo = 1
+        while os.path.exists(base + ".json"):  # Duas paradas no mesmo milissegundo
+            base = os.path.join(pasta, f"execucao-{carimbo}-{sufixo}")
+            sufixo += 1
+        with open(base + ".json", "w", encoding="utf-8") as arquivo:
+            json.dump(self.resumo(), arquivo, indent=2)
+        with open(base + ".csv", "w", encoding="utf-8", newline="") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(["metrica", "limite_superior_s", "contagem"])
+            for nome in ("latencia_hotkey", "tempo_mensagem", "erro_ciclo"):
+                histograma = getattr(self, nome)
+                for i, contagem in enumerate(histograma.contagens):
+                    if contagem:
+                        limite = histograma.limites[i] if i < len(histograma.limites) else "inf"
+                        escritor.writerow([nome, limite, contagem])
+        _limpar_exportacoes(pasta, manter)
+        return base + ".json", base + ".csv"
+
+
+def _limpar_exportacoes(pasta, manter):
+    """Apaga os pares execucao-*.json/.csv mais antigos que os 'manter' últimos (o carimbo ordena pelo nome)."""
+    bases = sorted({os.path.splitext(nome)[0] for nome in os.listdir(pasta)
+                    if nome.startswith("execucao-") and nome.endswith((".json", ".csv"))})
+    for base in bases[:max(0, len(bases) - manter)]:
+        for extensao in (".json", ".csv"):
+            try:
+                os.remove(os.path.join(pasta, base + extensao))
+            except FileNotFoundError:
+                pass
+
+
+class BackendMedido(BackendInjecao):
+    """Envolve outro backend e mede cada mensagem que ele digita."""
+
+    def __init__(self, backend, metricas):
+        self.backend = backend
+        self.metricas = metricas
+        self.nome = backend.nome
+
+    def escrever(self, texto):
+        self.backend.escrever(texto)
+
+    def pressionar(self, tecla):
+        self.backend.pressionar(tecla)
+
+    def escrever_tecla(self, caractere):
+        self.backend.escrever_tecla(caractere)
+
+    def executar(self, passos, cancelar=None):
+        relogio = self.metricas.relogio
+        inicio = relogio()
+        completa = self.backend.executar(passos, cancelar)
+        if completa:
+            self.metricas.mensagem(inicio, relogio(), contar_teclas(passos))
+        return completa
+
+
+def pasta_metricas():
+    """Pasta onde as métricas de cada execução são exportadas."""
+    return os.path.join(pasta_cache(), "metricas")
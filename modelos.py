@@ -0,0 +1,110 @@
+"""
+Mensagens com campos dinâmicos.
+
+Campos reconhecidos no texto de uma mensagem:
+    {hora}               hora atual (HH:MM:SS)
+    {data}               data atual (DD/MM/AAAA)
+    {contador}           número da mensagem enviada nesta execução (1, 2, 3...)
+    {ciclo}              número do ciclo do loop (1 fora do loop)
+    {aleatorio:a|b|c}    uma das opções, sorteada a cada envio
+Qualquer outra coisa entre chaves fica como está.
+
+O texto é analisado uma vez, ao iniciar a macro (compilar_modelo); cada envio
+só junta as partes já prontas.
+"""
+import random
+import re
+import time
+
+_CAMPO = re.compile(r"\{(hora|data|contador|ciclo|aleatorio:[^{}]*)\}")
+
+
+class ContextoEnvio:
+    """Estado dos campos dinâmicos numa execução (usado só pela thread de envio)."""
+
+    __slots__ = ("contador", "ciclo", "sorteio", "_segundo", "_hora", "_dia", "_data")
+
+    def __init__(self, semente=None):
+        self.contador = 0
+        self.ciclo = 1
+        self.sorteio = random.Random(semente)
+        self._segundo = self._dia = None
+        self._hora = self._data = ""
+
+    def hora(self):
+        # Formatada no máximo uma vez por segundo
+        segundo = int(time.time())
+        if segundo != self._segundo:
+            self._segundo = segundo
+            self._hora = time.strftime("%H:%M:%S", time.localtime(segundo))
+        return self._hora
+
+    def data(self):
+        dia = int(time.time()) // 3600  # Refeita a cada hora (cobre a virada do dia)
+        if dia != self._dia:
+            self._dia = dia
+            self._data = time.strftime("%d/%m/%Y")
+        return self._data
+
+
+def _hora(contexto):
+    return contexto.hora()
+
+
+def _data(contexto):
+    return contexto.data()
+
+
+def _contador(contexto):
+    return str(contexto.contador)
+
+
+def _ciclo(contexto):
+    return str(contexto.ciclo)
+
+
+def _aleatorio(opcoes):
+    return lambda contexto: contexto.sorteio.choice(opcoes)
+
+
+_CAMPOS = {"hora": _hora, "data": _data, "contador": _contador, "ciclo": _ciclo}
+
+
+class Modelo:
+    """Mensagem compilada: partes fixas (str) e campos (funções do ContextoEnvio)."""
+
+    __slots__ = ("texto", "partes")
+
+    def __init__(self, texto, partes):
+        self.texto = texto
+        self.partes = partes
+
+    def __len__(self):
+        # Só as partes fixas: tamanho aproximado, usado na contagem de teclas do plano
+        return sum(len(parte) for parte in self.partes if parte.__class__ is str)
+
+    def __repr__(self):
+        return f"Modelo({self.texto!r})"
+
+    def renderizar(self, contexto):
+        return "".join([parte if parte.__class__ is str else parte(contexto) for parte in self.partes])
+
+
+def compilar_modelo(texto):
+    """Compila o texto de uma mensagem: devolve o próprio texto se não houver campos, senão um Modelo."""
+    partes = []
+    posicao = 0
+    for campo in _CAMPO.finditer(texto):
+        if campo.start() > posicao:
+            partes.append(texto[posicao:campo.start()])
+        nome = campo.group(1)
+        if nome.startswith("aleatorio:"):
+            partes.append(_aleatorio(tuple(nome[len("aleatorio:"):].split("|"))))
+        else:
+            partes.append(_CAMPOS[nome])
+        posicao = campo.end()
+    if not partes:
+        return texto
+    if posicao < len(texto):
+        partes.append(texto[posicao:])
+    return Modelo(texto, tuple(partes))
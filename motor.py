@@ -0,0 +1,575 @@
+"""
+Motor da macro, independente da interface Tk.
+
+Toda a lógica de envio (hotkeys de envio/parada, envio único, loop) fica aqui e
+recebe uma ConfigExecucao pronta, sem ler widgets. Assim o motor roda, é
+medido e testado sem display (ex.: com o backend "gravacao").
+
+Uso pela linha de comando:
+    python motor.py mensagens.txt --tecla f8 --cadencia 0.5 --loop --intervalo 20
+    python motor.py mensagens.txt --backend gravacao --agora --loop --ciclos 100
+    python motor.py --sequencia f6 avisos.txt 1 60 --sequencia f7 pedidos.txt 0.5 --loop
+    python motor.py mensagens.txt --backend gravacao --agora --loop --ciclos 100 --perfilar
+    python motor.py mensagens.txt --tecla f8 --loop --diario      # anota o progresso do loop
+    python motor.py --tecla f8 --retomar                           # continua uma execução interrompida
+"""
+import argparse
+import json
+import threading
+from dataclasses import dataclass, fields, replace
+
+from agendador import AgendadorDeadline
+from diario import DiarioExecucao, ler_retomada
+from eventos import CICLO, ESTADO, MENSAGEM, PROXIMO
+from hotkeys import RegistroHotkeys
+from importacao import ler_arquivo
+from gravador import reproduzir
+from metricas import BackendMedido, MetricasExecucao
+from modelos import ContextoEnvio
+from perfilamento import Perfilador
+from envio import (BACKEND_PADRAO, BACKENDS, MODO_DIGITAR, MODOS_ENVIO, RAJADA_PADRAO, BackendLimitado,
+                   BackendSerializado, LimitadorTaxa, compilar_plano, criar_backend, executar_plano)
+from sequenciador import Sequenciador
+from trabalhador import COALESCER, POLITICAS, TrabalhadorEnvio
+
+CADENCIA_MINIMA = 0.001  # Usada quando a cadência é inválida ou quase zero
+INTERVALO_PADRAO = 20.0  # Usado quando o intervalo do loop é inválido
+CAMPOS_ATUALIZAVEIS = {"cadencia", "loop", "intervalo"}  # Podem mudar com a macro ativa
+
+
+def ler_cadencia(texto):
+    """Converte o texto da cadência (segundos) com as mesmas regras da interface."""
+    try:
+        cadencia = float(texto)
+    except ValueError:
+        return CADENCIA_MINIMA
+    return CADENCIA_MINIMA if cadencia < 0.00001 else cadencia
+
+
+def ler_taxa(texto):
+    """Converte o texto do limite de teclas por segundo; inválido ou <= 0 vira 0 (sem limite)."""
+    try:
+        taxa = float(texto)
+    except ValueError:
+        return 0.0
+    return max(taxa, 0.0)
+
+
+def ler_intervalo(texto):
+    """Converte o texto do intervalo do loop (segundos); negativos viram 0."""
+    try:
+        intervalo = float(texto)
+    except ValueError:
+        return INTERVALO_PADRAO
+    return max(intervalo, 0.0)
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigExecucao:
+    """
+    Snapshot imutável de tudo o que uma execução da macro precisa, já validado.
+    É montado uma vez na thread da interface; a thread de envio só lê snapshots
+    e nunca toca em objetos do Tk.
+    """
+
+    mensagens: tuple
+    tecla_envio: str = ""
+    tecla_parada: str = "esc"
+    cadencia: float = 0.5
+    loop: bool = False
+    intervalo: float = INTERVALO_PADRAO
+    ciclos: int = 0  # Limite de ciclos do loop (0 = sem limite)
+    backend: str = BACKEND_PADRAO
+    modo_envio: str = MODO_DIGITAR  # Digitar, colar ou automático (ver envio.MODOS_ENVIO)
+    teclas_por_segundo: float = 0.0  # Limite de taxa da injeção (0 = sem limite)
+    rajada: int = RAJADA_PADRAO  # Teclas seguidas permitidas pelo limite de taxa
+
+
+def config_de_dict(dados):
+    """ConfigExecucao a partir de asdict() (ex.: a guardada no diário); campos desconhecidos são ignorados."""
+    campos = {campo.name for campo in fields(ConfigExecucao)}
+    valores = {campo: valor for campo, valor in dados.items() if campo in campos}
+    return ConfigExecucao(**{**valores, "mensagens": tuple(valores.get("mensagens", ()))})
+
+
+def backend_limitado(backend, config):
+    """O backend com o limite de teclas por segundo da config (se houver)."""
+    if config.teclas_por_segundo > 0:
+        return BackendLimitado(backend, LimitadorTaxa(config.teclas_por_segundo, config.rajada))
+    return backend
+
+
+class MotorMacro:
+    """
+    Executa a macro a partir de uma ConfigExecucao.
+    teclado: módulo keyboard (ou ModuloAdiado) para registrar hotkeys; None
+             desliga as hotkeys e o envio é disparado por acionar().
+    As hotkeys ficam em self.hotkeys (RegistroHotkeys), que quem usa o motor
+    também usa para a hotkey de ativação ("iniciar").
+    Além da execução principal, sequências nomeadas com hotkeys próprias rodam
+    no self.sequenciador; a injeção de todas passa por self.trava_injecao.
+    """
+
+    def __init__(self, teclado=None, politica=COALESCER):
+        self.hotkeys = RegistroHotkeys(teclado) if teclado is not None else None
+        self.trabalhador = TrabalhadorEnvio(politica=politica)  # Thread única de envio
+        self.backend = None  # Criado na primeira execução
+        self.metricas = None  # MetricasExecucao da execução atual
+        self.injetor = None  # self.backend com limite de taxa, medição e a trava de injeção
+        self.pasta_metricas = None  # Se definida, as métricas são exportadas ao parar
+        self.config = None  # Snapshot atual (trocado inteiro por atualizar())
+        self._trava_config = threading.Lock()
+        self.running = False
+        self.loop_started = False  # Flag para indicar se o loop já foi iniciado
+        self.cancelar = threading.Event()  # Cancelamento da execução atual
+        self.agendador = None  # Agendador do loop atual (jitter e deriva medidos)
+        self._despertares_loops = 0  # Esperas dos loops anteriores ao atual (ver despertares)
+        self.plano_unico = None
+        self.plano_loop = None
+        self.contexto = None  # Campos dinâmicos das mensagens (contador, ciclo...)
+        self.erros_reproducao = None  # Histograma do erro de tempo da última reprodução
+        self.trava_injecao = threading.Lock()  # Uma mensagem por vez, venha de onde vier
+        self.sequenciador = Sequenciador(self.trava_injecao)  # Sequências nomeadas (thread criada no 1º uso)
+        self.perfilador = None
+        self.eventos = None  # eventos.CanalEventos da interface (estado e progresso), se houver
+        self.diario = None  # diario.DiarioExecucao: progresso do loop em disco, para retomar
+        self.retomada = None  # diario.Retomada usada pelo próximo loop
+
+    def definir_perfilador(self, perfilador):
+        """Passa o Perfilador às threads de envio; ele só pesa enquanto estiver ativo."""
+        self.perfilador = perfilador
+        self.trabalhador.perfilador = perfilador
+        self.sequenciador.perfilador = perfilador
+
+    def iniciar(self, config, ao_parar=None, retomada=None):
+        """
+        Inicia uma execução e registra as hotkeys de envio e de parada.
+        O loop (se ativado) só começa na primeira pressão da tecla de envio.
+        ao_parar: chamado pela hotkey de parada (padrão: self.parar).
+        retomada: diario.Retomada; o loop continua da mensagem e do prazo dela.
+        """
+        if self.running:
+            return False
+        self.running = True
+        self.retomada = retomada
+        self.loop_started = False
+        self.cancelar = threading.Event()  # Um evento por execução: acorda esperas e aborta o envio
+        self.config = config
+
+        # Compila as mensagens uma única vez; o plano é reutilizado a cada envio
+        if self.backend is None or self.backend.nome != config.backend:
+            self.backend = criar_backend(config.backend)
+        self.metricas = MetricasExecucao()
+        self.injetor = BackendSerializado(BackendMedido(backend_limitado(self.backend, config), self.metricas),
+                                          self.trava_injecao)
+        self.plano_unico = compilar_plano(config.mensagens, apagar_tecla=len(config.tecla_envio) == 1,
+                                          modo=config.modo_envio)
+        self.plano_loop = compilar_plano(config.mensagens, modo=config.modo_envio)
+        self.contexto = ContextoEnvio()
+        self._publicar(ESTADO, True)
+
+        if self.hotkeys is not None:
+            if config.tecla_envio:
+                self.ativar_macro(config.tecla_envio)
+            self.hotkeys.aplicar({"parar": (config.tecla_parada, ao_parar or self.parar)})
+        return True
+
+    def atualizar(self, **mudancas):
+        """
+        Canal de atualização seguro entre threads: troca o snapshot atual por uma
+        cópia com as 'mudancas' (cadencia, loop, intervalo). O loop passa a usar
+        os novos valores a partir do próximo ciclo; envios únicos, na próxima pressão.
+        """
+        invalidos = set(mudancas) - CAMPOS_ATUALIZAVEIS
+        if invalidos:
+            raise ValueError(f"Campos não atualizáveis durante a execução: {sorted(invalidos)}")
+        with self._trava_config:
+            if self.config is not None:
+                self.config = replace(self.config, **mudancas)
+        if self.diario is not None:
+            self.diario.atualizar(mudancas)
+
+    def _publicar(self, tipo, valor):
+        eventos = self.eventos
+        if eventos is not None:
+            eventos.publicar(tipo, valor)
+
+    def _progresso(self, total):
+        """Callback ao_enviar que publica (número, total) da mensagem; None sem canal de eventos."""
+        eventos = self.eventos
+        if eventos is None:
+            return None
+        return lambda numero: eventos.publicar(MENSAGEM, (numero, total))
+
+    def ativar_macro(self, tecla):
+        """Registra a hotkey de envio (o callback só enfileira, ver acionar)."""
+        self.hotkeys.definir("enviar", tecla, self.acionar)
+
+    def acionar(self):
+        """
+        Pressão da tecla de envio: inicia o loop na primeira vez ou faz um envio único.
+        Só enfileira o trabalho na thread de envio, para não travar o hook do teclado.
+        """
+        if not self.running:
+            return
+        config, cancelar, contexto, metricas = self.config, self.cancelar, self.contexto, self.metricas
+        acionado_em = metricas.relogio()
+
+        # A pressão só conta para a latência da hotkey se a tarefa que ela enfileirou chegar a rodar
+        def loop():
+            metricas.marcar_acionamento(acionado_em)
+            self.loop_mensagens(self.plano_loop, config, cancelar)
+
+        def envio():
+            metricas.marcar_acionamento(acionado_em)
+            return executar_plano(plano, self.injetor, config.cadencia, cancelar=cancelar,
+                                  contexto=contexto, ao_enviar=ao_enviar)
+
+        if config.loop:
+            if not self.loop_started:
+                self.loop_started = True  # Antes de enfileirar: o loop pode desligá-lo assim que começa
+                if not self.trabalhador.enviar(loop, chave="loop"):
+                    self.loop_started = False  # Recusado (fila cheia): a próxima pressão tenta de novo
+        else:
+            plano = self.plano_unico
+            ao_enviar = self._progresso(len(plano))
+            self.trabalhador.enviar(envio, chave="envio")
+
+    def reproduzir(self, linha, velocidade=1.0):
+        """
+        Enfileira a reprodução de uma gravação (gravador.LinhaDoTempo) na thread de
+        envio, então ela nunca se mistura com o envio de mensagens. Usa o teclado
+        das hotkeys e é interrompida por parar(). Retorna False se não há execução ativa.
+        """
+        if not self.running or self.hotkeys is None:
+            return False
+        teclado, cancelar = self.hotkeys.teclado, self.cancelar
+
+        def tarefa():
+            with self.trava_injecao:
+                completa, self.erros_reproducao = reproduzir(linha, teclado, velocidade, cancelar=cancelar)
+            return completa
+        return self.trabalhador.enviar(tarefa, chave="reproduzir")
+
+    def definir_sequencia(self, nome, config):
+        """
+        Cria ou troca uma sequência nomeada, com mensagens, cadência e intervalo
+        próprios. A tecla de envio da config inicia/para a sequência.
+        """
+        self.sequenciador.definir(nome, config)
+        if self.hotkeys is not None:
+            self.hotkeys.aplicar({f"sequencia:{nome}": (config.tecla_envio, lambda: self.sequenciador.alternar(nome))})
+
+    def remover_sequencia(self, nome):
+        self.sequenciador.remover(nome)
+        if self.hotkeys is not None:
+            self.hotkeys.remover(f"sequencia:{nome}")
+
+    def loop_mensagens(self, plano, config, cancelar):
+        """
+        Loop: envia as mensagens com a cadência e espera o intervalo para repetir.
+        Os tempos seguem prazos absolutos (AgendadorDeadline), então o tempo gasto
+        digitando não se soma à cadência nem ao intervalo.
+        'cancelar' (threading.Event) acorda qualquer espera e interrompe o envio entre teclas.
+        A cada ciclo o loop relê o snapshot atual, para seguir as mudanças feitas por atualizar().
+        Com o diário, cada mensagem enviada é anotada; com uma retomada, o loop
+        espera o prazo que faltava e continua do ciclo e da mensagem anotados.
+        """
+        agendador = AgendadorDeadline(config.cadencia, config.intervalo, dormir=cancelar.wait)
+        anterior, self.agendador = self.agendador, agendador
+        if anterior is not None:
+            self._despertares_loops += anterior.despertares
+        injetor, metricas, contexto, diario = self.injetor, self.metricas, self.contexto, self.diario
+        dinamico, total = plano.dinamico, len(plano)
+        publicar = self.eventos.publicar if self.eventos is not None else None
+        retomada, self.retomada = self.retomada, None
+        pular = 0  # Mensagens do primeiro ciclo já enviadas antes da interrupção
+        if diario is not None:
+            # Cópia rasa: asdict() copiaria as mensagens na thread de envio
+            diario.iniciar({campo.name: getattr(config, campo.name) for campo in fields(config)}, total,
+                           retomada.registro if retomada else None)
+        if retomada is not None:
+            pular, contexto.contador = retomada.mensagem, retomada.contador
+            if retomada.espera > 0 and cancelar.wait(retomada.espera):
+                return
+        agendador.iniciar()
+        if retomada is not None:
+            agendador.ciclos = retomada.ciclos
+        inicio_ciclo = agendador.inicio
+        while True:
+            if self.config is not config and not cancelar.is_set():
+                config = self.config
+                agendador.cadencia, agendador.intervalo = config.cadencia, config.intervalo
+            if not config.loop or (config.ciclos and agendador.ciclos >= config.ciclos):
+                self.loop_started = False  # Loop desligado: a próxima pressão decide de novo
+                if diario is not None:
+                    diario.concluir()
+                break
+            contexto.ciclo = agendador.ciclos + 1
+            if publicar is not None:
+                publicar(CICLO, contexto.ciclo)
+            mensagens = plano.renderizar(contexto, pular) if dinamico else plano.mensagens[pular:]
+            for numero, passos in enumerate(mensagens, pular + 1):
+                if not injetor.executar(passos, cancelar):
+                    break
+                if diario is not None:
+                    diario.mensagem(contexto.ciclo, numero, contexto.contador)
+                if publicar is not None:
+                    publicar(MENSAGEM, (numero, total))
+                if not agendador.proxima_mensagem():
+                    break
+            if cancelar.is_set():
+                break
+            pular = 0
+            if publicar is not None:
+                publicar(PROXIMO, agendador.prazo + agendador.intervalo)  # Contagem regressiva na interface
+            if not agendador.proximo_ciclo():
+                break
+            if publicar is not None:
+                publicar(PROXIMO, None)
+            fim_ciclo = agendador.relogio()
+            metricas.ciclo(len(plano) * agendador.cadencia + agendador.intervalo, fim_ciclo - inicio_ciclo)
+            inicio_ciclo = fim_ciclo
+        metricas.loop = agendador.estatisticas()
+
+    def parar(self, timeout=1.0):
+        """
+        Para a execução: o envio em andamento para entre duas teclas, as esperas
+        do loop acordam na hora e envios ainda na fila são descartados.
+        Remove só as hotkeys de envio e de parada; a de ativação continua registrada.
+        As sequências nomeadas também param (as hotkeys delas continuam).
+        """
+        self.sequenciador.parar_todas()
+        if not self.running:
+            return False
+        self.running = False
+        self.cancelar.set()
+        self.trabalhador.descartar_pendentes()
+        if self.hotkeys is not None:
+            self.hotkeys.aplicar({"enviar": None, "parar": None})
+        self.loop_started = False
+        if self.diario is not None:
+            self.diario.concluir()  # Parada pelo usuário: não é oferecida para retomar
+        self._publicar(PROXIMO, None)
+        self._publicar(ESTADO, False)
+
+        # A thread de envio volta a ficar ociosa em milissegundos (não é recriada)
+        if not self.trabalhador.aguardar_ocioso(timeout=timeout):
+            print("Aviso: o envio não terminou após a parada.")
+
+        self.metricas.encerrar()
+        if self.pasta_metricas:
+            try:
+                caminho_json, _ = self.metricas.exportar(self.pasta_metricas)
+                print(f"Métricas da execução salvas em {caminho_json}")
+            except OSError as e:
+                print(f"Erro ao salvar as métricas: {e}")
+        return True
+
+    def aguardar(self, timeout=None):
+        """Espera os envios enfileirados terminarem (útil sem hotkeys)."""
+        return self.trabalhador.aguardar_ocioso(timeout)
+
+    def despertares(self):
+        """
+        Total de vezes que as threads do motor acordaram (envio, esperas do loop,
+        sequências, hotkeys, diário). Parado ou esperando o intervalo, não cresce.
+        """
+        total = self.trabalhador.despertares + self.sequenciador.despertares + self._despertares_loops
+        if self.agendador is not None:
+            total += self.agendador.despertares
+        if self.hotkeys is not None:
+            total += self.hotkeys.gancho.despertares
+        if self.diario is not None:
+            total += self.diario.despertares
+        return total
+
+    def estatisticas(self):
+        """Estatísticas da thread de envio e do último loop."""
+        dados = {"envio": self.trabalhador.estatisticas()}
+        if self.metricas is not None:
+            dados["execucao"] = self.metricas.resumo()
+        if self.agendador is not None:
+            dados["loop"] = self.agendador.estatisticas()
+        if self.erros_reproducao is not None:
+            dados["reproducao"] = self.erros_reproducao.resumo()
+        if self.sequenciador.nomes():
+            dados["sequencias"] = self.sequenciador.estatisticas()
+        return dados
+
+    def encerrar(self):
+        """
+        Para a execução, remove as hotkeys e finaliza as threads de envio.
+        O diário é fechado antes de parar: um loop ativo fica retomável na próxima abertura.
+        """
+        if self.diario is not None:
+            self.diario.fechar()
+        self.parar()
+        if self.hotkeys is not None:
+            self.hotkeys.limpar()
+        self.sequenciador.encerrar()
+        self.trabalhador.encerrar()
+
+
+def ler_mensagens(caminho):
+    """Lê as mensagens ativas de um arquivo de texto (uma por linha), CSV ou JSONL (ver importacao)."""
+    return tuple(texto for texto, ativo in ler_arquivo(caminho) if ativo)
+
+
+def iniciar_perfilamento(motor, pasta):
+    """Liga o perfilamento pedido por --perfilar (pasta None = desligado, "" = pasta padrão)."""
+    if pasta is None:
+        return None
+    perfilador = Perfilador(pasta or None)
+    motor.definir_perfilador(perfilador)
+    perfilador.iniciar()
+    return perfilador
+
+
+def encerrar_perfilamento(perfilador):
+    if perfilador is None:
+        return
+    try:
+        print(f"Resumo do perfilamento: {perfilador.encerrar()}")
+    except OSError as e:
+        print(f"Erro ao gravar o perfilamento: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Macro de mensagens sem interface gráfica")
+    parser.add_argument("mensagens", nargs="?", help="arquivo de mensagens (.txt com uma por linha, .csv ou .jsonl)")
+    parser.add_argument("--tecla", default="", help="hotkey de envio (ex.: f8)")
+    parser.add_argument("--parar", default="esc", help="hotkey de parada (padrão: esc)")
+    parser.add_argument("--iniciar", default="f12", help="hotkey de ativação (padrão: f12)")
+    parser.add_argument("--cadencia", default="0.5", help="segundos entre mensagens")
+    parser.add_argument("--loop", action="store_true", help="repete as mensagens em loop")
+    parser.add_argument("--intervalo", default=str(INTERVALO_PADRAO), help="segundos entre execuções do loop")
+    parser.add_argument("--ciclos", type=int, default=0, help="limite de ciclos do loop (0 = sem limite)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=BACKEND_PADRAO)
+    parser.add_argument("--modo", choices=MODOS_ENVIO, default=MODO_DIGITAR,
+                        help="digitar as mensagens, colar pela área de transferência ou decidir por mensagem")
+    parser.add_argument("--teclas-por-segundo", default="0", help="limite de teclas por segundo (0 = sem limite)")
+    parser.add_argument("--rajada", type=int, default=RAJADA_PADRAO,
+                        help="teclas seguidas permitidas pelo limite de taxa")
+    parser.add_argument("--politica", choices=POLITICAS, default=COALESCER,
+                        help="o que fazer com pressões repetidas durante um envio")
+    parser.add_argument("--metricas", metavar="PASTA",
+                        help="exporta as métricas da execução (JSON/CSV) nesta pasta ao parar")
+    parser.add_argument("--agora", action="store_true",
+                        help="envia imediatamente, sem hotkeys, e sai ao terminar")
+    parser.add_argument("--sequencia", nargs="+", action="append", default=[],
+                        metavar="TECLA ARQUIVO [CADENCIA [INTERVALO]]",
+                        help="sequência extra com hotkey, cadência e intervalo próprios (pode repetir)")
+    parser.add_argument("--perfilar", nargs="?", const="", metavar="PASTA",
+                        help="grava cProfile, snapshot de memória e um resumo ao sair (pasta opcional)")
+    parser.add_argument("--diario", nargs="?", const="", metavar="ARQUIVO",
+                        help="anota o progresso do loop para retomar depois de uma queda (arquivo opcional)")
+    parser.add_argument("--retomar", action="store_true",
+                        help="continua a execução interrompida anotada no diário (mensagens e configuração dele)")
+    args = parser.parse_args(argv)
+    if not args.mensagens and not args.sequencia and not args.retomar:
+        parser.error("informe o arquivo de mensagens, --sequencia ou --retomar")
+    retomada = None
+    if args.retomar:
+        args.diario = args.diario or ""
+        retomada = ler_retomada(args.diario or None)
+        if retomada is None:
+            parser.error("não há execução interrompida no diário")
+
+    config = ConfigExecucao(
+        mensagens=ler_mensagens(args.mensagens) if args.mensagens else (),
+        tecla_envio=args.tecla.strip().lower(),
+        tecla_parada=args.parar.strip().lower(),
+        cadencia=ler_cadencia(args.cadencia),
+        loop=args.loop,
+        intervalo=ler_intervalo(args.intervalo),
+        ciclos=args.ciclos,
+        backend=args.backend,
+        modo_envio=args.modo,
+        teclas_por_segundo=ler_taxa(args.teclas_por_segundo),
+        rajada=args.rajada,
+    )
+    if retomada is not None:
+        config = config_de_dict(retomada.config)
+        if args.tecla:
+            config = replace(config, tecla_envio=args.tecla.strip().lower())
+        print(f"Retomando do ciclo {retomada.ciclos + 1}, mensagem {retomada.mensagem + 1} "
+              f"(próximo envio em {retomada.espera:.1f}s)")
+
+    sequencias = {}
+    for valores in args.sequencia:
+        if not 2 <= len(valores) <= 4:
+            parser.error("--sequencia espera TECLA ARQUIVO [CADENCIA [INTERVALO]]")
+        tecla, arquivo = valores[0].strip().lower(), valores[1]
+        sequencias[f"{tecla} {arquivo}"] = replace(
+            config,
+            mensagens=ler_mensagens(arquivo),
+            tecla_envio=tecla,
+            cadencia=ler_cadencia(valores[2]) if len(valores) > 2 else config.cadencia,
+            intervalo=ler_intervalo(valores[3]) if len(valores) > 3 else config.intervalo,
+        )
+
+    if args.agora:
+        if config.loop and not config.ciclos:
+            parser.error("--agora com --loop precisa de --ciclos")
+        motor = MotorMacro(politica=args.politica)
+        motor.pasta_metricas = args.metricas
+        if args.diario is not None:
+            motor.diario = DiarioExecucao(args.diario or None)
+        perfilador = iniciar_perfilamento(motor, args.perfilar)
+        for nome, config_sequencia in sequencias.items():
+            motor.definir_sequencia(nome, config_sequencia)
+            motor.sequenciador.iniciar(nome)
+        if config.mensagens:
+            motor.iniciar(config, retomada=retomada)
+            motor.acionar()
+            motor.aguardar()
+        motor.sequenciador.aguardar()
+        motor.encerrar()
+        encerrar_perfilamento(perfilador)
+        print(json.dumps(motor.estatisticas(), indent=2))
+        return
+
+    if config.mensagens and not config.tecla_envio:
+        parser.error("informe --tecla (ou use --agora)")
+
+    import keyboard
+    motor = MotorMacro(teclado=keyboard, politica=args.politica)
+    motor.pasta_metricas = args.metricas
+    if args.diario is not None:
+        motor.diario = DiarioExecucao(args.diario or None)
+    perfilador = iniciar_perfilamento(motor, args.perfilar)
+    for nome, config_sequencia in sequencias.items():
+        motor.definir_sequencia(nome, config_sequencia)
+        print(f"Sequência '{nome}': {config_sequencia.tecla_envio} inicia/para.")
+    if not config.mensagens:
+        print(f"{config.tecla_parada} para todas as sequências (Ctrl+C sai).")
+        motor.hotkeys.definir("parar", config.tecla_parada, motor.parar)
+        try:
+            keyboard.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            motor.encerrar()
+            encerrar_perfilamento(perfilador)
+        return
+
+    def ativar():
+        nonlocal retomada
+        motor.iniciar(config, retomada=retomada)
+        retomada = None  # Só a primeira ativação retoma
+
+    motor.hotkeys.definir("iniciar", args.iniciar, ativar)
+    print(f"Pressione {args.iniciar} para ativar, {config.tecla_envio} para enviar, "
+          f"{config.tecla_parada} para parar (Ctrl+C sai).")
+    try:
+        keyboard.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        motor.encerrar()
+        encerrar_perfilamento(perfilador)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Perfilamento opcional de uma execução (cProfile + tracemalloc).
+
+Desligado, não custa nada: as threads de envio só conferem um atributo None
+entre uma tarefa e outra. Ligado, cada thread da macro (Tk ou linha de
+comando, envio, sequências) tem o seu cProfile, ativo só enquanto ela
+trabalha, e o tracemalloc acompanha as alocações. No Python 3.12+ o cProfile
+usa sys.monitoring, que vale para o interpretador inteiro e só admite um
+perfil ligado: aí um único cProfile, ligado na thread do Tk, cobre todas as threads. O cProfile de uma thread de
+envio só é ligado no começo de uma tarefa: ligar o perfilamento com um loop
+já rodando perfila a partir do próximo envio (ou da próxima vez que o loop
+for iniciado), não o loop em andamento. Ao desligar, grava na pasta de
+perfilamento, com o mesmo carimbo de data/hora:
+    perfil-AAAAMMDD-HHMMSS.prof      estatísticas do cProfile (pstats / snakeviz)
+    memoria-AAAAMMDD-HHMMSS.snapshot snapshot do tracemalloc
+    resumo-AAAAMMDD-HHMMSS.txt       funções mais pesadas e linhas que mais alocaram
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+from carregamento import pasta_cache
+
+HOTKEY_PERFIL = "ctrl+shift+p"  # Liga/desliga o perfilamento
+PROFUNDIDADE_MEMORIA = 10  # Quadros guardados por alocação no tracemalloc
+LINHAS_RESUMO = 15
+PERFIL_UNICO = sys.version_info >= (3, 12)  # Um cProfile para todas as threads (sys.monitoring)
+
+
+def pasta_perfilamento():
+    return os.path.join(pasta_cache(), "perfilamento")
+
+
+class Perfilador:
+    """
+    Liga/desliga o perfilamento. iniciar() e encerrar() devem ser chamados na
+    thread do Tk (que é perfilada o tempo todo); as outras threads passam o
+    trabalho por executar(), que liga o cProfile delas só durante a tarefa.
+    """
+
+    def __init__(self, pasta=None):
+        self.pasta = pasta or pasta_perfilamento()
+        self.ativo = False
+        self._perfis = {}  # ident da thread -> (nome da thread, cProfile.Profile)
+        self._nomes = set()  # Threads que passaram por executar() com PERFIL_UNICO
+        self._trava = threading.Lock()
+        self._memoria_inicial = None
+        self._perfil_principal = None
+
+    def _perfil_da_thread(self):
+        ident = threading.get_ident()
+        with self._trava:
+            if ident not in self._perfis:
+                self._perfis[ident] = (threading.current_thread().name, cProfile.Profile())
+            return self._perfis[ident][1]
+
+    def iniciar(self):
+        if self.ativo:
+            return
+        self._perfis = {}
+        self._nomes = set()
+        tracemalloc.start(PROFUNDIDADE_MEMORIA)
+        self._memoria_inicial = tracemalloc.take_snapshot()
+        self._perfil_principal = self._perfil_da_thread()
+        self.ativo = True
+        self._perfil_principal.enable()
+
+    def executar(self, tarefa, *args):
+        """Roda a tarefa com o cProfile da thread atual ligado (chamar só com self.ativo)."""
+        if PERFIL_UNICO:
+            self._nomes.add(threading.current_thread().name)  # O perfil da thread do Tk já a cobre
+            return tarefa(*args)
+        perfil = self._perfil_da_thread()
+        if perfil is self._perfil_principal:
+            return tarefa(*args)  # Thread do Tk: o perfil dela já está ligado
+        perfil.enable()
+        try:
+            return tarefa(*args)
+        finally:
+            perfil.disable()
+
+    def encerrar(self):
+        """
+        Desliga e grava os arquivos. Chamar com as threads de envio ociosas
+        (ex.: depois de motor.parar()). Retorna o caminho do resumo, ou None.
+        """
+        if not self.ativo:
+            return None
+        self.ativo = False
+        self._perfil_principal.disable()
+        memoria = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        os.makedirs(self.pasta, exist_ok=True)
+        carimbo = time.strftime("%Y%m%d-%H%M%S")
+        caminho_perfil = os.path.join(self.pasta, f"perfil-{carimbo}.prof")
+        caminho_memoria = os.path.join(self.pasta, f"memoria-{carimbo}.snapshot")
+        caminho_resumo = os.path.join(self.pasta, f"resumo-{carimbo}.txt")
+
+        with self._trava:
+            perfis = list(self._perfis.values())
+        estatisticas = pstats.Stats()
+        for _, perfil in perfis:
+            perfil.create_stats()  # Desliga e junta o que foi coletado em perfil.stats
+            if perfil.stats:  # O pstats recusa perfis vazios (thread que não chegou a rodar nada)
+                estatisticas.add(perfil)
+        nomes = [nome for nome, _ in perfis] + sorted(self._nomes - {nome for nome, _ in perfis})
+        estatisticas.dump_stats(caminho_perfil)
+        memoria.dump(caminho_memoria)
+
+        texto = io.StringIO()
+        texto.write(f"Threads perfiladas: {', '.join(nomes)}\n\n")
+        texto.write(f"Funções com maior tempo acumulado (top {LINHAS_RESUMO}):\n")
+        estatisticas.stream = texto
+        estatisticas.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(LINHAS_RESUMO)
+        texto.write(f"Linhas que mais alocaram memória durante o perfilamento (top {LINHAS_RESUMO}):\n")
+        filtros = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diferencas = memoria.filter_traces(filtros).compare_to(
+            self._memoria_inicial.filter_traces(filtros), "lineno")
+        for diferenca in diferencas[:LINHAS_RESUMO]:
+            texto.write(f"  {diferenca}\n")
+        with open(caminho_resumo, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto.getvalue())
+        self._perfis = {}
+        self._nomes = set()
+        self._memoria_inicial = self._perfil_principal = None
+        return caminho_resumo
@@ -0,0 +1,258 @@
+"""
+Perfis nomeados (mensagens + configurações) salvos em disco.
+
+Cada perfil tem um arquivo base compacto (JSON) e um log de mudanças (JSONL)
+ao qual as edições são acrescentadas. Um índice guarda os nomes, então listar
+e trocar de perfil não lê os outros arquivos. O salvamento automático junta as
+edições e grava numa thread própria depois de um tempo sem mudanças; o log é
+compactado no arquivo base quando cresce.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from carregamento import pasta_dados
+from lista import ADICIONAR, ATIVO, ATIVOS, ESTENDER, REMOVER, TEXTO
+
+# Operações do log de mudanças: as do ModeloMensagens (TEXTO, ATIVO, ADICIONAR,
+# REMOVER, ESTENDER, ATIVOS) e mais esta, para as configurações da tela
+CONFIG = "c"  # ["c", {campo: valor}]
+
+PERFIL_PADRAO = "Padrão"  # Criado na primeira execução
+LIMITE_LOG = 256 * 1024  # Bytes de log (ou o tamanho da base, se maior) antes de compactar
+
+
+def pasta_perfis():
+    """Pasta padrão dos perfis (nos dados do usuário, fora do cache)."""
+    return os.path.join(pasta_dados(), "perfis")
+
+
+def _gravar_atomico(caminho, conteudo):
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)
+
+
+def aplicar_mudancas(dados, mudancas):
+    """Aplica operações do log a um perfil carregado (dict com textos/ativos/config)."""
+    textos, ativos, config = dados["textos"], dados["ativos"], dados["config"]
+    for op in mudancas:
+        tipo = op[0]
+        if tipo == TEXTO:
+            textos[op[1]] = op[2]
+        elif tipo == ATIVO:
+            ativos[op[1]] = op[2]
+        elif tipo == ADICIONAR:
+            textos.append(op[1])
+            ativos.append(op[2])
+        elif tipo == REMOVER:
+            del textos[op[1]]
+            del ativos[op[1]]
+        elif tipo == ESTENDER:
+            textos.extend(op[1])
+            ativos.extend(c == "1" for c in op[2])
+        elif tipo == ATIVOS:
+            ativos[:] = bytearray(c == "1" for c in op[1])
+        elif tipo == CONFIG:
+            config.update(op[1])
+    return dados
+
+
+class ArmazemPerfis:
+    """Perfis em disco: um arquivo base + um log por perfil, e um índice com os nomes."""
+
+    def __init__(self, pasta=None):
+        self.pasta = pasta or pasta_perfis()
+        os.makedirs(self.pasta, exist_ok=True)
+        self._trava = threading.Lock()
+        self._caminho_indice = os.path.join(self.pasta, "indice.json")
+        try:
+            with open(self._caminho_indice, encoding="utf-8") as arquivo:
+                self.indice = json.load(arquivo)
+        except (OSError, ValueError):
+            self.indice = {"perfis": {}, "ultimo": None}
+
+    def _salvar_indice(self):
+        _gravar_atomico(self._caminho_indice, json.dumps(self.indice, ensure_ascii=False, separators=(",", ":")))
+
+    def _caminhos(self, nome):
+        arquivo = self.indice["perfis"][nome]
+        base = os.path.join(self.pasta, arquivo)
+        return base + ".json", base + ".log"
+
+    def nomes(self):
+        return sorted(self.indice["perfis"])
+
+    @property
+    def ultimo(self):
+        return self.indice.get("ultimo")
+
+    def existe(self, nome):
+        return nome in self.indice["perfis"]
+
+    def salvar(self, nome, dados):
+        """Grava o perfil inteiro (cria se não existir), zera o log e o marca como o último usado."""
+        with self._trava:
+            if nome not in self.indice["perfis"] or self.indice.get("ultimo") != nome:
+                self.indice["perfis"].setdefault(nome, hashlib.sha1(nome.encode("utf-8")).hexdigest()[:12])
+                self.indice["ultimo"] = nome
+                self._salvar_indice()
+            self._gravar_base(nome, dados)
+
+    def _gravar_base(self, nome, dados):
+        caminho_base, caminho_log = self._caminhos(nome)
+        compacto = {
+            "config": dados["config"],
+            "textos": dados["textos"],
+            "ativos": "".join("1" if ativo else "0" for ativo in dados["ativos"]),
+        }
+        _gravar_atomico(caminho_base, json.dumps(compacto, ensure_ascii=False, separators=(",", ":")))
+        if os.path.exists(caminho_log):
+            os.remove(caminho_log)
+
+    def carregar(self, nome):
+        """Lê o perfil (base + log). Retorna dict com 'config', 'textos' e 'ativos' (bytearray)."""
+        with self._trava:
+            dados = self._ler(nome)
+            if self.indice.get("ultimo") != nome:
+                self.indice["ultimo"] = nome
+                self._salvar_indice()
+        return dados
+
+    def _ler(self, nome):
+        caminho_base, caminho_log = self._caminhos(nome)
+        with open(caminho_base, encoding="utf-8") as arquivo:
+            compacto = json.load(arquivo)
+        dados = {
+            "config": compacto["config"],
+            "textos": compacto["textos"],
+            "ativos": bytearray(c == "1" for c in compacto["ativos"]),
+        }
+        if os.path.exists(caminho_log):
+            with open(caminho_log, encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    if not linha.strip():
+                        continue
+                    try:
+                        op = json.loads(linha)
+                    except ValueError:
+                        break  # Última linha incompleta (gravação interrompida)
+                    aplicar_mudancas(dados, (op,))
+        return dados
+
+    def registrar_mudancas(self, nome, mudancas):
+        """Acrescenta operações ao log do perfil; compacta quando o log fica grande."""
+        with self._trava:
+            if nome not in self.indice["perfis"]:
+                return
+            caminho_base, caminho_log = self._caminhos(nome)
+            with open(caminho_log, "a", encoding="utf-8") as arquivo:
+                arquivo.write("".join(json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n"
+                                      for op in mudancas))
+            # Compacta quando o log passa do tamanho da base: o custo fica amortizado
+            if os.path.getsize(caminho_log) > max(LIMITE_LOG, os.path.getsize(caminho_base)):
+                self._gravar_base(nome, self._ler(nome))
+
+    def excluir(self, nome):
+        with self._trava:
+            if nome not in self.indice["perfis"]:
+                return
+            for caminho in self._caminhos(nome):
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+            del self.indice["perfis"][nome]
+            if self.indice.get("ultimo") == nome:
+                self.indice["ultimo"] = None
+            self._salvar_indice()
+
+
+class AutoSalvar:
+    """
+    Salvamento automático com debounce, numa thread própria.
+    registrar() só acrescenta a operação numa lista (seguro para a thread do Tk);
+    depois de 'atraso' segundos sem novas mudanças, a thread grava tudo no log
+    do perfil atual. Edições seguidas do mesmo texto viram uma única operação.
+    """
+
+    def __init__(self, armazem, atraso=1.0):
+        self.armazem = armazem
+        self.atraso = atraso
+        self.nome = None
+        self._pendentes = []
+        self._ultima_mudanca = 0.0
+        self._encerrando = False
+        self._condicao = threading.Condition()
+        self._gravando = False
+        self.despertares = 0  # Vezes que a thread acordou (mudanças e fim de cada debounce)
+        self._thread = threading.Thread(target=self._executar, name="macro-autosalvar", daemon=True)
+        self._thread.start()
+
+    def perfil(self, nome):
+        """Troca o perfil que recebe as mudanças (as pendentes do anterior são gravadas antes)."""
+        self.descarregar()
+        with self._condicao:
+            self.nome = nome
+
+    def registrar(self, op):
+        """Anota uma mudança do perfil atual (ignorada se não houver perfil)."""
+        with self._condicao:
+            if self.nome is None:
+                return
+            pendentes = self._pendentes
+            anterior = pendentes[-1] if pendentes else None
+            if anterior and op[0] == TEXTO and anterior[0] == TEXTO and anterior[1] == op[1]:
+                pendentes[-1] = op  # Mesmo texto sendo digitado: só a versão final importa
+            elif anterior and op[0] == CONFIG and anterior[0] == CONFIG:
+                pendentes[-1] = (CONFIG, {**anterior[1], **op[1]})
+            elif anterior and op[0] == ATIVOS and anterior[0] == ATIVOS:
+                pendentes[-1] = op  # O estado mais recente de todos os checkboxes já inclui o anterior
+            else:
+                pendentes.append(op)
+            self._ultima_mudanca = time.monotonic()
+            self._condicao.notify()
+
+    def _executar(self):
+        while True:
+            with self._condicao:
+                while not self._pendentes and not self._encerrando:
+                    self._condicao.wait()
+                    self.despertares += 1
+                # Debounce: espera até passar 'atraso' sem mudanças novas
+                while self._pendentes and not self._encerrando:
+                    restante = self._ultima_mudanca + self.atraso - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._condicao.wait(restante)
+                    self.despertares += 1
+                if not self._pendentes and self._encerrando:
+                    return
+                mudancas, self._pendentes = self._pendentes, []
+                nome = self.nome
+                self._gravando = True
+            try:
+                self.armazem.registrar_mudancas(nome, mudancas)
+            except OSError as e:
+                print(f"Erro ao salvar o perfil '{nome}': {e}")
+            finally:
+                with self._condicao:
+                    self._gravando = False
+                    self._condicao.notify_all()
+
+    def descarregar(self, timeout=5.0):
+        """Grava agora as mudanças pendentes e espera a gravação terminar."""
+        with self._condicao:
+            if not self._pendentes and not self._gravando:
+                return True
+            self._ultima_mudanca = 0.0  # Fura o debounce
+            self._condicao.notify_all()
+            return self._condicao.wait_for(lambda: not self._pendentes and not self._gravando, timeout)
+
+    def encerrar(self):
+        """Grava o que falta e finaliza a thread."""
+        with self._condicao:
+            self._encerrando = True
+            self._condicao.notify_all()
+        self._thread.join(5.0)
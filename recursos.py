@@ -0,0 +1,102 @@
+"""
+Uso de recursos do processo: CPU, threads, memória residente e despertares.
+
+Cada relatório compara a amostra atual com a do relatório anterior: a CPU (%)
+e os despertares por minuto valem para esse intervalo. Os despertares vêm de
+contadores que as threads da macro já mantêm (ver MotorMacro.despertares):
+com a macro parada ou esperando o intervalo do loop, não devem crescer.
+Nada aqui roda por tempo; só amostra quando um relatório é pedido.
+"""
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+
+def memoria_residente():
+    """Memória residente (RSS) do processo em bytes, ou None se o sistema não informa."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class Contadores(ctypes.Structure):  # PROCESS_MEMORY_COUNTERS
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (campo, ctypes.c_size_t) for campo in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        contadores = Contadores()
+        contadores.cb = ctypes.sizeof(contadores)
+        processo = ctypes.windll.kernel32.GetCurrentProcess
+        processo.restype = wintypes.HANDLE
+        if ctypes.windll.psapi.GetProcessMemoryInfo(processo(), ctypes.byref(contadores), contadores.cb):
+            return contadores.WorkingSetSize
+        return None
+    try:
+        with open("/proc/self/statm", encoding="ascii") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Sem /proc (ex.: macOS): só o pico
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+@dataclass(frozen=True)
+class AmostraRecursos:
+    instante: float  # time.monotonic()
+    cpu: float  # Segundos de CPU do processo (todas as threads)
+    threads: int
+    rss: int  # Bytes (None se indisponível)
+    despertares: int
+
+
+class MonitorRecursos:
+    """
+    Relatórios de uso de recursos sob demanda.
+    contar_despertares: função sem argumentos que devolve o total acumulado de
+    despertares (ex.: MotorMacro.despertares).
+    """
+
+    def __init__(self, contar_despertares=lambda: 0):
+        self.contar_despertares = contar_despertares
+        self.inicial = self.anterior = self.amostrar()
+
+    def amostrar(self):
+        return AmostraRecursos(time.monotonic(), time.process_time(), threading.active_count(),
+                               memoria_residente(), self.contar_despertares())
+
+    def relatorio(self):
+        """Recursos agora e desde o relatório anterior (ou desde a criação do monitor)."""
+        atual, anterior = self.amostrar(), self.anterior
+        self.anterior = atual
+        duracao = max(atual.instante - anterior.instante, 1e-9)
+        return {
+            "cpu_segundos": atual.cpu,
+            "cpu_percentual": (atual.cpu - anterior.cpu) / duracao * 100,
+            "threads": atual.threads,
+            "nomes_threads": sorted(thread.name for thread in threading.enumerate()),
+            "rss_mb": atual.rss / 2 ** 20 if atual.rss is not None else None,
+            "rss_variacao_mb": (atual.rss - self.inicial.rss) / 2 ** 20 if atual.rss is not None else None,
+            "despertares": atual.despertares,
+            "despertares_por_minuto": (atual.despertares - anterior.despertares) / duracao * 60,
+            "intervalo_segundos": duracao,
+        }
+
+
+def formatar(relatorio):
+    """Texto do relatório para a interface e o console."""
+    rss = (f"{relatorio['rss_mb']:.1f} MB ({relatorio['rss_variacao_mb']:+.1f} MB desde a abertura)"
+           if relatorio["rss_mb"] is not None else "indisponível")
+    return (
+        f"CPU: {relatorio['cpu_segundos']:.2f} s no total, {relatorio['cpu_percentual']:.1f}% "
+        f"nos últimos {relatorio['intervalo_segundos']:.0f} s\n"
+        f"Threads: {relatorio['threads']} ({', '.join(relatorio['nomes_threads'])})\n"
+        f"Memória residente: {rss}\n"
+        f"Despertares: {relatorio['despertares_por_minuto']:.1f}/min nos últimos "
+        f"{relatorio['intervalo_segundos']:.0f} s ({relatorio['despertares']} no total)"
+    )
@@ -0,0 +1,230 @@
+"""
+Várias sequências de mensagens independentes numa única thread.
+
+Cada sequência (nome + ConfigExecucao com mensagens, cadência, intervalo e
+hotkey próprias) tem um prazo absoluto para a próxima mensagem. Os prazos de
+todas ficam num heap; a thread do sequenciador dorme até o mais próximo,
+injeta aquela mensagem e agenda a seguinte. Acrescentar sequências não cria
+threads nem despertares extras, e as mensagens nunca se intercalam: a thread
+é uma só e a injeção passa pela mesma trava do motor.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+from agendador import Estatisticas
+from envio import BackendLimitado, LimitadorTaxa, compilar_plano, criar_backend
+from modelos import ContextoEnvio
+
+
+class _Estado:
+    """Estado de uma sequência dentro do sequenciador."""
+
+    __slots__ = ("config", "plano", "contexto", "cancelar", "limitador", "geracao", "ativa",
+                 "indice", "ciclos", "mensagens", "atrasados", "jitter")
+
+    def __init__(self, config):
+        self.config = config
+        self.plano = compilar_plano(config.mensagens, modo=config.modo_envio)
+        self.contexto = None
+        self.cancelar = threading.Event()
+        self.limitador = None  # LimitadorTaxa, se a config tem limite de teclas por segundo
+        self.geracao = 0  # Muda a cada início/parada: entradas antigas do heap são ignoradas
+        self.ativa = False
+        self.indice = 0
+        self.ciclos = 0
+        self.mensagens = 0
+        self.atrasados = 0
+        self.jitter = Estatisticas()
+
+
+class Sequenciador:
+    """
+    Agenda e injeta as mensagens de todas as sequências.
+    trava: trava compartilhada com o resto do motor (uma mensagem por vez).
+    A thread só é criada quando a primeira sequência começa.
+    """
+
+    def __init__(self, trava=None, relogio=time.monotonic):
+        self.trava = trava or threading.Lock()
+        self.relogio = relogio
+        self.despertares = 0  # Vezes que a thread acordou (para conferir que não cresce com as sequências)
+        self.perfilador = None  # perfilamento.Perfilador, se o perfilamento foi habilitado
+        self._estados = {}
+        self._backends = {}
+        self._heap = []  # (prazo, desempate, nome, geracao)
+        self._ordem = itertools.count()
+        self._condicao = threading.Condition()
+        self._encerrando = False
+        self._thread = None
+
+    def definir(self, nome, config):
+        """Cria ou troca a sequência 'nome' (se estava ativa, ela para)."""
+        with self._condicao:
+            self._parar(nome)
+            self._estados[nome] = _Estado(config)
+
+    def remover(self, nome):
+        with self._condicao:
+            self._parar(nome)
+            self._estados.pop(nome, None)
+
+    def nomes(self):
+        return list(self._estados)
+
+    def ativa(self, nome):
+        estado = self._estados.get(nome)
+        return estado is not None and estado.ativa
+
+    def iniciar(self, nome):
+        """Começa a sequência agora (do início). Retorna False se ela não existe ou está vazia."""
+        with self._condicao:
+            estado = self._estados.get(nome)
+            if estado is None or not estado.plano:
+                return False
+            self._parar(nome)
+            estado.ativa = True
+            estado.indice = estado.ciclos = 0
+            estado.contexto = ContextoEnvio()
+            estado.cancelar = threading.Event()
+            if estado.config.teclas_por_segundo > 0:
+                estado.limitador = LimitadorTaxa(estado.config.teclas_por_segundo, estado.config.rajada)
+            self._agendar(nome, estado, self.relogio())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name="macro-sequencias", daemon=True)
+                self._thread.start()
+            return True
+
+    def parar(self, nome):
+        with self._condicao:
+            return self._parar(nome)
+
+    def alternar(self, nome):
+        """Callback da hotkey da sequência: inicia se parada, para se ativa."""
+        if self.ativa(nome):
+            self.parar(nome)
+        else:
+            self.iniciar(nome)
+
+    def parar_todas(self):
+        with self._condicao:
+            for nome in self._estados:
+                self._parar(nome)
+
+    def _parar(self, nome):
+        estado = self._estados.get(nome)
+        if estado is None or not estado.ativa:
+            return False
+        estado.ativa = False
+        estado.geracao += 1
+        estado.cancelar.set()  # Interrompe a mensagem em andamento entre duas teclas
+        self._condicao.notify_all()
+        return True
+
+    def _agendar(self, nome, estado, prazo):
+        heapq.heappush(self._heap, (prazo, next(self._ordem), nome, estado.geracao))
+        self._condicao.notify_all()
+
+    def _proxima(self):
+        """Espera (com a trava da condição) a próxima mensagem vencida; None ao encerrar."""
+        while not self._encerrando:
+            if not self._heap:
+                self._condicao.wait()
+                self.despertares += 1
+                continue
+            prazo, _, nome, geracao = self._heap[0]
+            estado = self._estados.get(nome)
+            if estado is None or estado.geracao != geracao:
+                heapq.heappop(self._heap)  # Sequência parada ou trocada depois de agendada
+                continue
+            restante = prazo - self.relogio()
+            if restante > 0:
+                self._condicao.wait(restante)
+                self.despertares += 1
+                continue
+            heapq.heappop(self._heap)
+            return prazo, nome, estado
+        return None
+
+    def _executar(self):
+        while True:
+            with self._condicao:
+                proxima = self._proxima()
+                if proxima is None:
+                    return
+                prazo, nome, estado = proxima
+                config, geracao, cancelar, limitador = estado.config, estado.geracao, estado.cancelar, estado.limitador
+                passos = estado.plano.mensagem(estado.indice, estado.contexto)
+                backend = self._backends.get(config.backend)
+            inicio = self.relogio()
+            estado.jitter.adicionar(inicio - prazo)
+            try:
+                if backend is None:
+                    backend = self._backends[config.backend] = criar_backend(config.backend)
+                if limitador is not None:
+                    backend = BackendLimitado(backend, limitador)
+                perfilador = self.perfilador
+                with self.trava:
+                    if perfilador is not None and perfilador.ativo:
+                        perfilador.executar(backend.executar, passos, cancelar)
+                    else:
+                        backend.executar(passos, cancelar)
+            except Exception as e:
+                print(f"Erro na sequência '{nome}': {e}")
+                with self._condicao:
+                    if estado.geracao == geracao:
+                        self._parar(nome)
+                continue
+            with self._condicao:
+                if estado.geracao != geracao:
+                    continue  # Parada durante o envio
+                estado.mensagens += 1
+                estado.indice += 1
+                proximo = prazo + config.cadencia
+                if estado.indice == len(estado.plano):
+                    estado.indice = 0
+                    estado.ciclos += 1
+                    estado.contexto.ciclo = estado.ciclos + 1
+                    if not config.loop or (config.ciclos and estado.ciclos >= config.ciclos):
+                        estado.ativa = False
+                        estado.geracao += 1
+                        self._condicao.notify_all()  # Acorda quem espera em aguardar()
+                        continue
+                    proximo += config.intervalo
+                agora = self.relogio()
+                if proximo < agora:
+                    estado.atrasados += 1  # Não tenta compensar em rajada
+                    proximo = agora
+                self._agendar(nome, estado, proximo)
+
+    def aguardar(self, timeout=None):
+        """Espera todas as sequências terminarem (útil para sequências sem loop ou com ciclos)."""
+        with self._condicao:
+            return self._condicao.wait_for(
+                lambda: not any(estado.ativa for estado in self._estados.values()), timeout)
+
+    def estatisticas(self):
+        with self._condicao:
+            return {
+                "despertares": self.despertares,
+                "sequencias": {
+                    nome: {
+                        "ativa": estado.ativa,
+                        "mensagens": estado.mensagens,
+                        "ciclos": estado.ciclos,
+                        "atrasados": estado.atrasados,
+                        "jitter": estado.jitter.como_dict(),
+                    }
+                    for nome, estado in self._estados.items()
+                },
+            }
+
+    def encerrar(self, timeout=1.0):
+        """Para todas as sequências e finaliza a thread."""
+        with self._condicao:
+            self.parar_todas()
+            self._encerrando = True
+            self._condicao.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,16 @@
+"""
+Configuração dos testes: a raiz do projeto no sys.path (os módulos ficam
+soltos nela) e a marca "slow" para os testes que rodam no relógio real.
+Os substitutos (relógio, teclado, raiz do Tk) ficam em falsos.py.
+
+    python -m pytest -q                  # todos
+    python -m pytest -q -m "not slow"    # só os rápidos
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: roda no relógio real e leva segundos")
@@ -0,0 +1,156 @@
+"""
+Substitutos usados pelos testes e pelos benchmarks (benchmark.py): relógio,
+teclado, raiz do Tk e backend lento, todos sem display nem teclado real.
+"""
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from envio import BackendGravacao
+from eventos import EVENTO_TK
+from gravador import APERTAR, SOLTAR
+
+
+def mensagens_exemplo(quantidade=20, tamanho=100):
+    """Gera mensagens de teste com 'tamanho' caracteres cada."""
+    base = "Rádio Habblet no ar! Peça sua música. "
+    return [(base * (tamanho // len(base) + 1))[:tamanho] for _ in range(quantidade)]
+
+
+class RelogioFalso:
+    """Relógio simulado: dormir() avança o tempo (com atraso opcional de despertar)."""
+
+    def __init__(self, atraso_despertar=0.0, semente=0):
+        self.agora = 0.0
+        self.atraso_despertar = atraso_despertar
+        self._random = random.Random(semente)
+
+    def __call__(self):
+        return self.agora
+
+    def dormir(self, segundos):
+        self.agora += segundos + self._random.uniform(0, self.atraso_despertar)
+
+    def gastar(self, segundos):
+        """Simula trabalho (ex.: digitação) que consome tempo."""
+        self.agora += segundos
+
+
+class BackendGravacaoLento(BackendGravacao):
+    """Gravação com um atraso por tecla, imitando a digitação real."""
+
+    def __init__(self, atraso_tecla=0.0005):
+        super().__init__(relogio=time.perf_counter)
+        self.atraso_tecla = atraso_tecla
+
+    def escrever_tecla(self, caractere):
+        super().escrever_tecla(caractere)
+        time.sleep(self.atraso_tecla)  # Tempo até a próxima tecla
+
+
+class TecladoFalso:
+    """Substituto do módulo keyboard: hooks (com supressão), teclas pressionadas e injetadas."""
+
+    def __init__(self):
+        self.operacoes = 0  # hook/unhook
+        self.hooks = []  # (callback, suppress)
+        self.pressionadas = set()
+        self.injetadas = []  # (tipo, tecla) de cada press/release
+        self._codigos = {}
+
+    def hook(self, callback, suppress=False):
+        self.hooks.append((callback, suppress))
+        self.operacoes += 1
+        return callback
+
+    def unhook(self, callback):
+        self.hooks = [(outro, suppress) for outro, suppress in self.hooks if outro is not callback]
+        self.operacoes += 1
+
+    def key_to_scan_codes(self, nome):
+        return (self._codigos.setdefault(nome, len(self._codigos) + 1),)
+
+    def is_pressed(self, nome):
+        return nome in self.pressionadas
+
+    def evento(self, tipo, nome, tempo=0.0, codigo=None):
+        """
+        Entrega um evento de tecla aos hooks, como o módulo keyboard faria.
+        Retorna False se algum hook com supressão o bloqueou.
+        """
+        if codigo is None:
+            codigo = self.key_to_scan_codes(nome)[0]
+        evento = SimpleNamespace(event_type=tipo, name=nome, time=tempo, scan_code=codigo)
+        entregue = True
+        for callback, suppress in list(self.hooks):
+            if callback(evento) is False and suppress:
+                entregue = False
+        if entregue:
+            if tipo == "down":
+                self.pressionadas.add(nome)
+            else:
+                self.pressionadas.discard(nome)
+        return entregue
+
+    def press(self, tecla):
+        self.injetadas.append((APERTAR, tecla))
+
+    def release(self, tecla):
+        self.injetadas.append((SOLTAR, tecla))
+
+    def pressionar(self, tecla):
+        """Aperta e solta a combinação (ex.: "ctrl+a"); retorna se o gatilho chegou ao sistema."""
+        *modificadores, gatilho = tecla.split("+")
+        for modificador in modificadores:
+            self.evento("down", modificador)
+        entregue = self.evento("down", gatilho)
+        self.evento("up", gatilho)
+        for modificador in reversed(modificadores):
+            self.evento("up", modificador)
+        return entregue
+
+
+class RaizFalsa:
+    """
+    Substituto do Tk para a BombaTk: event_generate() (de qualquer thread) só
+    marca o evento e after() só guarda o próximo callback; girar() faz o papel
+    de uma volta do mainloop.
+    """
+
+    def __init__(self):
+        self.proximo = None
+        self.ligacoes = {}
+        self.evento = threading.Event()
+
+    def bind(self, sequencia, funcao):
+        self.ligacoes[sequencia] = funcao
+
+    def event_generate(self, sequencia, when=None):
+        self.evento.set()
+
+    def after(self, ms, funcao, *args):
+        self.proximo = (ms, funcao, args)
+        return "after#1"
+
+    def after_cancel(self, ident):
+        self.proximo = None
+
+    def girar(self, timeout):
+        """
+        Espera o evento da bomba (até 'timeout'), entrega-o e roda o after()
+        agendado depois do atraso pedido. Retorna quanto o callback levou, ou
+        None se nada chegou.
+        """
+        if not self.evento.wait(timeout):
+            return None
+        self.evento.clear()
+        self.ligacoes[EVENTO_TK]()
+        if self.proximo is None:
+            return None
+        ms, funcao, args = self.proximo
+        self.proximo = None
+        time.sleep(ms / 1000)
+        antes = time.perf_counter()
+        funcao(*args)
+        return time.perf_counter() - antes
@@ -0,0 +1,50 @@
+import random
+
+from agendador import AgendadorDeadline
+from falsos import RelogioFalso
+
+
+def test_periodo_nao_deriva_com_digitacao_e_despertares_atrasados():
+    relogio = RelogioFalso(atraso_despertar=0.002)
+    sorteio = random.Random(1)
+    agendador = AgendadorDeadline(0.5, 20.0, relogio=relogio, dormir=relogio.dormir)
+    agendador.iniciar()
+    ciclos, mensagens = 5000, 5
+    for _ in range(ciclos):
+        for _ in range(mensagens):
+            relogio.gastar(sorteio.uniform(0.05, 0.4))  # Digitação
+            assert agendador.proxima_mensagem()
+        assert agendador.proximo_ciclo()
+    assert relogio() - ciclos * (mensagens * 0.5 + 20.0) < 0.01
+    assert agendador.deriva.maximo < 0.01
+    assert agendador.ciclos == ciclos and agendador.atrasados == 0
+
+
+def test_envio_atrasado_comeca_ja_sem_rajada():
+    relogio = RelogioFalso()
+    agendador = AgendadorDeadline(0.5, 0.0, relogio=relogio, dormir=relogio.dormir)
+    agendador.iniciar()
+    relogio.gastar(2.0)  # Digitação bem além do prazo
+    assert agendador.proxima_mensagem()
+    assert agendador.atrasados == 1 and relogio() == 2.0
+    assert agendador.proxima_mensagem()
+    assert relogio() == 2.5  # Reancorado: uma cadência depois, não quatro envios seguidos
+
+
+def test_conta_um_despertar_por_espera():
+    relogio = RelogioFalso()
+    agendador = AgendadorDeadline(0.5, 1.0, relogio=relogio, dormir=relogio.dormir)
+    agendador.iniciar()
+    for _ in range(3):
+        agendador.proxima_mensagem()
+    agendador.proximo_ciclo()
+    assert agendador.despertares == 4
+
+
+def test_espera_interrompida_indica_cancelamento():
+    relogio = RelogioFalso()
+    agendador = AgendadorDeadline(0.5, 1.0, relogio=relogio, dormir=lambda segundos: True)
+    agendador.iniciar()
+    assert not agendador.proxima_mensagem()
+    assert not agendador.proximo_ciclo()
+    assert agendador.ciclos == 0
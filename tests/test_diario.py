@@ -0,0 +1,42 @@
+import json
+
+from diario import INICIO, DiarioExecucao, caminho_mensagens, ler_retomada
+
+
+def config(mensagens):
+    return {"mensagens": tuple(mensagens), "cadencia": 0.5, "loop": True}
+
+
+def test_retomada_traz_as_mensagens_do_arquivo_ao_lado(tmp_path):
+    caminho = str(tmp_path / "diario.jsonl")
+    diario = DiarioExecucao(caminho, intervalo=0.01)
+    diario.iniciar(config(["a", "b", "c"]), 3)
+    diario.mensagem(1, 2, 2)
+    diario.fechar()
+    with open(caminho, encoding="utf-8") as arquivo:
+        inicio = json.loads(arquivo.readline())
+    assert inicio[0] == INICIO and "mensagens" not in inicio[1]
+    retomada = ler_retomada(caminho)
+    assert retomada.config["mensagens"] == ["a", "b", "c"]
+    assert (retomada.ciclos, retomada.mensagem) == (0, 2)
+
+
+def test_mensagens_trocadas_no_disco_nao_sao_retomadas(tmp_path):
+    caminho = str(tmp_path / "diario.jsonl")
+    diario = DiarioExecucao(caminho, intervalo=0.01)
+    diario.iniciar(config(["a", "b"]), 2)
+    diario.mensagem(1, 1, 1)
+    diario.fechar()
+    with open(caminho_mensagens(caminho), "w", encoding="utf-8") as arquivo:
+        json.dump(["x", "y"], arquivo)
+    assert ler_retomada(caminho) is None
+
+
+def test_iniciar_seguido_grava_a_ultima_execucao(tmp_path):
+    caminho = str(tmp_path / "diario.jsonl")
+    diario = DiarioExecucao(caminho, intervalo=0.01)
+    for i in range(50):
+        diario.iniciar(config([f"execução {i}"] * 1000), 1000)
+    diario.mensagem(1, 1, 1)
+    diario.fechar()
+    assert ler_retomada(caminho).config["mensagens"] == ["execução 49"] * 1000
@@ -0,0 +1,29 @@
+from falsos import RaizFalsa
+from eventos import ESTADO, BombaTk, CanalEventos
+
+
+class RaizQueFalha(RaizFalsa):
+    """event_generate() falha na primeira vez, como com a janela ainda fora do mainloop."""
+
+    def __init__(self):
+        super().__init__()
+        self.falhas = 1
+
+    def event_generate(self, sequencia, when=None):
+        if self.falhas:
+            self.falhas -= 1
+            raise RuntimeError("main thread is not in main loop")
+        super().event_generate(sequencia, when)
+
+
+def test_aviso_que_falha_nao_trava_o_canal():
+    canal, raiz, recebidos = CanalEventos(), RaizQueFalha(), []
+    bomba = BombaTk(raiz, canal, recebidos.append)
+    try:
+        canal.publicar(ESTADO, True)
+        assert raiz.girar(0.2) is None  # O primeiro aviso se perdeu
+        canal.publicar(ESTADO, False)
+        assert raiz.girar(1.0) is not None
+        assert recebidos == [{ESTADO: False}]
+    finally:
+        bomba.encerrar()
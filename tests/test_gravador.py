@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from falsos import TecladoFalso
+from gravador import Gravador, LinhaDoTempo, reproduzir
+
+
+def gravar(teclado, eventos, ignorar=("f9",)):
+    sorteio = random.Random(1)
+    gravador = Gravador(teclado, ignorar=ignorar)
+    gravador.iniciar()
+    teclas = ["shift", "a", "ç", "enter", "space", "ctrl", "f9", "backspace"]
+    tempo = 1000.0
+    for _ in range(eventos // 2):
+        tecla = sorteio.choice(teclas)
+        tempo += sorteio.uniform(0, 0.005)
+        teclado.evento("down", tecla, tempo, 30)
+        tempo += sorteio.uniform(0, 0.005)
+        teclado.evento("up", tecla, tempo, 30)
+    return gravador.parar()
+
+
+def test_gravacao_ignora_a_hotkey_e_solta_o_hook():
+    teclado = TecladoFalso()
+    linha = gravar(teclado, 1000)
+    assert "f9" not in linha.nomes
+    assert not teclado.hooks
+
+
+def test_gravacao_longa_usa_no_maximo_16_bytes_por_evento():
+    linha = gravar(TecladoFalso(), 100000)
+    assert linha.bytes_usados / len(linha) <= 16
+
+
+def test_salvar_e_carregar_preserva_os_eventos(tmp_path):
+    linha = gravar(TecladoFalso(), 10000)
+    caminho = str(tmp_path / "sequencia.mrh")
+    linha.salvar(caminho)
+    carregada = LinhaDoTempo.carregar(caminho)
+    assert len(carregada) == len(linha)
+    assert all(carregada.evento(i) == linha.evento(i) for i in range(len(linha)))
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("velocidade", [1.0, 2.0])
+def test_reproducao_segue_o_tempo_gravado(velocidade):
+    teclado = TecladoFalso()
+    linha = gravar(teclado, 200)
+    completa, erros = reproduzir(linha, teclado, velocidade)
+    assert completa and len(teclado.injetadas) == len(linha)
+    # Mediana, não p99: o p99 do histograma é o limite do balde e oscila com a carga da máquina
+    assert erros.percentil(50) < 0.005, erros.resumo()
@@ -0,0 +1,58 @@
+import time
+from types import SimpleNamespace
+
+from falsos import TecladoFalso
+from hotkeys import RegistroHotkeys
+
+
+def registro_com_disparos():
+    teclado = TecladoFalso()
+    registro = RegistroHotkeys(teclado)
+    disparos = []
+    registro.gancho.despachar = disparos.append
+    return teclado, registro, disparos
+
+
+def test_so_a_combinacao_exata_dispara_e_e_suprimida():
+    teclado, registro, disparos = registro_com_disparos()
+    registro.definir("teste", "ctrl+a", "ctrl+a")
+    assert teclado.pressionar("a") and teclado.pressionar("ctrl+shift+a") and not disparos
+    assert not teclado.pressionar("ctrl+a") and disparos == ["ctrl+a"]
+    assert not teclado.pressionadas  # O "up" suprimido junto com o "down"
+    registro.limpar()
+    assert not teclado.hooks
+
+
+def test_gatilho_modificador_que_nao_e_a_primeira_ligacao():
+    teclado, registro, disparos = registro_com_disparos()
+    teclado._codigos.update({"x": 5, "shift": 5})  # Duas teclas com o mesmo código de varredura
+    registro.definir("letra", "x", "x")
+    registro.definir("modificador", "shift", "shift")
+    teclado.pressionadas.add("shift")  # O sistema já vê o shift apertado no "down" dele
+    teclado.evento("down", "shift", codigo=5)
+    assert disparos == ["shift"]
+
+
+def custo_tecla_livre(quantidade, eventos=20000):
+    """Melhor de cinco rodadas do custo do hook por tecla sem hotkey, com 'quantidade' hotkeys ligadas."""
+    teclado, registro, _ = registro_com_disparos()
+    combinacoes = [f"{modificador}+{letra}" for modificador in ("ctrl", "alt") for letra in "abcdefghijklmnopqrstuvwxyz"]
+    for i, combinacao in enumerate(combinacoes[:quantidade]):
+        registro.definir(f"h{i}", combinacao, lambda: None)
+    livres = [SimpleNamespace(event_type=tipo, name=tecla, scan_code=1000 + i, time=0.0)
+              for i, tecla in enumerate("0123456789.,;") for tipo in ("down", "up")]
+    sequencia = [livres[i % len(livres)] for i in range(eventos)]
+    hook = registro.gancho._evento
+    melhor = float("inf")
+    for _ in range(5):
+        inicio = time.perf_counter()
+        for evento in sequencia:
+            hook(evento)
+        melhor = min(melhor, (time.perf_counter() - inicio) / eventos)
+    registro.limpar()
+    return melhor
+
+
+def test_custo_por_tecla_nao_cresce_com_as_hotkeys():
+    poucas, muitas = custo_tecla_livre(3), custo_tecla_livre(50)
+    assert muitas < 5 * poucas + 1e-6, f"{poucas * 1e9:.0f} ns com 3 hotkeys, {muitas * 1e9:.0f} ns com 50"
@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from falsos import RelogioFalso, mensagens_exemplo
+from envio import BackendGravacao, BackendLimitado, LimitadorTaxa, compilar_plano, executar_plano
+
+
+@pytest.mark.parametrize("taxa", [20, 100, 1000])
+def test_taxa_media_e_rajada_respeitadas(taxa):
+    rajada = 10
+    relogio = RelogioFalso()
+    gravacao = BackendGravacao(relogio=relogio)
+    limitador = LimitadorTaxa(taxa, rajada, relogio=relogio, dormir=relogio.dormir)
+    plano = compilar_plano(mensagens_exemplo(quantidade=20, tamanho=200))
+    executar_plano(plano, BackendLimitado(gravacao, limitador), 0, dormir=lambda s: None)
+    enviadas = 0
+    for instante, tipo, valor in gravacao.eventos:
+        enviadas += len(valor) if tipo == "escrever" else 1
+        assert enviadas <= rajada + taxa * instante + 1e-9, (instante, enviadas)
+    media = (enviadas - rajada) / relogio()  # A primeira rajada sai de graça
+    assert abs(media - taxa) / taxa < 0.02, media
+
+
+def test_rajada_inicial_sai_sem_espera():
+    relogio = RelogioFalso()
+    limitador = LimitadorTaxa(5, 10, relogio=relogio, dormir=relogio.dormir)
+    for _ in range(10):
+        assert limitador.consumir()
+    assert relogio() == 0 and limitador.esperas == 0
+    assert limitador.consumir()
+    assert relogio() == pytest.approx(0.2) and limitador.esperas == 1
+
+
+def test_espera_cancelada_retorna_false():
+    limitador = LimitadorTaxa(1, 1, relogio=RelogioFalso())
+    cancelar = threading.Event()
+    cancelar.set()
+    assert limitador.consumir()
+    assert not limitador.consumir(cancelar=cancelar)
+
+
+def test_taxa_invalida():
+    with pytest.raises(ValueError):
+        LimitadorTaxa(0)
@@ -0,0 +1,14 @@
+import os
+
+from metricas import MetricasExecucao
+
+
+def test_exportacoes_no_mesmo_segundo_nao_se_sobrescrevem(tmp_path):
+    caminhos = [MetricasExecucao().exportar(tmp_path)[0] for _ in range(5)]
+    assert len(set(caminhos)) == 5
+    assert all(os.path.exists(caminho) for caminho in caminhos)
+
+
+def test_so_as_ultimas_exportacoes_ficam(tmp_path):
+    caminhos = [MetricasExecucao().exportar(tmp_path, manter=3) for _ in range(8)]
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(c) for par in caminhos[-3:] for c in par)
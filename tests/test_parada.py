@@ -0,0 +1,28 @@
+import threading
+import time
+
+import pytest
+
+from envio import compilar_plano, executar_plano
+from falsos import BackendGravacaoLento, mensagens_exemplo
+from trabalhador import TrabalhadorEnvio
+
+
+@pytest.mark.slow
+def test_parada_no_meio_da_mensagem_silencia_em_10_ms():
+    plano = compilar_plano(mensagens_exemplo(quantidade=5, tamanho=2000))
+    trabalhador = TrabalhadorEnvio()
+    threads_iniciais = threading.active_count()
+    for _ in range(20):
+        backend = BackendGravacaoLento()
+        cancelar = threading.Event()
+        assert trabalhador.enviar(lambda: executar_plano(plano, backend, 0.5, cancelar=cancelar))
+        time.sleep(0.02)
+        parada = time.perf_counter()
+        cancelar.set()
+        assert trabalhador.aguardar_ocioso(timeout=1.0), "envio não parou"
+        assert backend.eventos, "nada foi enviado antes da parada"
+        latencia = backend.eventos[-1][0] - parada
+        assert latencia < 0.01, f"parada levou {latencia * 1000:.2f} ms"
+    assert threading.active_count() == threads_iniciais  # Só a macro-envio, reutilizada
+    trabalhador.encerrar()
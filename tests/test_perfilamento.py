@@ -0,0 +1,49 @@
+import os
+import threading
+
+from motor import ConfigExecucao, MotorMacro
+from perfilamento import Perfilador
+
+MENSAGENS = ("Rádio no ar!", "{contador}")
+
+
+def executar_perfilado(pasta, config):
+    motor = MotorMacro()
+    perfilador = Perfilador(pasta)
+    motor.definir_perfilador(perfilador)
+    perfilador.iniciar()
+    try:
+        motor.iniciar(config)
+        motor.acionar()
+        assert motor.aguardar(timeout=5)
+    finally:
+        motor.encerrar()
+    return motor, perfilador.encerrar()
+
+
+def test_envio_perfilado_digita_e_grava_os_arquivos(tmp_path):
+    motor, resumo = executar_perfilado(tmp_path, ConfigExecucao(mensagens=MENSAGENS, cadencia=0.0,
+                                                                  backend="gravacao"))
+    linhas = motor.backend.texto_enviado().splitlines()
+    assert len(linhas) == 2 and linhas[0] == "Rádio no ar!"
+    arquivos = os.listdir(tmp_path)
+    for prefixo in ("perfil-", "memoria-", "resumo-"):
+        assert any(nome.startswith(prefixo) for nome in arquivos), arquivos
+    with open(resumo, encoding="utf-8") as arquivo:
+        assert "macro-envio" in arquivo.readline(), "a thread de envio não foi perfilada"
+
+
+def test_loop_perfilado_envia_todos_os_ciclos(tmp_path):
+    config = ConfigExecucao(mensagens=MENSAGENS, cadencia=0.0001, loop=True, intervalo=0.0, ciclos=3,
+                            backend="gravacao")
+    motor, _ = executar_perfilado(tmp_path, config)
+    assert motor.metricas.mensagens == 3 * len(MENSAGENS)
+
+
+def test_encerrar_sem_nada_perfilado_nas_outras_threads(tmp_path):
+    perfilador = Perfilador(tmp_path)
+    perfilador.iniciar()
+    outra = threading.Thread(target=perfilador.executar, args=(lambda: None,))
+    outra.start()
+    outra.join()
+    assert os.path.exists(perfilador.encerrar())
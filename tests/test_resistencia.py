@@ -0,0 +1,91 @@
+import os
+import time
+
+import pytest
+
+from diario import DiarioExecucao
+from eventos import BombaTk, CanalEventos
+from falsos import RaizFalsa, TecladoFalso
+from motor import ConfigExecucao, MotorMacro
+from recursos import MonitorRecursos
+
+MENSAGENS = ("Rádio no ar!", "Peça sua música", "{contador}")
+
+
+@pytest.fixture
+def montagem(tmp_path):
+    """Motor com hotkeys (teclado falso), diário e canal esvaziado por uma BombaTk de raiz falsa."""
+    teclado = TecladoFalso()
+    motor = MotorMacro(teclado=teclado)
+    motor.diario = DiarioExecucao(os.path.join(tmp_path, "diario.jsonl"), intervalo=0.01)
+    motor.eventos = CanalEventos()
+    raiz = RaizFalsa()
+    bomba = BombaTk(raiz, motor.eventos, lambda eventos: None)
+    monitor = MonitorRecursos(lambda: motor.despertares() + bomba.despertares)
+    yield teclado, motor, raiz, bomba, monitor
+    motor.encerrar()
+    bomba.encerrar()
+
+
+def girar_ate(raiz, condicao, timeout=5.0):
+    prazo = time.monotonic() + timeout
+    while not condicao():
+        assert time.monotonic() < prazo, "o pedido do motor não chegou à interface"
+        raiz.girar(0.05)
+
+
+def config(intervalo=0.0, ciclos=2):
+    return ConfigExecucao(mensagens=MENSAGENS, tecla_envio="f8", tecla_parada="esc", cadencia=0.0001,
+                          loop=True, intervalo=intervalo, ciclos=ciclos, backend="gravacao")
+
+
+def ciclo(teclado, motor, raiz):
+    motor.iniciar(config(), ao_parar=lambda: motor.eventos.pedir(motor.parar))
+    motor.acionar()
+    assert motor.aguardar(timeout=5)
+    teclado.pressionar("esc")  # Hotkey -> thread das hotkeys -> canal -> bomba -> parar()
+    girar_ate(raiz, lambda: not motor.running)
+    assert motor.metricas.mensagens == 2 * len(MENSAGENS)
+    motor.backend.eventos.clear()
+
+
+@pytest.mark.slow
+def test_ciclos_nao_acumulam_threads_nem_memoria(montagem):
+    teclado, motor, raiz, bomba, monitor = montagem
+    for _ in range(10):
+        ciclo(teclado, motor, raiz)
+    antes = monitor.amostrar()
+    for _ in range(100):
+        ciclo(teclado, motor, raiz)
+    depois = monitor.amostrar()
+    assert depois.threads == antes.threads
+    if antes.rss is not None:  # Sem RSS no sistema, só as threads
+        assert (depois.rss - antes.rss) / 2 ** 20 < 2.0
+
+
+def ociosa(raiz, monitor, segundos=0.5):
+    time.sleep(0.1)  # Diário e bomba terminam o que já estava pendente
+    while raiz.girar(0) is not None:
+        pass
+    monitor.relatorio()
+    time.sleep(segundos)
+    return monitor.relatorio()
+
+
+@pytest.mark.slow
+def test_parada_nao_acorda_nenhuma_thread(montagem):
+    teclado, motor, raiz, bomba, monitor = montagem
+    ciclo(teclado, motor, raiz)
+    assert ociosa(raiz, monitor)["despertares_por_minuto"] == 0
+    assert not raiz.evento.is_set(), "a bomba acordou o Tk sem eventos"
+
+
+@pytest.mark.slow
+def test_intervalo_do_loop_nao_acorda_nenhuma_thread(montagem):
+    teclado, motor, raiz, bomba, monitor = montagem
+    motor.iniciar(config(intervalo=10.0, ciclos=0))
+    motor.acionar()
+    girar_ate(raiz, lambda: motor.metricas.mensagens == len(MENSAGENS))
+    assert ociosa(raiz, monitor)["despertares_por_minuto"] == 0
+    assert not raiz.evento.is_set(), "a bomba acordou o Tk sem eventos"
+    motor.parar()
@@ -0,0 +1,18 @@
+import pytest
+
+from macrorh.temas import TEMAS
+
+LISTA = ("lista", "rolagem")  # O Canvas das mensagens e a barra dele, criados depois dos outros widgets
+
+
+@pytest.mark.parametrize("nome", sorted(TEMAS))
+def test_nenhum_widget_fica_embaixo_da_lista(nome):
+    posicoes = TEMAS[nome].posicoes
+    _, lista = posicoes["lista"]
+    esquerda, topo = lista["x"], lista["y"]
+    direita, base = esquerda + lista["width"], topo + lista["height"]
+    for chave, (gerenciador, opcoes) in posicoes.items():
+        if chave in LISTA or gerenciador != "place":
+            continue
+        assert not (esquerda <= opcoes["x"] < direita and topo <= opcoes["y"] < base), \
+            f"{nome}: '{chave}' em ({opcoes['x']}, {opcoes['y']}) fica coberto pela lista"
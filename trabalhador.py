@@ -0,0 +1,150 @@
+"""
+Thread de envio dedicada.
+
+Os callbacks de hotkey do módulo keyboard rodam na thread do hook: se digitarem
+ali, todas as outras hotkeys (inclusive a de parada) ficam travadas até o fim
+do envio. Por isso os callbacks só colocam tarefas numa fila limitada, e uma
+única thread de longa duração executa os envios.
+"""
+import queue
+import threading
+import time
+
+from agendador import Estatisticas
+
+# Políticas para pressões repetidas enquanto um envio está pendente
+COALESCER = "coalescer"    # No máximo uma tarefa de cada tipo esperando na fila
+ENFILEIRAR = "enfileirar"  # Todas entram na fila (até o limite)
+IGNORAR = "ignorar"        # Descarta enquanto houver uma do mesmo tipo pendente ou em execução
+POLITICAS = (COALESCER, ENFILEIRAR, IGNORAR)
+
+
+class TrabalhadorEnvio:
+    """
+    Executa tarefas (funções sem argumentos) em ordem, numa única thread.
+    tamanho_fila: limite de tarefas aguardando; além disso a pressão é descartada.
+    politica: uma de POLITICAS, aplicada por 'chave' de tarefa.
+    """
+
+    def __init__(self, tamanho_fila=8, politica=COALESCER):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política desconhecida: {politica!r}")
+        self.politica = politica
+        self._fila = queue.Queue(maxsize=tamanho_fila)
+        self._trava = threading.Lock()
+        self._ociosa = threading.Condition(self._trava)  # Avisada quando não há mais tarefas
+        self._aguardando = {}  # chave -> tarefas na fila
+        self._pendentes = 0  # Tarefas na fila + em execução
+        self._em_execucao = False
+        self._chave_atual = None  # chave da tarefa em execução
+        self.descartadas = 0
+        self.latencia_callback = Estatisticas()  # Tempo gasto dentro de enviar()
+        self.espera_fila = Estatisticas()  # Da chamada de enviar() ao início da tarefa
+        self.perfilador = None  # perfilamento.Perfilador, se o perfilamento foi habilitado
+        self.despertares = 0  # Vezes que a thread saiu da fila (uma por tarefa; ociosa, nenhuma)
+        self._thread = threading.Thread(target=self._executar, name="macro-envio", daemon=True)
+        self._thread.start()
+
+    def enviar(self, tarefa, chave=None):
+        """
+        Enfileira a tarefa sem bloquear (seguro para callbacks de hotkey).
+        Retorna True se a tarefa foi aceita.
+        """
+        inicio = time.perf_counter()
+        with self._trava:
+            pendentes = self._aguardando.get(chave, 0)
+            if self.politica == COALESCER and pendentes:
+                aceita = False
+            elif self.politica == IGNORAR and (pendentes or (self._em_execucao and self._chave_atual == chave)):
+                aceita = False
+            else:
+                try:
+                    self._fila.put_nowait((tarefa, chave, inicio))
+                    self._aguardando[chave] = pendentes + 1
+                    self._pendentes += 1
+                    aceita = True
+                except queue.Full:
+                    aceita = False
+            if not aceita:
+                self.descartadas += 1
+            self.latencia_callback.adicionar(time.perf_counter() - inicio)
+        return aceita
+
+    def _executar(self):
+        while True:
+            item = self._fila.get()
+            if item is None:
+                break
+            self.despertares += 1
+            tarefa, chave, enviado_em = item
+            with self._trava:
+                self._aguardando[chave] -= 1
+                self._em_execucao = True
+                self._chave_atual = chave
+                self.espera_fila.adicionar(time.perf_counter() - enviado_em)
+            perfilador = self.perfilador
+            try:
+                if perfilador is not None and perfilador.ativo:
+                    perfilador.executar(tarefa)
+                else:
+                    tarefa()
+            except Exception as e:
+                print(f"Erro no envio: {e}")
+            finally:
+                with self._trava:
+                    self._em_execucao = False
+                    self._chave_atual = None
+                    self._concluir(1)
+
+    def _concluir(self, quantidade):
+        # Chamado com a trava adquirida
+        self._pendentes -= quantidade
+        if self._pendentes == 0:
+            self._ociosa.notify_all()
+
+    def descartar_pendentes(self):
+        """Remove da fila as tarefas que ainda não começaram. Retorna quantas foram removidas."""
+        removidas = 0
+        encerrar = False
+        with self._trava:
+            while True:
+                try:
+                    item = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    encerrar = True
+                    continue
+                self._aguardando[item[1]] -= 1
+                removidas += 1
+            self._concluir(removidas)
+        if encerrar:
+            self._fila.put(None)
+        return removidas
+
+    def aguardar_ocioso(self, timeout=None):
+        """Espera até não haver tarefa na fila nem em execução. Retorna False no timeout."""
+        with self._ociosa:
+            return self._ociosa.wait_for(lambda: self._pendentes == 0, timeout)
+
+    @property
+    def ocupado(self):
+        return self._pendentes > 0
+
+    @property
+    def thread(self):
+        return self._thread
+
+    def encerrar(self, timeout=None):
+        """Pede o fim da thread depois das tarefas já enfileiradas e espera por ela."""
+        self._fila.put(None)
+        self._thread.join(timeout)
+
+    def estatisticas(self):
+        """Latência do callback e espera na fila (em segundos)."""
+        with self._trava:
+            return {
+                "descartadas": self.descartadas,
+                "latencia_callback": self.latencia_callback.como_dict(),
+                "espera_fila": self.espera_fila.como_dict(),
+            }